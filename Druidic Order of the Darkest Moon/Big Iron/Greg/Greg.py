@@ -1,85 +1,146 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
-from enum import Enum
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import argparse
+import bisect
+import functools
+import hashlib
+import inspect
 import json
+import logging
 import asyncio
 
-# ==================== DATA MODELS ====================
-
-class Role(Enum):
-    MEMBER = "member"
-    AVF = "avf"  # Verified members who can do verification work
-
-class BountyStatus(Enum):
-    DRAFT = "draft"
-    AWAITING_VERIFICATION = "awaiting_verification"  # Community bounties waiting for pre-verification
-    POSTED = "posted"  # Live on the board, can be claimed
-    CLAIMED = "claimed"  # Someone is working on it
-    AWAITING_POST_VERIFICATION = "awaiting_post_verification"  # Regular bounties waiting for completion verification
-    VERIFIED = "verified"  # Completed and verified
-    REJECTED = "rejected"  # Failed verification
-
-class BountyType(Enum):
-    REGULAR = "regular"  # AVF posts, goes straight to board
-    COMMUNITY = "community"  # Members post, needs pre-verification
-    RESOURCE = "resource"  # Special handling for Big Iron deliveries
-
-@dataclass
-class Member:
-    discord_id: int
-    role: Role
-    time_credits_owed: int = 0
-    assigned_bounties: Set[str] = field(default_factory=set)
+from models import MAX_REWARD, Role, BountyStatus, BountyType, Member, Bounty
+from storage import Storage, MemoryStorage, SQLiteStorage
+from registry import BountyRegistry, bounty_key
+from engine import HAS_DEBT, HAS_ASSIGNMENT
+from guilds import GuildState, CHANNEL_KINDS
+from ledger import Posting, member_account, ADJUSTMENTS_ACCOUNT, BIG_IRON_ACCOUNT, BIG_IRON_SPLIT
+from outbound import OutboundQueue
+from render import BountyRenderer
+from rules import RULES, RuleSet, POST, CLAIM, REQUEST_COMPLETION, VERDICT
+from quorum import Quorum, SINGLE
+from scheduler import TimerScheduler
+from clips import Clip, Segment, clip_range, format_timestamp, parse_clip_file
+from imports import MAX_IMPORT_BYTES, MAX_IMPORT_ROWS, Row, error_report, parse_adjustments, parse_bounties, read_rows
+from metrics import Metrics, timed_command
+
+# ==================== DISCORD HELPERS ====================
+
+class RawReaction:
+    """Minimal stand-in for discord.Reaction built from a raw reaction event"""
+    
+    def __init__(self, emoji: discord.PartialEmoji, message: discord.Message):
+        self.emoji = emoji
+        self.message = message
+
+class BountyListView(discord.ui.View):
+    """Newer/Older buttons over a cursor-paged bounty listing
+    
+    The cursor is the key of the first/last bounty on screen, so paging stays
+    correct while bounties change status underneath it.
+    """
+    
+    PAGE_SIZE = 10
+    
+    def __init__(self, bounties: BountyRegistry, status: Optional[BountyStatus] = None):
+        super().__init__(timeout=300)
+        self.bounties = bounties
+        self.status = status
+        self.page = bounties.page(status, limit=self.PAGE_SIZE)
+        self._update_buttons()
     
-    def can_post_bounty(self) -> bool:
-        """Members can post if they don't owe time credits"""
-        return self.time_credits_owed <= 0
+    def _update_buttons(self):
+        if self.page:
+            self.newer.disabled = not self.bounties.has_newer(bounty_key(self.page[0].id), self.status)
+            self.older.disabled = not self.bounties.has_older(bounty_key(self.page[-1].id), self.status)
+        else:
+            self.newer.disabled = self.older.disabled = True
+    
+    def render(self) -> discord.Embed:
+        title = f"{self.status.value.title()} Bounties" if self.status else "Bounty List"
+        lines = [f"**{b.id}**: {b.title}" if self.status else f"**{b.id}**: {b.title} ({b.status.value})"
+                 for b in self.page]
+        embed = discord.Embed(title=title, description="\n".join(lines) or "Nothing here.", color=0x0099ff)
+        
+        if self.status is None:
+            counts = [f"{s.value.title()}: {self.bounties.count(s)}" for s in BountyStatus if self.bounties.count(s)]
+            embed.add_field(name="By status", value="\n".join(counts), inline=False)
+        
+        embed.set_footer(text=f"{self.bounties.count(self.status)} bounties")
+        return embed
     
-    def can_claim_bounty(self) -> bool:
-        """Members can claim if no debt and no current assignments"""
-        return self.time_credits_owed <= 0 and len(self.assigned_bounties) == 0
+    async def _show(self, interaction: discord.Interaction, page: List[Bounty]):
+        if page:
+            self.page = page
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.render(), view=self)
     
-    def is_avf(self) -> bool:
-        """Check if member has AVF privileges"""
-        return self.role == Role.AVF
-
-@dataclass
-class Bounty:
-    id: str
-    creator_id: int
-    bounty_type: BountyType
-    status: BountyStatus
-    title: str
-    description: str
-    assigned_to: Optional[int] = None
-    verifier_id: Optional[int] = None  # Who's doing the verification
-    message_id: Optional[int] = None  # Discord message ID for reactions
+    @discord.ui.button(label="◀ Newer", style=discord.ButtonStyle.secondary)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        cursor = bounty_key(self.page[0].id) if self.page else None
+        page = self.bounties.page(self.status, after=cursor, limit=self.PAGE_SIZE) if cursor is not None else []
+        await self._show(interaction, page)
     
-    def can_be_claimed(self) -> bool:
-        """Check if bounty is available for claiming"""
-        return self.status == BountyStatus.POSTED
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        cursor = bounty_key(self.page[-1].id) if self.page else None
+        page = self.bounties.page(self.status, before=cursor, limit=self.PAGE_SIZE) if cursor is not None else []
+        await self._show(interaction, page)
+
+log = logging.getLogger(__name__)
 
 # ==================== BOT SETUP ====================
 
-class BountyBot(commands.Bot):
-    def __init__(self):
+class BountyBot(commands.AutoShardedBot):
+    def __init__(self, store: Optional[Storage] = None, shard_ids: Optional[List[int]] = None,
+                 shard_count: Optional[int] = None):
         # Discord bot setup - you'll need these permissions:
         # - Send Messages, Manage Messages, Add Reactions, Use Slash Commands
         intents = discord.Intents.default()
         intents.message_content = True
         intents.reactions = True
         
-        super().__init__(command_prefix='!', intents=intents)
+        # With shard_ids this process runs only those shards; start one process per
+        # slice of shards against the same store to spread guilds across processes
+        # Commands are guild-only: a DM has no partition of its own, and the process running
+        # shard 0 (where DMs arrive) may not be the one that owns the home guild's partition
+        super().__init__(command_prefix='!', intents=intents, shard_ids=shard_ids, shard_count=shard_count,
+                         allowed_contexts=app_commands.AppCommandContext(guild=True))
+        
+        # Data storage - written through on every change. Each guild gets its own
+        # partition (members, indexed bounties, counter, channels), loaded when
+        # its guild becomes available on one of this process's shards
+        self.store: Storage = store or MemoryStorage()
+        self.partitions: Dict[int, GuildState] = {}
+        self.HOME_GUILD: Optional[int] = None  # Guild that owns state from before partitioning (partition 0)
+        self.DEV_GUILD: Optional[int] = None  # Sync slash commands to this guild only (instant, for development)
+        self.preload: Optional[asyncio.Task] = None
+        self.command_sync: Optional[asyncio.Task] = None
+        self._register_commands()
+        
+        # Every GregTheory deadline (escalation, auto-approve, claim expiry) lives in one heap
+        self.timers = TimerScheduler(self._on_timer, persist=self._persist_timer, forget=self._forget_timer)
         
-        # Data storage - in production, use a real database
-        self.members: Dict[int, Member] = {}
-        self.bounties: Dict[str, Bounty] = {}
-        self.bounty_counter = 0
+        # Every REST call a handler makes goes through this rate-limited background queue
+        self.outbound = OutboundQueue(self.get_channel)
         
-        # Channel IDs - SET THESE TO YOUR ACTUAL DISCORD CHANNELS
+        # Latency histograms, loop lag, queue depths and transition counters
+        self.metrics = Metrics()
+        self.METRICS_PORT: Optional[int] = 9464  # Local Prometheus endpoint; None to disable
+        self.PROFILE_EVERY = 0  # cProfile one handler call in N (0 = off); see /slow on the metrics port
+        self.outbound.on_call = self._observe_discord_call
+        self.metrics.gauge("greg_outbound_queue_depth", "Discord actions waiting to be sent", self.outbound.depth)
+        self.metrics.gauge("greg_log_digest_depth", "Log lines waiting for the next digest", self.outbound.digest_depth)
+        self.metrics.gauge("greg_pending_timers", "Scheduled bounty deadlines", lambda: len(self.timers))
+        self.metrics.gauge("greg_bounties", "Bounties tracked", lambda: sum(len(p.bounties) for p in self.partitions.values()))
+        self.metrics.gauge("greg_guild_partitions", "Guild partitions loaded in this process", lambda: len(self.partitions))
+        self.edits_skipped = self.metrics.counter("greg_embed_edits_skipped_total", "Re-renders that changed nothing visible")
+        self.reactions_replayed = self.metrics.counter("greg_reactions_replayed_total", "Reactions missed while offline and replayed")
+        
+        # Channel IDs for the home guild - SET THESE TO YOUR ACTUAL DISCORD CHANNELS.
+        # Other guilds set theirs with /configure
         self.BOUNTY_BOARD_CHANNEL = None  # Where posted bounties go
         self.VERIFICATION_CHANNEL = None  # Where verification requests go
         self.LOG_CHANNEL = None  # For bot logs/notifications
@@ -89,25 +150,361 @@ class BountyBot(commands.Bot):
         self.VERIFY_EMOJI = "✅"  # For requesting verification
         self.APPROVE_EMOJI = "👍"  # For AVF approval
         self.REJECT_EMOJI = "👎"  # For AVF rejection
+        
+        # AVF verdicts needed to settle a verification, per bounty type; other types take the first verdict
+        self.QUORUMS: Dict[BountyType, Quorum] = {BountyType.RESOURCE: Quorum(needed=2, panel=3)}
+        
+        # Timed rules from GregTheory.md (seconds)
+        self.ESCALATE_AFTER = 24 * 3600  # Unclaimed bounty gets +10%, once per spell on the board
+        self.AUTO_APPROVE_AFTER = 48 * 3600  # Untouched verification auto-approves
+        self.DEFAULT_CLAIM_HOURS = 72  # Claim timeframe when the poster didn't set one
+        
+        # Clip pipeline: overlapping timestamps merge per VOD, each settled segment becomes one editing bounty
+        self.CLIP_SETTLE = 10 * 60  # Seconds a segment must go without new clips before it is posted
+        self.EDIT_REWARD = 20  # Reward of the editing bounty made from a segment
+        
+        # Bulk imports post a wave at a time, updating the importer's reply as each wave lands
+        self.BULK_POST_WAVE = 5  # Posts per wave - one channel's message budget per 5 seconds
+        self.BULK_POST_TIMEOUT = 60  # Seconds to wait on a wave before queueing the rest without waiting
+        
+        # Restart reconciliation of reactions added while the bot was down
+        self.RECONCILE_TIMEOUT = 300  # Seconds before the history scan gives up and replays what it found
+        self.RECONCILE_CONCURRENCY = 4  # Reaction-user lookups in flight at once
+        self.reconciling: Set[int] = set()  # Partitions with a reconciliation running
+        # (partition, bounty, "board" or verification stage) of posts queued but not yet sent
+        self.posts_queued: Set[Tuple[int, str, str]] = set()
+        
+        # BountyLogic.md rules (see rules.py), compiled into a dispatch table over these actions
+        self.rules = RuleSet(RULES, {
+            "deny_debt": self._deny_debt,
+            "deny_regular": self._deny_regular,
+            "post_to_board": self._submit_to_board,
+            "post_for_verification": self._submit_for_verification,
+            "claim": self._handle_claim_reaction,
+            "request_completion": self._handle_completion_verification_request,
+            "review": self._handle_verification_reaction,
+            "review_completion": self._handle_completion_verification,
+            "withdraw_reaction": self._withdraw_reaction,
+        })
 
     async def setup_hook(self):
         """Called when bot starts up"""
-        await self.tree.sync()
-        print("Bounty bot is ready!")
+        # Partitions load per guild in on_guild_available, so each process only holds its shards' guilds
+        self.compact_store.start()
+        self.timers.start()
+        self.metrics.slow_calls.profile_every = self.PROFILE_EVERY
+        self.metrics.start_lag_monitor()
+        self.metrics.watch_rate_limits()
+        if self.METRICS_PORT:
+            try:
+                await self.metrics.serve(port=self.METRICS_PORT)
+            except OSError:
+                # Metrics are worth losing, the bot is not
+                log.exception("Could not serve metrics on port %s; running without them", self.METRICS_PORT)
+        # Neither blocks the gateway connect that follows this hook
+        self.preload = asyncio.get_running_loop().create_task(self.preload_partitions())
+        self.command_sync = asyncio.get_running_loop().create_task(self.sync_commands())
+        self.command_sync.add_done_callback(self._sync_done)
+        log.info("Bounty bot set up; connecting to the gateway")
 
-# ==================== MEMBER MANAGEMENT ====================
+    @staticmethod
+    def _sync_done(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            log.error("Command tree sync crashed", exc_info=task.exception())
+
+    async def close(self):
+        """Flush pending Discord actions before disconnecting"""
+        self.metrics.stop()
+        self.outbound.flush_digest()
+        try:
+            await asyncio.wait_for(self.outbound.join(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+        await super().close()
+
+    @tasks.loop(hours=1)
+    async def compact_store(self):
+        """Periodically trim the event log so the store stays small"""
+        if isinstance(self.store, SQLiteStorage):
+            self.store.compact()
+
+# ==================== COMMAND TREE ====================
+
+    def _register_commands(self):
+        """Add the slash commands defined on this class to the tree, bound to this bot"""
+        for _, command in inspect.getmembers(type(self), lambda m: isinstance(m, app_commands.Command)):
+            self.tree.add_command(command._copy_with(parent=None, binding=self))
+
+    def command_fingerprint(self) -> str:
+        """Hash of every command signature Discord sees (names, descriptions, params, choices)"""
+        payload = sorted((command.to_dict(self.tree) for command in self.tree.get_commands()),
+                         key=lambda command: command["name"])
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    async def sync_commands(self, force: bool = False) -> bool:
+        """Sync the command tree only if it changed since the last successful sync
+        
+        Syncing is slow and globally rate limited, so the fingerprint of the
+        last synced tree is kept in the store, per scope (global or DEV_GUILD).
+        """
+        guild = discord.Object(self.DEV_GUILD) if self.DEV_GUILD else None
+        if guild is not None:
+            self.tree.copy_global_to(guild=guild)
+        key = f"command_tree:{self.DEV_GUILD or 'global'}"
+        fingerprint = self.command_fingerprint()
+        if not force and self.store.get_meta(key) == fingerprint:
+            return False
+        try:
+            await self.tree.sync(guild=guild)
+        except discord.HTTPException:
+            log.exception("Command tree sync failed; will retry on next start")
+            return False
+        with self.store.transaction() as tx:
+            tx.set_meta(key, fingerprint)
+        return True
+
+# ==================== GUILD PARTITIONS ====================
+
+    def partition_id(self, guild_id: Optional[int]) -> int:
+        """Partition key for a guild; the home guild is partition 0 (so is None, but nothing runs in DMs)"""
+        return 0 if guild_id is None or guild_id == self.HOME_GUILD else guild_id
+
+    def state_for(self, guild_id: Optional[int]) -> GuildState:
+        """The partition a guild's events work on, loading it from the store on first use"""
+        key = self.partition_id(guild_id)
+        state = self.partitions.get(key)
+        if state is None:
+            store = self.store.partition(key)
+            state = self._install(GuildState(key, store), store.load_timers())
+        return state
+
+    def _install(self, state: GuildState, timers: List[Tuple[str, str, float]]) -> GuildState:
+        key = state.guild_id
+        self.partitions[key] = state
+        state.bounties.status_listeners.append(lambda bounty, old: self._reschedule(state, bounty, old))
+        state.bounties.status_listeners.append(self._count_transition)
+        state.bounties.status_listeners.append(lambda bounty, old: self._refresh(state, bounty))
+        self.timers.load(((key, bounty_id), kind, due) for bounty_id, kind, due in timers)
+        return state
+
+    def _serves(self, key: int) -> bool:
+        """Whether a partition's guild is on one of this process's shards"""
+        guild_id = self.HOME_GUILD if key == 0 else key
+        if guild_id is None or self.shard_ids is None or not self.shard_count:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+
+    async def preload_partitions(self):
+        """Load stored partitions in a worker thread while the gateway connects
+        
+        Members, bounties and their indexes are built off the event loop, so
+        heartbeats and early interactions are not held up by a large store.
+        A guild that gets an event first is loaded on demand as usual and
+        its preloaded copy is dropped.
+        """
+        reader = self.store.reader()
+        
+        def load(key: int):
+            view = reader.partition(key)
+            return GuildState(key, view), view.load_timers()
+        
+        try:
+            for key in await asyncio.to_thread(reader.guild_ids):
+                if key in self.partitions or not self._serves(key):
+                    continue
+                state, timers = await asyncio.to_thread(load, key)
+                if key not in self.partitions:
+                    state.attach(self.store.partition(key))
+                    self._install(state, timers)
+        except Exception:
+            log.exception("Preloading partitions failed; guilds will load on first use")
+        finally:
+            if reader is not self.store:
+                reader.close()
+
+    async def on_guild_available(self, guild: discord.Guild):
+        # Load eagerly so the guild's deadlines fire even before anyone interacts;
+        # a preload still running will most likely bring it in off the event loop
+        if self.preload is not None and not self.preload.done():
+            await asyncio.shield(self.preload)
+        state = self.state_for(guild.id)
+        # Fires on every (re)connect that didn't resume, i.e. whenever events may have been missed
+        if state.guild_id not in self.reconciling:
+            self.reconciling.add(state.guild_id)
+            try:
+                await self.reconcile(state)
+            finally:
+                self.reconciling.discard(state.guild_id)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self.state_for(guild.id)
+
+    def channel_id(self, state: GuildState, kind: str) -> Optional[int]:
+        """Configured channel of `kind` (board/verification/log) for a partition"""
+        channel_id = state.channels.get(kind)
+        if channel_id is None and state.guild_id == 0:
+            channel_id = {"board": self.BOUNTY_BOARD_CHANNEL, "verification": self.VERIFICATION_CHANNEL,
+                          "log": self.LOG_CHANNEL}[kind]
+        return channel_id
+
+    def log(self, state: GuildState, line: str):
+        """Queue a line for the partition's log channel digest"""
+        self.outbound.log(self.channel_id(state, "log"), line)
+
+    @app_commands.command(name="configure", description="Set this server's bounty channels (AVF or server managers)")
+    @app_commands.describe(
+        board="Where posted bounties go",
+        verification="Where verification requests go",
+        log="Where bot logs go"
+    )
+    @timed_command
+    async def configure(self, interaction: discord.Interaction, board: Optional[discord.TextChannel] = None,
+                        verification: Optional[discord.TextChannel] = None, log: Optional[discord.TextChannel] = None):
+        """Per-guild channel setup; the first manager to configure a guild with no AVF becomes its first AVF"""
+        state = self.state_for(interaction.guild_id)
+        user_id = interaction.user.id
+        manages_guild = interaction.permissions.manage_guild
+        if not (state.members.is_avf(user_id) or manages_guild):
+            await interaction.response.send_message("Only AVF members or server managers can configure the bot.", ephemeral=True)
+            return
+        
+        with state.store.transaction() as tx:
+            for kind, channel in zip(CHANNEL_KINDS, (board, verification, log)):
+                if channel is not None:
+                    state.set_channel(kind, channel.id)
+            if not any(m.is_avf() for m in state.members.values()):
+                member = state.get_or_create_member(user_id)
+                member.role = Role.AVF
+                tx.put_member(member)
+            tx.log_event("guild_configured", by=user_id, channels=state.channels)
+        
+        lines = [f"{kind.title()}: <#{self.channel_id(state, kind)}>" if self.channel_id(state, kind) else f"{kind.title()}: not set"
+                 for kind in CHANNEL_KINDS]
+        await interaction.response.send_message("Channels updated.\n" + "\n".join(lines), ephemeral=True)
+
+# ==================== METRICS ====================
+
+    def _count_transition(self, bounty: Bounty, old_status: BountyStatus):
+        self.metrics.transitions.inc(**{"from": old_status.value, "to": bounty.status.value})
+
+    def _observe_discord_call(self, route: str, seconds: float, rate_limited: bool):
+        # 429s are counted from discord.py's own rate-limit log (see Metrics.watch_rate_limits), which
+        # also sees the ones it retries; a 429 reaching us here was already logged there
+        self.metrics.discord_seconds.observe(seconds, route=route)
+
+    @app_commands.command(name="stats", description="Bot performance stats (AVF only)")
+    @timed_command
+    async def stats(self, interaction: discord.Interaction):
+        """Latency percentiles, loop lag, queue depths and slowest calls"""
+        if not self.state_for(interaction.guild_id).members.is_avf(interaction.user.id):
+            await interaction.response.send_message("Only AVF members can view stats.", ephemeral=True)
+            return
+        
+        m = self.metrics
+        embed = discord.Embed(title="Greg Stats", color=0x0099ff)
+        
+        for title, histogram, label in (("Commands", m.command_seconds, "command"),
+                                        ("Reactions", m.reaction_seconds, "handler")):
+            lines = []
+            for key, series in sorted(histogram.series.items()):
+                labels = dict(key)
+                lines.append(f"`{labels[label]}` n={series[2]} p50≤{histogram.quantile(0.5, **labels) * 1e3:g}ms "
+                             f"p99≤{histogram.quantile(0.99, **labels) * 1e3:g}ms")
+            embed.add_field(name=title, value="\n".join(lines) or "No calls yet", inline=False)
+        
+        embed.add_field(name="Event loop lag", value=f"p99≤{m.loop_lag.quantile(0.99) * 1e3:g}ms", inline=True)
+        embed.add_field(name="Queues", value=(f"outbound {self.outbound.depth()}, digest {self.outbound.digest_depth()}, "
+                                              f"timers {len(self.timers)}"), inline=True)
+        embed.add_field(name="Shards", value=(f"{len(self.shards)} of {self.shard_count or 1}, "
+                                              f"{len(self.partitions)} guild partitions"), inline=True)
+        embed.add_field(name="Discord 429s", value=str(int(sum(m.discord_429s.values.values()))), inline=True)
+        
+        transitions = [f"{dict(k)['from']} → {dict(k)['to']}: {int(v)}" for k, v in sorted(m.transitions.values.items())]
+        embed.add_field(name="Transitions", value="\n".join(transitions[:15]) or "None yet", inline=False)
+        
+        slowest = [f"`{name}` {seconds * 1e3:.1f}ms" + (" (profiled)" if stats else "")
+                   for seconds, _, name, stats in m.slow_calls.report()[:5]]
+        embed.add_field(name="Slowest calls", value="\n".join(slowest) or "None yet", inline=False)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# ==================== TIMED RULES ====================
+
+    CLIP_TIMER_PREFIX = "clips:"  # Emit timers are keyed (partition, "clips:<vod>") next to bounty timers
+    TIMER_KINDS = ("escalate", "auto_approve", "claim_expiry")
+
+    def _persist_timer(self, subject: Tuple[int, str], kind: str, due: float):
+        partition, bounty_id = subject
+        self.partitions[partition].store.put_timer(bounty_id, kind, due)
 
-    def get_or_create_member(self, discord_id: int) -> Member:
-        """Get member or create new one with default role"""
-        if discord_id not in self.members:
-            # TODO: You might want to check Discord roles here to auto-assign AVF
-            self.members[discord_id] = Member(discord_id, Role.MEMBER)
-        return self.members[discord_id]
+    def _forget_timer(self, subject: Tuple[int, str], kind: str):
+        partition, bounty_id = subject
+        self.partitions[partition].store.delete_timer(bounty_id, kind)
+
+    def _reschedule(self, state: GuildState, bounty: Bounty, old_status: Optional[BountyStatus] = None):
+        """Swap a bounty's pending timers for the ones its current status needs"""
+        subject = (state.guild_id, bounty.id)
+        for kind in self.TIMER_KINDS:
+            self.timers.cancel(subject, kind)
+        
+        if bounty.status == BountyStatus.POSTED:
+            self.timers.schedule(subject, "escalate", self.ESCALATE_AFTER)
+        elif bounty.status in (BountyStatus.AWAITING_VERIFICATION, BountyStatus.AWAITING_POST_VERIFICATION):
+            self.timers.schedule(subject, "auto_approve", self.AUTO_APPROVE_AFTER)
+        elif bounty.status == BountyStatus.CLAIMED:
+            hours = bounty.timeframe_hours or self.DEFAULT_CLAIM_HOURS
+            self.timers.schedule(subject, "claim_expiry", hours * 3600)
+
+    async def _on_timer(self, subject: Tuple[int, str], kind: str):
+        """A deadline passed - apply the GregTheory rule if the bounty is still in that state"""
+        partition, bounty_id = subject
+        state = self.partitions.get(partition)
+        if kind == "emit_clips":
+            if state:
+                await self._emit_clips(state, bounty_id[len(self.CLIP_TIMER_PREFIX):])
+            return
+        bounty = state.bounties.get(bounty_id) if state else None
+        if bounty is None:
+            return
+        
+        if kind == "escalate":
+            # Not re-armed: the reward grows once per 24h unclaimed stretch, not every day it stays unclaimed
+            if state.engine.escalate(bounty).ok:
+                self._refresh(state, bounty)  # Reward changed without a status change
+                if bounty.reward:
+                    self.log(state, f"📈 Bounty {bounty.id} still unclaimed, reward raised to {bounty.reward}")
+        
+        elif kind == "auto_approve":
+            was_pre_verification = bounty.status == BountyStatus.AWAITING_VERIFICATION
+            if state.engine.auto_approve(bounty).ok:
+                self.log(state, f"⏰ Bounty {bounty.id} auto-approved after 48h without a verifier")
+                if was_pre_verification:
+                    await self._post_to_board(state, bounty, None)
+        
+        elif kind == "claim_expiry":
+            claimer_id = bounty.assigned_to
+            if state.engine.release_claim(bounty).ok:
+                self.log(state, f"⌛ Claim on bounty {bounty.id} expired, back on the board at {bounty.reward}")
+                # Take back their ⛏️ so the board (and reconciliation) no longer sees them as claiming
+                channel = self.get_channel(self.channel_id(state, "board"))
+                if channel is not None and bounty.message_id and claimer_id:
+                    self.outbound.remove_reaction(channel.get_partial_message(bounty.message_id),
+                                                  self.MINE_EMOJI, claimer_id)
+                user = self.get_user(claimer_id) if claimer_id else None
+                if user:
+                    self.outbound.dm(user, f"Your claim on bounty {bounty.id} ran out of time and was released.")
+
+# ==================== MEMBER MANAGEMENT ====================
 
     @app_commands.command(name="register", description="Register as a member")
+    @timed_command
     async def register(self, interaction: discord.Interaction):
         """Let users register themselves"""
-        member = self.get_or_create_member(interaction.user.id)
+        state = self.state_for(interaction.guild_id)
+        member = state.get_or_create_member(interaction.user.id)
+        with state.store.transaction() as tx:
+            tx.put_member(member)
+            tx.log_event("member_registered", member=member.discord_id)
         await interaction.response.send_message(
             f"Welcome! You're registered as: {member.role.value}\n"
             f"Time credits owed: {member.time_credits_owed}", 
@@ -116,16 +513,21 @@ class BountyBot(commands.Bot):
 
     @app_commands.command(name="promote", description="Promote a member to AVF (AVF only)")
     @app_commands.describe(user="User to promote")
+    @timed_command
     async def promote_member(self, interaction: discord.Interaction, user: discord.Member):
         """AVF can promote members"""
-        promoter = self.get_or_create_member(interaction.user.id)
+        state = self.state_for(interaction.guild_id)
+        promoter_id = interaction.user.id
         
-        if not promoter.is_avf():
+        if not state.members.is_avf(promoter_id):
             await interaction.response.send_message("Only AVF members can promote others.", ephemeral=True)
             return
         
-        target = self.get_or_create_member(user.id)
+        target = state.get_or_create_member(user.id)
         target.role = Role.AVF
+        with state.store.transaction() as tx:
+            tx.put_member(target)
+            tx.log_event("member_promoted", member=target.discord_id, by=promoter_id)
         
         await interaction.response.send_message(f"{user.mention} has been promoted to AVF!")
 
@@ -135,260 +537,501 @@ class BountyBot(commands.Bot):
     @app_commands.describe(
         title="Short title for the bounty",
         description="Detailed description of what needs to be done",
-        bounty_type="Type of bounty (regular for AVF, community for members)"
+        bounty_type="Type of bounty (regular for AVF, community for members)",
+        reward="Time credits paid on completion (grows 10% a day while unclaimed)",
+        timeframe_hours="Hours a claimer has before the claim is released"
     )
     @app_commands.choices(bounty_type=[
         app_commands.Choice(name="Regular (AVF only)", value="regular"),
         app_commands.Choice(name="Community (needs verification)", value="community"),
         app_commands.Choice(name="Resource (Big Iron)", value="resource")
     ])
-    async def post_bounty(self, interaction: discord.Interaction, title: str, description: str, bounty_type: str):
+    @timed_command
+    async def post_bounty(self, interaction: discord.Interaction, title: str, description: str, bounty_type: str,
+                          reward: app_commands.Range[int, 0, MAX_REWARD] = 0, timeframe_hours: Optional[app_commands.Range[int, 1]] = None):
         """Main bounty posting command"""
-        member = self.get_or_create_member(interaction.user.id)
-        
-        # Check if member can post
-        if not member.can_post_bounty():
-            await interaction.response.send_message(
-                f"You owe {member.time_credits_owed} time credits. Clear your debt first!", 
-                ephemeral=True
-            )
-            return
-        
-        # Create bounty ID
-        self.bounty_counter += 1
-        bounty_id = f"bounty_{self.bounty_counter}"
-        
-        # Determine initial status based on type and poster role
-        bounty_type_enum = BountyType(bounty_type)
+        state = self.state_for(interaction.guild_id)
+        member = state.members.view(interaction.user.id)
         
-        if bounty_type_enum == BountyType.REGULAR:
-            if not member.is_avf():
-                await interaction.response.send_message("Only AVF members can post regular bounties.", ephemeral=True)
-                return
-            initial_status = BountyStatus.POSTED  # AVF bounties go straight to board
-        elif bounty_type_enum == BountyType.COMMUNITY:
-            initial_status = BountyStatus.AWAITING_VERIFICATION  # Needs pre-verification
-        else:  # RESOURCE
-            initial_status = BountyStatus.AWAITING_VERIFICATION  # Resources also need verification
-        
-        # Create the bounty
-        bounty = Bounty(
-            id=bounty_id,
+        # A draft until a posting rule accepts it; only then does it get an ID
+        draft = Bounty(
+            id="",
             creator_id=interaction.user.id,
-            bounty_type=bounty_type_enum,
-            status=initial_status,
+            bounty_type=BountyType(bounty_type),
+            status=BountyStatus.DRAFT,
             title=title,
-            description=description
+            description=description,
+            reward=reward,
+            timeframe_hours=timeframe_hours
         )
+        matched = self.rules.match(POST, draft, member, interaction)
+        if matched:
+            _, action = matched
+            await action(state, draft, member, interaction)
+
+    async def _deny_debt(self, state: GuildState, draft: Bounty, member: Member, interaction: discord.Interaction):
+        await interaction.response.send_message(
+            f"You owe {member.time_credits_owed} time credits. Clear your debt first!", 
+            ephemeral=True
+        )
+
+    async def _deny_regular(self, state: GuildState, draft: Bounty, member: Member, interaction: discord.Interaction):
+        await interaction.response.send_message("Only AVF members can post regular bounties.", ephemeral=True)
+
+    def _create_bounty(self, state: GuildState, draft: Bounty, status: BountyStatus) -> Bounty:
+        """Give an accepted draft its ID and initial status, then persist and index it"""
+        return self._create_bounties(state, [(draft, status)])[0]
+
+    def _create_bounties(self, state: GuildState, drafts: List[Tuple[Bounty, BountyStatus]]) -> List[Bounty]:
+        """Give accepted drafts IDs from one counter bump and their initial statuses, then persist and index them
         
-        self.bounties[bounty_id] = bounty
-        
-        # Post to appropriate channel
-        if initial_status == BountyStatus.POSTED:
-            await self._post_to_board(bounty, interaction)
-        else:
-            await self._post_for_verification(bounty, interaction)
+        Everything is written in one transaction (joining the caller's, if
+        any); nothing is indexed and the counter is put back if it fails.
+        A timer scheduled before the failure finds no bounty and does nothing.
+        """
+        counter = state.bounty_counter
+        created = []
+        try:
+            with state.store.transaction() as tx:
+                for (draft, status), bounty_id in zip(drafts, state.next_bounty_ids(len(drafts))):
+                    draft.id = bounty_id
+                    draft.status = status
+                    self._reschedule(state, draft)
+                    tx.put_bounty(draft)
+                    tx.log_event("bounty_created", bounty=draft.id, creator=draft.creator_id)
+                    created.append(draft)
+                tx.set_meta("bounty_counter", state.bounty_counter)
+        except Exception:
+            state.bounty_counter = counter
+            raise
+        for bounty in created:
+            state.bounties.add(bounty)
+        return created
+
+    async def _submit_to_board(self, state: GuildState, draft: Bounty, member: Member, interaction: discord.Interaction):
+        """AVF bounties go straight to the board"""
+        await self._post_to_board(state, self._create_bounty(state, draft, BountyStatus.POSTED), interaction)
 
-    async def _post_to_board(self, bounty: Bounty, interaction: discord.Interaction):
-        """Post bounty to the main board where it can be claimed"""
-        if not self.BOUNTY_BOARD_CHANNEL:
-            await interaction.response.send_message("Bounty board channel not configured!", ephemeral=True)
+    async def _submit_for_verification(self, state: GuildState, draft: Bounty, member: Member,
+                                       interaction: discord.Interaction):
+        """Community and resource bounties need pre-verification"""
+        bounty = self._create_bounty(state, draft, BountyStatus.AWAITING_VERIFICATION)
+        await self._post_for_verification(state, bounty, interaction)
+
+    async def _post_to_board(self, state: GuildState, bounty: Bounty, interaction: discord.Interaction,
+                             on_posted: Optional[Callable[[], None]] = None):
+        """Post bounty to the main board where it can be claimed; `on_posted()` runs once the message exists"""
+        channel_id = self.channel_id(state, "board")
+        if not channel_id:
+            if interaction:
+                await interaction.response.send_message("Bounty board channel not configured!", ephemeral=True)
             return
         
-        channel = self.get_channel(self.BOUNTY_BOARD_CHANNEL)
+        channel = self.get_channel(channel_id)
         if not channel:
-            await interaction.response.send_message("Could not find bounty board channel!", ephemeral=True)
+            if interaction:
+                await interaction.response.send_message("Could not find bounty board channel!", ephemeral=True)
             return
         
-        embed = discord.Embed(
-            title=f"🎯 {bounty.title}",
-            description=bounty.description,
-            color=0x00ff00
-        )
-        embed.add_field(name="Bounty ID", value=bounty.id, inline=True)
-        embed.add_field(name="Type", value=bounty.bounty_type.value, inline=True)
-        embed.add_field(name="Status", value="Available to claim", inline=True)
-        embed.set_footer(text=f"React with {self.MINE_EMOJI} to claim this bounty")
+        snapshot = self.renderer.snapshot("board", bounty)
+        queued = (state.guild_id, bounty.id, "board")
+        self.posts_queued.add(queued)
         
-        message = await channel.send(embed=embed)
-        await message.add_reaction(self.MINE_EMOJI)
+        def on_sent(message: discord.Message):
+            self.posts_queued.discard(queued)
+            bounty.message_id = message.id
+            self._track_message(state, bounty, message.id, "board", snapshot)
+            if on_posted:
+                on_posted()
         
-        bounty.message_id = message.id
+        self.outbound.send(channel, embed=self.renderer.embed(snapshot), reactions=(self.MINE_EMOJI,), on_sent=on_sent)
         
-        await interaction.response.send_message(f"Bounty {bounty.id} posted to the board!")
+        if interaction:
+            await interaction.response.send_message(f"Bounty {bounty.id} posted to the board!")
 
-    async def _post_for_verification(self, bounty: Bounty, interaction: discord.Interaction):
+    async def _post_for_verification(self, state: GuildState, bounty: Bounty, interaction: discord.Interaction):
         """Post community bounty for pre-verification"""
-        if not self.VERIFICATION_CHANNEL:
+        channel_id = self.channel_id(state, "verification")
+        if not channel_id:
             await interaction.response.send_message("Verification channel not configured!", ephemeral=True)
             return
         
-        channel = self.get_channel(self.VERIFICATION_CHANNEL)
+        channel = self.get_channel(channel_id)
         if not channel:
             await interaction.response.send_message("Could not find verification channel!", ephemeral=True)
             return
         
-        embed = discord.Embed(
-            title=f"📋 Verification Request: {bounty.title}",
-            description=bounty.description,
-            color=0xffaa00
-        )
-        embed.add_field(name="Bounty ID", value=bounty.id, inline=True)
-        embed.add_field(name="Type", value=bounty.bounty_type.value, inline=True)
-        embed.add_field(name="Submitted by", value=f"<@{bounty.creator_id}>", inline=True)
-        embed.set_footer(text=f"AVF: React {self.APPROVE_EMOJI} to approve, {self.REJECT_EMOJI} to reject")
+        self._send_verification(state, bounty, channel)
         
-        message = await channel.send(embed=embed)
-        await message.add_reaction(self.APPROVE_EMOJI)
-        await message.add_reaction(self.REJECT_EMOJI)
+        await interaction.response.send_message(f"Bounty {bounty.id} submitted for verification!")
+
+    def _send_verification(self, state: GuildState, bounty: Bounty, channel,
+                           on_posted: Optional[Callable[[], None]] = None):
+        """Post the verification message for the bounty's current stage (pre- or completion)"""
+        snapshot = self.renderer.snapshot("verification", bounty)
+        stage = bounty.review_stage()
+        queued = (state.guild_id, bounty.id, stage)
+        self.posts_queued.add(queued)
         
-        bounty.message_id = message.id
+        def on_sent(message: discord.Message):
+            self.posts_queued.discard(queued)
+            # Unless the bounty moved to the next stage while this was queued; verdicts must not count there
+            if bounty.review_stage() == stage:
+                bounty.verification_message_id = message.id
+                bounty.verification_stage = stage
+                self._track_message(state, bounty, message.id, "verification", snapshot)
+            if on_posted:
+                on_posted()
         
-        await interaction.response.send_message(f"Bounty {bounty.id} submitted for verification!")
+        self.outbound.send(channel, embed=self.renderer.embed(snapshot),
+                           reactions=(self.APPROVE_EMOJI, self.REJECT_EMOJI), on_sent=on_sent)
+
+    def _track_message(self, state: GuildState, bounty: Bounty, message_id: int, kind: str, snapshot):
+        """Index and persist a freshly sent board/verification message"""
+        state.bounties.index_message(bounty, message_id)
+        self.renderer.remember(message_id, kind, bounty, snapshot)
+        with state.store.transaction() as tx:
+            tx.put_bounty(bounty)
+
+# ==================== MESSAGE RENDERING ====================
+
+    @functools.cached_property
+    def renderer(self) -> BountyRenderer:
+        # Built on first use so emoji customisations made after __init__ are picked up
+        return BountyRenderer(self.MINE_EMOJI, self.VERIFY_EMOJI, self.APPROVE_EMOJI, self.REJECT_EMOJI)
+
+    def _refresh(self, state: GuildState, bounty: Bounty):
+        """Re-render the bounty's board and verification messages, editing only those that changed
+        
+        Runs on every status change (reactions, timers, anything else), so
+        messages follow the bounty without anyone reading them back.
+        """
+        for kind, message_id in (("board", bounty.message_id), ("verification", bounty.verification_message_id)):
+            if message_id is None:
+                continue
+            snapshot = self.renderer.update(message_id, kind, bounty)
+            if snapshot is None:
+                self.edits_skipped.inc(kind=kind)
+                continue
+            channel = self.get_channel(self.channel_id(state, kind))
+            if channel is not None:
+                self.outbound.edit(channel.get_partial_message(message_id), embed=self.renderer.embed(snapshot))
 
 # ==================== CLAIMING BOUNTIES ====================
 
     @commands.Cog.listener()
-    async def on_reaction_add(self, reaction, user):
-        """Handle reaction-based claiming and verification"""
-        if user.bot:
-            return
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        """Handle reaction-based claiming and verification
         
-        # Find bounty by message ID
-        bounty = None
-        for b in self.bounties.values():
-            if b.message_id == reaction.message.id:
-                bounty = b
-                break
+        Uses the raw event so reactions on messages that fell out of the
+        message cache (older board posts) still get processed.
+        """
+        if self.user and payload.user_id == self.user.id:
+            return
+        if payload.member and payload.member.bot:
+            return
+        if payload.guild_id is None:
+            return  # Bounty messages live in guild channels; reactions on the bot's DMs mean nothing
         
+        state = self.state_for(payload.guild_id)
+        bounty = state.bounties.find_by_message(payload.message_id)
         if not bounty:
             return
         
-        member = self.get_or_create_member(user.id)
-        
-        # Handle claiming with MINE emoji
-        if str(reaction.emoji) == self.MINE_EMOJI:
-            await self._handle_claim_reaction(bounty, member, reaction)
-        
-        # Handle verification reactions (AVF only)
-        elif str(reaction.emoji) in [self.APPROVE_EMOJI, self.REJECT_EMOJI]:
-            await self._handle_verification_reaction(bounty, member, reaction)
-        
-        # Handle completion verification request
-        elif str(reaction.emoji) == self.VERIFY_EMOJI:
-            await self._handle_completion_verification_request(bounty, member, reaction)
+        # Drive-by reactors stay unrecorded; the engine keeps a record only if they claim
+        member = state.members.view(payload.user_id)
+        reaction = await self._resolve_reaction(payload)
+        if reaction is None:
+            return
+        await self._dispatch_reaction(state, bounty, member, reaction)
 
-    async def _handle_claim_reaction(self, bounty: Bounty, member: Member, reaction):
-        """Handle someone trying to claim a bounty"""
-        if not bounty.can_be_claimed():
-            await reaction.remove(member.discord_id)
+    @functools.cached_property
+    def reaction_events(self) -> Dict[str, str]:
+        """Rule event each reaction emoji raises"""
+        return {self.MINE_EMOJI: CLAIM, self.VERIFY_EMOJI: REQUEST_COMPLETION,
+                self.APPROVE_EMOJI: VERDICT, self.REJECT_EMOJI: VERDICT}
+
+    async def _dispatch_reaction(self, state: GuildState, bounty: Bounty, member: Member, reaction):
+        """Route a reaction on a tracked message through the rules"""
+        event = self.reaction_events.get(str(reaction.emoji))
+        matched = self.rules.match(event, bounty, member, reaction) if event else None
+        if matched is None:
             return
         
-        if not member.can_claim_bounty():
-            # Remove their reaction and DM them why
-            await reaction.remove(member.discord_id)
-            user = self.get_user(member.discord_id)
-            if user:
-                reason = "you have outstanding time credits" if member.time_credits_owed > 0 else "you already have an assigned bounty"
-                await user.send(f"Cannot claim bounty {bounty.id}: {reason}")
+        rule, action = matched
+        with self.metrics.time(self.metrics.reaction_seconds, rule.name, handler=rule.action):
+            await action(state, bounty, member, reaction)
+
+    @commands.Cog.listener()
+    async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
+        """Take back a verification vote whose reaction was removed"""
+        emoji = str(payload.emoji)
+        if emoji not in (self.APPROVE_EMOJI, self.REJECT_EMOJI):
+            return
+        if self.user and payload.user_id == self.user.id or payload.guild_id is None:
             return
+        state = self.state_for(payload.guild_id)
+        state.votes.withdraw(payload.message_id, payload.user_id, emoji == self.APPROVE_EMOJI)
+
+    async def _withdraw_reaction(self, state: GuildState, bounty: Bounty, member: Member, reaction):
+        """Take back a reaction no rule lets this member make right now"""
+        self.outbound.remove_reaction(reaction.message, reaction.emoji, member.discord_id)
+
+    async def _resolve_reaction(self, payload: discord.RawReactionActionEvent) -> Optional["RawReaction"]:
+        """Build a reaction handle from a raw event without fetching the message
         
-        # Successful claim
-        bounty.assigned_to = member.discord_id
-        bounty.status = BountyStatus.CLAIMED
-        member.assigned_bounties.add(bounty.id)
+        Handlers only add/remove reactions and edit, which a partial message
+        supports; content is rendered from the bounty, never read back.
+        """
+        channel = self.get_channel(payload.channel_id)
+        if channel is None:
+            return None
+        return RawReaction(payload.emoji, channel.get_partial_message(payload.message_id))
+
+    async def _handle_claim_reaction(self, state: GuildState, bounty: Bounty, member: Member, reaction):
+        """Handle someone trying to claim a bounty"""
+        # Commit first - only the winner of a reaction storm gets past this
+        outcome = state.engine.claim(bounty, member)
         
-        # Update the message
-        embed = reaction.message.embeds[0]
-        embed.color = 0xff6600  # Orange for claimed
-        embed.set_field_at(2, name="Status", value=f"Claimed by <@{member.discord_id}>", inline=True)
-        embed.set_footer(text=f"React with {self.VERIFY_EMOJI} when complete")
+        if not outcome.ok:
+            # Remove their reaction and DM them why if it's about them, not the bounty
+            self.outbound.remove_reaction(reaction.message, reaction.emoji, member.discord_id)
+            if outcome in (HAS_DEBT, HAS_ASSIGNMENT):
+                user = self.get_user(member.discord_id)
+                if user:
+                    self.outbound.dm(user, f"Cannot claim bounty {bounty.id}: {outcome.reason}")
+            return
         
-        await reaction.message.edit(embed=embed)
-        await reaction.message.add_reaction(self.VERIFY_EMOJI)
+        # The board message was re-rendered by the status change; offer the next step
+        self.outbound.add_reaction(reaction.message, self.VERIFY_EMOJI)
         
-        # Notify in log channel
-        if self.LOG_CHANNEL:
-            log_channel = self.get_channel(self.LOG_CHANNEL)
-            if log_channel:
-                await log_channel.send(f"🎯 Bounty {bounty.id} claimed by <@{member.discord_id}>")
+        # Notify in log channel (batched into the next digest)
+        self.log(state, f"🎯 Bounty {bounty.id} claimed by <@{member.discord_id}>")
+
+    def _vote(self, state: GuildState, bounty: Bounty, member: Member, reaction) -> Optional[bool]:
+        """Count an AVF verdict; returns the outcome once the bounty type's quorum is reached, else None"""
+        approved = str(reaction.emoji) == self.APPROVE_EMOJI
+        tally = state.votes.tally(reaction.message.id)
+        if not tally.add(member.discord_id, approved):
+            if tally.votes[member.discord_id] != approved:
+                # One vote each: the opposite reaction goes until they take back the first
+                self.outbound.remove_reaction(reaction.message, reaction.emoji, member.discord_id)
+            return None
+        quorum = self.QUORUMS.get(bounty.bounty_type, SINGLE)
+        verdict = quorum.verdict(tally)
+        if verdict is None:
+            self.log(state, f"🗳️ Bounty {bounty.id}: {tally.approvals} of {quorum.needed} approvals "
+                            f"({tally.rejections} against)")
+        return verdict
 
-    async def _handle_verification_reaction(self, bounty: Bounty, member: Member, reaction):
+    async def _handle_verification_reaction(self, state: GuildState, bounty: Bounty, member: Member, reaction):
         """Handle AVF verification of community bounties"""
-        if not member.is_avf():
-            await reaction.remove(member.discord_id)
+        approved = self._vote(state, bounty, member, reaction)
+        if approved is None:
             return
         
-        if bounty.status != BountyStatus.AWAITING_VERIFICATION:
+        if not state.engine.review(bounty, member, approved).ok:
             return
         
-        approved = str(reaction.emoji) == self.APPROVE_EMOJI
-        
+        # The verification message was re-rendered as approved/rejected by the status change
         if approved:
-            bounty.status = BountyStatus.POSTED
-            bounty.verifier_id = member.discord_id
-            
             # Move to bounty board
-            if self.BOUNTY_BOARD_CHANNEL:
-                await self._post_to_board(bounty, None)
-            
-            # Update verification message
-            embed = reaction.message.embeds[0]
-            embed.color = 0x00ff00
-            embed.title = f"✅ APPROVED: {bounty.title}"
-            embed.add_field(name="Verified by", value=f"<@{member.discord_id}>", inline=True)
-            await reaction.message.edit(embed=embed)
-            
-        else:  # Rejected
-            bounty.status = BountyStatus.REJECTED
-            
-            embed = reaction.message.embeds[0]
-            embed.color = 0xff0000
-            embed.title = f"❌ REJECTED: {bounty.title}"
-            embed.add_field(name="Rejected by", value=f"<@{member.discord_id}>", inline=True)
-            await reaction.message.edit(embed=embed)
-            
-            # TODO: You might want to add time credits penalty or notification to creator
-
-    async def _handle_completion_verification_request(self, bounty: Bounty, member: Member, reaction):
-        """Handle request for post-completion verification"""
-        if bounty.status != BountyStatus.CLAIMED or bounty.assigned_to != member.discord_id:
-            await reaction.remove(member.discord_id)
+            await self._post_to_board(state, bounty, None)
+        else:
+            # No penalty for a rejected submission; the creator just hears why it never reached the board
+            creator = self.get_user(bounty.creator_id)
+            if creator:
+                self.outbound.dm(creator, f"Your bounty {bounty.id} ({bounty.title}) was rejected in verification.")
+            self.log(state, f"🚫 Bounty {bounty.id} rejected in verification by <@{member.discord_id}>")
+
+    async def _handle_completion_verification(self, state: GuildState, bounty: Bounty, member: Member, reaction):
+        """Handle AVF verdict on a claimed bounty's completion"""
+        approved = self._vote(state, bounty, member, reaction)
+        if approved is None:
             return
         
-        bounty.status = BountyStatus.AWAITING_POST_VERIFICATION
+        # Either way the claimer is freed to pick up new work; both messages re-render
+        state.engine.review_completion(bounty, member, approved)
+
+    async def _handle_completion_verification_request(self, state: GuildState, bounty: Bounty, member: Member, reaction):
+        """Handle request for post-completion verification"""
+        if not state.engine.request_completion(bounty, member).ok:
+            self.outbound.remove_reaction(reaction.message, reaction.emoji, member.discord_id)
+            return
         
         # Create verification request
-        if self.VERIFICATION_CHANNEL:
-            channel = self.get_channel(self.VERIFICATION_CHANNEL)
+        channel_id = self.channel_id(state, "verification")
+        if channel_id:
+            channel = self.get_channel(channel_id)
             if channel:
-                embed = discord.Embed(
-                    title=f"🔍 Completion Verification: {bounty.title}",
-                    description=f"<@{member.discord_id}> claims to have completed this bounty.",
-                    color=0x9966cc
-                )
-                embed.add_field(name="Bounty ID", value=bounty.id, inline=True)
-                embed.add_field(name="Original Description", value=bounty.description[:500], inline=False)
-                embed.set_footer(text=f"AVF: React {self.APPROVE_EMOJI} to verify completion, {self.REJECT_EMOJI} to reject")
-                
-                message = await channel.send(embed=embed)
-                await message.add_reaction(self.APPROVE_EMOJI)
-                await message.add_reaction(self.REJECT_EMOJI)
+                self._send_verification(state, bounty, channel)
+
+# ==================== RESTART RECONCILIATION ====================
+
+    def _open_messages(self, state: GuildState) -> Dict[str, Dict[int, Bounty]]:
+        """Tracked messages whose bounty is still waiting on a reaction, per channel kind"""
+        open_messages: Dict[str, Dict[int, Bounty]] = {"board": {}, "verification": {}}
+        for status in (BountyStatus.POSTED, BountyStatus.CLAIMED):
+            for bounty in state.bounties.by_status(status):
+                if bounty.message_id:
+                    open_messages["board"][bounty.message_id] = bounty
+        for status in (BountyStatus.AWAITING_VERIFICATION, BountyStatus.AWAITING_POST_VERIFICATION):
+            for bounty in state.bounties.by_status(status):
+                # A message left over from the previous stage has nothing left to decide
+                if bounty.verification_message_id and bounty.on_verification_message(bounty.verification_message_id):
+                    open_messages["verification"][bounty.verification_message_id] = bounty
+        return open_messages
+
+    def _unsent_board_posts(self, state: GuildState) -> List[Bounty]:
+        """Posted bounties with no board message, sent or queued - unclaimable until it exists"""
+        return [bounty for bounty in state.bounties.by_status(BountyStatus.POSTED)
+                if not bounty.message_id and (state.guild_id, bounty.id, "board") not in self.posts_queued]
+
+    def _unsent_verifications(self, state: GuildState) -> List[Bounty]:
+        """Bounties awaiting a verdict with no message for their current stage, sent or queued"""
+        unsent = []
+        for status in (BountyStatus.AWAITING_VERIFICATION, BountyStatus.AWAITING_POST_VERIFICATION):
+            for bounty in state.bounties.by_status(status):
+                if bounty.verification_message_id and bounty.on_verification_message(bounty.verification_message_id):
+                    continue
+                if (state.guild_id, bounty.id, bounty.review_stage()) not in self.posts_queued:
+                    unsent.append(bounty)
+        return unsent
+
+    def _missed(self, bounty: Bounty, message_id: int, emoji: str, user_id: int) -> bool:
+        """Whether a reaction found on a message is one stored state doesn't account for"""
+        if message_id == bounty.message_id:
+            if emoji == self.MINE_EMOJI:
+                return user_id != bounty.assigned_to
+            if emoji == self.VERIFY_EMOJI:
+                return user_id != bounty.assigned_to or bounty.status == BountyStatus.CLAIMED
+        if emoji in (self.APPROVE_EMOJI, self.REJECT_EMOJI) and bounty.on_verification_message(message_id):
+            return bounty.status in (BountyStatus.AWAITING_VERIFICATION, BountyStatus.AWAITING_POST_VERIFICATION)
+        return False
+
+    async def _scan_channel(self, channel, messages: Dict[int, Bounty], limiter: asyncio.Semaphore,
+                            found: List[Tuple[int, int, int, object]], unread: Dict[int, Set[int]]):
+        """Read the history pages holding open messages, collecting who reacted with our emojis
+        
+        Each page starts at the oldest open message not yet seen and covers
+        the 100 after it, so stretches of settled bounties between open ones
+        are skipped rather than re-read on every reconnect. `unread` maps
+        each message found to the emojis whose reactors are still being
+        read; once that is empty, `found` holds every reaction on it.
+        """
+        emojis = (self.MINE_EMOJI, self.VERIFY_EMOJI, self.APPROVE_EMOJI, self.REJECT_EMOJI)
+        
+        async def reactors(message, rank: int, reaction):
+            async with limiter:
+                users = [user.id async for user in reaction.users() if not user.bot]
+            found.extend((message.id, rank, user_id, message) for user_id in users)
+            unread[message.id].discard(rank)
+        
+        lookups = []
+        pending = sorted(messages)
+        while pending:
+            # Only reactions someone besides the bot added cost a lookup
+            seen = 0
+            async for message in channel.history(limit=100, after=discord.Object(id=pending[0] - 1),
+                                                 oldest_first=True):
+                seen, last = seen + 1, message.id
+                if message.id in messages:
+                    unread[message.id] = set()
+                    for reaction in message.reactions:
+                        emoji = str(reaction.emoji)
+                        if emoji in emojis and reaction.count > int(reaction.me):
+                            unread[message.id].add(emojis.index(emoji))
+                            lookups.append(reactors(message, emojis.index(emoji), reaction))
+            if seen < 100:
+                break  # Reached the end of the channel; any open messages left were deleted
+            pending = pending[bisect.bisect_right(pending, last):]
+        await asyncio.gather(*lookups)
+
+    async def reconcile(self, state: GuildState) -> int:
+        """Replay reactions added while the bot was down; returns how many were replayed
+        
+        Each handled reaction is committed with its transition, so stored
+        state is the checkpoint: only messages whose bounty still waits on a
+        reaction are scanned, a page of history at each of them, and
+        verification messages only for the stage the bounty is in now.
+        Both channels are paged concurrently within RECONCILE_TIMEOUT.
+        Discord doesn't date reactions, so what is found is diffed against
+        state: votes whose reaction is gone are dropped from their tallies,
+        then the rest is replayed through the normal handlers in a fixed
+        order: by message, then claim/verify/approve/reject, then user ID.
+        """
+        found: List[Tuple[int, int, int, object]] = []
+        unread: Dict[int, Set[int]] = {}
+        limiter = asyncio.Semaphore(self.RECONCILE_CONCURRENCY)
+        scans = []
+        for kind, messages in self._open_messages(state).items():
+            channel = self.get_channel(self.channel_id(state, kind))
+            if channel is not None and messages:
+                scans.append(self._scan_channel(channel, messages, limiter, found, unread))
+        try:
+            await asyncio.wait_for(asyncio.gather(*scans), self.RECONCILE_TIMEOUT)
+        except asyncio.TimeoutError:
+            log.warning("Reconciliation of partition %s timed out; replaying the %d reactions found",
+                        state.guild_id, len(found))
+        except discord.HTTPException:
+            log.exception("Reconciliation of partition %s failed; replaying the %d reactions found",
+                          state.guild_id, len(found))
+        
+        emojis = (self.MINE_EMOJI, self.VERIFY_EMOJI, self.APPROVE_EMOJI, self.REJECT_EMOJI)
+        # Votes taken back while disconnected; only messages whose reactors were all read can say so
+        verdicts: Dict[int, Set[Tuple[int, bool]]] = {message_id: set() for message_id, ranks in unread.items()
+                                                      if not ranks}
+        for message_id, rank, user_id, _ in found:
+            if message_id in verdicts and emojis[rank] in (self.APPROVE_EMOJI, self.REJECT_EMOJI):
+                verdicts[message_id].add((user_id, emojis[rank] == self.APPROVE_EMOJI))
+        dropped = sum(state.votes.keep_only(message_id, reactions) for message_id, reactions in verdicts.items())
+        if dropped:
+            log.info("Dropped %d verification votes withdrawn while disconnected in partition %s",
+                     dropped, state.guild_id)
+        
+        replayed = 0
+        for message_id, rank, user_id, message in sorted(found, key=lambda f: f[:3]):
+            # Checked against state as it is now, since earlier replays move bounties along
+            bounty = state.bounties.find_by_message(message_id)
+            if bounty is None or not self._missed(bounty, message_id, emojis[rank], user_id):
+                continue
+            reaction = RawReaction(discord.PartialEmoji(name=emojis[rank]), message)
+            await self._dispatch_reaction(state, bounty, state.members.view(user_id), reaction)
+            replayed += 1
+        if replayed:
+            self.reactions_replayed.inc(replayed)
+            self.log(state, f"🔁 Replayed {replayed} reactions added while the bot was offline")
+        
+        # A post queued but never sent before going down is lost with the queue; post it again
+        unposted = self._unsent_board_posts(state)
+        for bounty in unposted:
+            await self._post_to_board(state, bounty, None)
+        if unposted:
+            log.info("Re-posted %d unsent board messages in partition %s", len(unposted), state.guild_id)
+        unsent = self._unsent_verifications(state)
+        channel = self.get_channel(self.channel_id(state, "verification")) if unsent else None
+        if channel is not None:
+            for bounty in unsent:
+                self._send_verification(state, bounty, channel)
+            log.info("Re-posted %d unsent verification messages in partition %s", len(unsent), state.guild_id)
+        return replayed
 
 # ==================== MANUAL COMMANDS ====================
 
     @app_commands.command(name="my_bounties", description="Show your assigned bounties")
+    @timed_command
     async def my_bounties(self, interaction: discord.Interaction):
         """Let members check their current assignments"""
-        member = self.get_or_create_member(interaction.user.id)
+        state = self.state_for(interaction.guild_id)
+        assigned = state.members.assigned(interaction.user.id)
         
-        if not member.assigned_bounties:
+        if not assigned:
             await interaction.response.send_message("You have no assigned bounties.", ephemeral=True)
             return
         
         bounty_list = []
-        for bounty_id in member.assigned_bounties:
-            bounty = self.bounties.get(bounty_id)
+        for bounty_id in assigned:
+            bounty = state.bounties.get(bounty_id)
             if bounty:
                 bounty_list.append(f"**{bounty.id}**: {bounty.title} ({bounty.status.value})")
         
@@ -401,77 +1044,444 @@ class BountyBot(commands.Bot):
 
     @app_commands.command(name="list_bounties", description="List all bounties (with optional filter)")
     @app_commands.describe(status="Filter by status")
+    @timed_command
     async def list_bounties(self, interaction: discord.Interaction, status: Optional[str] = None):
-        """List bounties, optionally filtered by status"""
-        bounties = list(self.bounties.values())
-        
+        """List bounties page by page, optionally filtered by status"""
+        status_enum = None
         if status:
             try:
                 status_enum = BountyStatus(status.lower())
-                bounties = [b for b in bounties if b.status == status_enum]
             except ValueError:
                 await interaction.response.send_message(f"Invalid status. Valid options: {[s.value for s in BountyStatus]}", ephemeral=True)
                 return
         
-        if not bounties:
+        bounties = self.state_for(interaction.guild_id).bounties
+        if bounties.count(status_enum) == 0:
             await interaction.response.send_message("No bounties found.", ephemeral=True)
             return
         
-        # Group by status for better organization
-        status_groups = {}
-        for bounty in bounties:
-            if bounty.status not in status_groups:
-                status_groups[bounty.status] = []
-            status_groups[bounty.status].append(bounty)
+        view = BountyListView(bounties, status_enum)
+        await interaction.response.send_message(embed=view.render(), view=view)
+
+# ==================== SEARCH ====================
+
+    @app_commands.command(name="search_bounties", description="Search bounty titles and descriptions")
+    @app_commands.describe(query="Words to look for", status="Only bounties with this status",
+                           bounty_type="Only bounties of this type")
+    @app_commands.choices(
+        status=[app_commands.Choice(name=s.value.replace("_", " ").title(), value=s.value) for s in BountyStatus],
+        bounty_type=[app_commands.Choice(name=t.value.title(), value=t.value) for t in BountyType]
+    )
+    @timed_command
+    async def search_bounties(self, interaction: discord.Interaction, query: str,
+                              status: Optional[str] = None, bounty_type: Optional[str] = None):
+        """Ranked full-text search, best matches first"""
+        bounties = self.state_for(interaction.guild_id).bounties
+        results = bounties.search(query, BountyStatus(status) if status else None,
+                                  BountyType(bounty_type) if bounty_type else None, limit=10)
+        if not results:
+            await interaction.response.send_message(f"No bounties match \"{query}\".", ephemeral=True)
+            return
+
+        lines = [f"**{b.id}**: {b.title} ({b.bounty_type.value}, {b.status.value}, {b.reward} credits)" for b in results]
+        embed = discord.Embed(title=f"Search: {query}"[:256], description="\n".join(lines), color=0x0099ff)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @search_bounties.autocomplete("query")
+    async def _complete_search_terms(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        """Complete the word being typed from the indexed vocabulary"""
+        head, _, word = current.rpartition(" ")
+        if not word:
+            return []
+        bounties = self.state_for(interaction.guild_id).bounties
+        return [app_commands.Choice(name=f"{head} {term}".strip()[:100], value=f"{head} {term}".strip()[:100])
+                for term in bounties.suggest_terms(word)]
+
+    @app_commands.command(name="bounty", description="Show one bounty's details")
+    @app_commands.describe(bounty_id="Bounty ID, e.g. bounty_42")
+    @timed_command
+    async def bounty_info(self, interaction: discord.Interaction, bounty_id: str):
+        """Full details of a single bounty"""
+        bounty = self.state_for(interaction.guild_id).bounties.get(bounty_id.strip().lower())
+        if bounty is None:
+            await interaction.response.send_message(f"No bounty called {bounty_id}.", ephemeral=True)
+            return
+
+        embed = discord.Embed(title=f"{bounty.id}: {bounty.title}"[:256], description=bounty.description[:4000], color=0x0099ff)
+        embed.add_field(name="Type", value=bounty.bounty_type.value, inline=True)
+        embed.add_field(name="Status", value=bounty.status.value, inline=True)
+        embed.add_field(name="Reward", value=f"{bounty.reward} credits", inline=True)
+        embed.add_field(name="Posted by", value=f"<@{bounty.creator_id}>", inline=True)
+        if bounty.assigned_to is not None:
+            embed.add_field(name="Claimed by", value=f"<@{bounty.assigned_to}>", inline=True)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @bounty_info.autocomplete("bounty_id")
+    async def _complete_bounty_id(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        bounties = self.state_for(interaction.guild_id).bounties
+        choices = []
+        for bounty_id in bounties.complete_id(current or "bounty_"):
+            title = f"{bounty_id}: {bounties[bounty_id].title}"
+            choices.append(app_commands.Choice(name=title[:100], value=bounty_id))
+        return choices
+
+# ==================== CLIPS ====================
+
+    @app_commands.command(name="clip", description="Submit a clip timestamp from a VOD")
+    @app_commands.describe(vod="VOD link or ID", timestamp="Where the moment is, e.g. 1:02:03",
+                           end="Where it ends (default: 30 seconds either side of the timestamp)")
+    @timed_command
+    async def clip(self, interaction: discord.Interaction, vod: str, timestamp: str, end: Optional[str] = None):
+        """Clippers submit timestamps; overlapping ones end up in one editing bounty"""
+        state = self.state_for(interaction.guild_id)
+        vod = vod.strip()[:100]
+        try:
+            if not vod:
+                raise ValueError("missing vod")
+            start, stop = clip_range(timestamp, end)
+        except ValueError as e:
+            await interaction.response.send_message(f"Invalid clip: {e}", ephemeral=True)
+            return
         
-        embed = discord.Embed(title="Bounty List", color=0x0099ff)
+        segment = self.ingest_clips(state, [(vod, start, stop, interaction.user.id)])[0]
+        if segment is None:
+            await interaction.response.send_message(
+                f"{vod} has no room for new clips; add to one of its existing moments instead.", ephemeral=True)
+            return
+        where = f"{format_timestamp(segment.start)}-{format_timestamp(segment.end)}"
+        if segment.bounty_id:
+            message = f"Clip added to editing bounty {segment.bounty_id} ({where})."
+        else:
+            message = f"Clip added to {vod} {where} ({len(segment.clippers)} clipper(s) so far)."
+        await interaction.response.send_message(message, ephemeral=True)
+
+    @app_commands.command(name="import_clips", description="Import clip timestamps from a CSV file (AVF only)")
+    @app_commands.describe(file="Rows of vod,start,end,clipper_id; end may be left empty")
+    @timed_command
+    async def import_clips(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Bulk clip import; every row is checked before any is ingested"""
+        state = self.state_for(interaction.guild_id)
+        if not state.members.is_avf(interaction.user.id):
+            await interaction.response.send_message("Only AVF members can import clips.", ephemeral=True)
+            return
         
-        for status, bounty_list in status_groups.items():
-            value = "\n".join([f"**{b.id}**: {b.title}" for b in bounty_list[:5]])  # Limit to 5 per status
-            if len(bounty_list) > 5:
-                value += f"\n... and {len(bounty_list) - 5} more"
-            embed.add_field(name=f"{status.value.title()} ({len(bounty_list)})", value=value, inline=False)
+        await interaction.response.defer(ephemeral=True)
+        if file.size > MAX_IMPORT_BYTES:
+            await interaction.followup.send(f"{file.filename} is over {MAX_IMPORT_BYTES // 1024} KiB.", ephemeral=True)
+            return
+        clips, errors = parse_clip_file((await file.read()).decode("utf-8-sig", errors="replace"))
+        if len(clips) + len(errors) > MAX_IMPORT_ROWS:
+            await interaction.followup.send(
+                f"{file.filename} has {len(clips) + len(errors)} rows; imports take 1 to {MAX_IMPORT_ROWS}.",
+                ephemeral=True)
+            return
+        if errors:
+            await interaction.followup.send(error_report(errors), ephemeral=True)
+            return
+        if not clips:
+            await interaction.followup.send("No clips found in that file.", ephemeral=True)
+            return
         
-        await interaction.response.send_message(embed=embed)
+        segments = self.ingest_clips(state, clips)
+        vods = {vod for vod, _, _, _ in clips}
+        open_segments = sum(1 for vod in vods for _ in state.clips.timelines[vod].open())
+        full = sorted({clip[0] for clip, segment in zip(clips, segments) if segment is None})
+        skipped = (f" Skipped {segments.count(None)} that would start a segment in a full VOD: "
+                   f"{', '.join(full)}." if full else "")
+        await interaction.followup.send(
+            f"Imported {len(clips) - segments.count(None)} clips from {len(vods)} VOD(s); "
+            f"{open_segments} segment(s) waiting to be posted.{skipped}", ephemeral=True)
+
+    def ingest_clips(self, state: GuildState, clips: List[Clip]) -> List[Optional[Segment]]:
+        """Merge clips into their VODs' segments, store them and push back each VOD's emit deadline
+        
+        A clip that would start a segment in a VOD that is already full gets
+        None and is not stored.
+        """
+        now = self.timers.clock()
+        segments, accepted = [], []
+        for clip in clips:
+            try:
+                segments.append(state.clips.submit(*clip, now))
+                accepted.append(clip + (now,))
+            except ValueError:
+                segments.append(None)
+        if accepted:
+            with state.store.transaction() as tx:
+                tx.add_clips(accepted)
+                for vod in {clip[0] for clip in accepted}:
+                    self._schedule_emit(state, vod)
+        return segments
+
+    def _schedule_emit(self, state: GuildState, vod: str):
+        subject = (state.guild_id, f"{self.CLIP_TIMER_PREFIX}{vod}")
+        due = state.clips.next_due(vod, self.CLIP_SETTLE)
+        if due is None:
+            self.timers.cancel(subject, "emit_clips")
+        else:
+            self.timers.schedule(subject, "emit_clips", max(0.0, due - self.timers.clock()))
+
+    async def _emit_clips(self, state: GuildState, vod: str):
+        """Post one editing bounty per settled segment of a VOD"""
+        for segment in state.clips.settled(vod, self.timers.clock(), self.CLIP_SETTLE):
+            clippers = list(segment.clippers)
+            where = f"{format_timestamp(segment.start)}-{format_timestamp(segment.end)}"
+            credits = ", ".join(f"<@{c}>" for c in clippers[:20]) + (f" and {len(clippers) - 20} more" if len(clippers) > 20 else "")
+            draft = Bounty(
+                id="",
+                creator_id=clippers[0],
+                bounty_type=BountyType.EDITING,
+                status=BountyStatus.DRAFT,
+                title=f"Edit {vod} {where}",
+                description=f"Cut {where} of {vod} into a finished clip.\nClipped by {credits}",
+                reward=self.EDIT_REWARD
+            )
+            with state.store.transaction() as tx:
+                bounty = self._create_bounty(state, draft, BountyStatus.POSTED)
+                tx.put_segment(vod, segment.start, segment.end, bounty.id)
+            state.clips.emitted(segment, bounty.id)
+            await self._post_to_board(state, bounty, None)
+            self.log(state, f"🎬 {len(clippers)} clipper(s) marked {vod} {where}; posted as editing bounty {bounty.id}")
+        with state.store.transaction():
+            self._schedule_emit(state, vod)
 
 # ==================== ADMIN COMMANDS ====================
 
     @app_commands.command(name="adjust_credits", description="Adjust member's time credits (AVF only)")
     @app_commands.describe(user="User to adjust", amount="Amount to add/subtract")
+    @timed_command
     async def adjust_credits(self, interaction: discord.Interaction, user: discord.Member, amount: int):
         """AVF can adjust time credits"""
-        admin = self.get_or_create_member(interaction.user.id)
+        state = self.state_for(interaction.guild_id)
+        admin_id = interaction.user.id
         
-        if not admin.is_avf():
+        if not state.members.is_avf(admin_id):
             await interaction.response.send_message("Only AVF members can adjust credits.", ephemeral=True)
             return
         
-        target = self.get_or_create_member(user.id)
-        target.time_credits_owed += amount
+        target = state.get_or_create_member(user.id)
+        # Owing more is a debit from the member's balance; the interaction ID keeps it from posting twice
+        posting = Posting.transfer(f"adjust:{interaction.id}", member_account(target.discord_id),
+                                   ADJUSTMENTS_ACCOUNT, amount, "credits_adjusted")
+        with state.store.transaction() as tx:
+            state.ledger.settle([posting])
+            tx.log_event("credits_adjusted", member=target.discord_id, amount=amount, by=admin_id)
         
         await interaction.response.send_message(
             f"Adjusted {user.mention}'s time credits by {amount}. "
             f"New balance: {target.time_credits_owed}"
         )
 
+    @app_commands.command(name="record_payment", description="Record a Big Iron payment (AVF only)")
+    @app_commands.describe(amount="Credits received", reference="Invoice or payment reference")
+    @timed_command
+    async def record_payment(self, interaction: discord.Interaction, amount: app_commands.Range[int, 1], reference: str):
+        """Deposit a Big Iron payment: 70% to infrastructure, 30% to reserves"""
+        state = self.state_for(interaction.guild_id)
+        if not state.members.is_avf(interaction.user.id):
+            await interaction.response.send_message("Only AVF members can record payments.", ephemeral=True)
+            return
+        
+        # Retries can outlast the interaction deadline, so acknowledge first
+        await interaction.response.defer(ephemeral=True)
+        posting = Posting.payout(f"big_iron:{reference}", BIG_IRON_ACCOUNT, amount, BIG_IRON_SPLIT, "big_iron_payment")
+        result = await self.settle_payments(state, [posting])
+        
+        if result.flagged:
+            message = f"Recording payment {reference} failed; it has been flagged for review."
+        elif result.skipped:
+            message = f"Payment {reference} was already recorded."
+        else:
+            parts = ", ".join(f"{account} +{credits}" for account, credits in posting.legs[1:])
+            message = f"Recorded payment {reference}: {parts}."
+        await interaction.followup.send(message, ephemeral=True)
+
+    async def settle_payments(self, state: GuildState, postings: List[Posting]):
+        """Settle postings with GregTheory's retry-3x-then-flag rule, reporting flags to the log channel"""
+        result = await state.ledger.settle_with_retry(postings)
+        for posting in result.flagged:
+            self.log(state, f"⚠️ Payment {posting.key} failed 3 times and needs a human")
+        return result
+
+# ==================== BULK IMPORTS ====================
+
+    # What each accepted POST rule action makes of an imported row
+    BULK_STATUSES = {"post_to_board": BountyStatus.POSTED, "post_for_verification": BountyStatus.AWAITING_VERIFICATION}
+
+    @app_commands.command(name="import_bounties", description="Post many bounties from a CSV or JSON file (AVF only)")
+    @app_commands.describe(file="Rows of title, description, type, reward, timeframe_hours")
+    @timed_command
+    async def import_bounties(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Bulk posting for resource drives: every row is checked, then all are created in one transaction"""
+        state = self.state_for(interaction.guild_id)
+        if not state.members.is_avf(interaction.user.id):
+            await interaction.response.send_message("Only AVF members can import bounties.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        rows = await self._read_import(interaction, file)
+        if rows is None:
+            return
+        drafts, errors = parse_bounties(rows, interaction.user.id)
+        if errors:
+            await interaction.followup.send(error_report(errors), ephemeral=True)
+            return
+        
+        # Each row goes through the same posting rules as /post_bounty
+        member = state.members.view(interaction.user.id)
+        accepted = []
+        for n, draft in enumerate(drafts, start=1):
+            matched = self.rules.match(POST, draft, member, interaction)
+            if matched and matched[0].action == "deny_debt":
+                await interaction.followup.send(
+                    f"You owe {member.time_credits_owed} time credits. Clear your debt first!", ephemeral=True)
+                return
+            status = self.BULK_STATUSES.get(matched[0].action) if matched else None
+            if status is None:
+                errors.append(f"row {n}: {draft.bounty_type.value} bounties can't be posted")
+            else:
+                accepted.append((draft, status))
+        channels = {}
+        for kind, status in (("board", BountyStatus.POSTED), ("verification", BountyStatus.AWAITING_VERIFICATION)):
+            if any(s == status for _, s in accepted):
+                channels[kind] = self.get_channel(self.channel_id(state, kind))
+                if channels[kind] is None:
+                    errors.append(f"the {kind} channel is not configured")
+        if errors:
+            await interaction.followup.send(error_report(errors), ephemeral=True)
+            return
+        
+        bounties = self._create_bounties(state, accepted)
+        self.log(state, f"📦 {interaction.user.mention} imported {len(bounties)} bounties "
+                        f"({bounties[0].id} to {bounties[-1].id})")
+        await self._post_in_waves(state, bounties, channels, interaction)
+
+    async def _post_in_waves(self, state: GuildState, bounties: List[Bounty], channels: Dict[str, discord.abc.Messageable],
+                             interaction: discord.Interaction):
+        """Queue board/verification posts a wave at a time, editing the caller's reply as each wave lands
+        
+        Waves keep a big import from filling the outbound queue ahead of
+        everyone else's posts. If a wave stalls (Discord failing), the rest
+        is queued without waiting.
+        """
+        total = len(bounties)
+        summary = f"Created {total} bounties ({bounties[0].id} to {bounties[-1].id})"
+        posted = 0
+        landed = asyncio.Event()
+        target = 0
+        
+        def on_posted():
+            nonlocal posted
+            posted += 1
+            if posted >= target:
+                landed.set()
+        
+        waiting = True
+        for start in range(0, total, self.BULK_POST_WAVE):
+            wave = bounties[start:start + self.BULK_POST_WAVE]
+            target = start + len(wave)
+            landed.clear()
+            for bounty in wave:
+                if bounty.status == BountyStatus.AWAITING_VERIFICATION:
+                    self._send_verification(state, bounty, channels["verification"], on_posted)
+                else:
+                    await self._post_to_board(state, bounty, None, on_posted)
+            if not waiting:
+                continue
+            try:
+                await asyncio.wait_for(landed.wait(), self.BULK_POST_TIMEOUT)
+            except asyncio.TimeoutError:
+                waiting = False
+            if target < total:
+                await interaction.edit_original_response(content=f"{summary}; posted {posted}/{total}...")
+        
+        queued = f", {total - posted} still queued" if posted < total else ""
+        await interaction.edit_original_response(content=f"{summary}; posted {posted}/{total}{queued}.")
+
+    @app_commands.command(name="bulk_adjust_credits", description="Adjust many members' time credits from a CSV or JSON file (AVF only)")
+    @app_commands.describe(file="Rows of user, amount (positive adds to what they owe, like /adjust_credits)")
+    @timed_command
+    async def bulk_adjust_credits(self, interaction: discord.Interaction, file: discord.Attachment):
+        """Every row is checked, then all adjustments settle in one transaction"""
+        state = self.state_for(interaction.guild_id)
+        admin_id = interaction.user.id
+        if not state.members.is_avf(admin_id):
+            await interaction.response.send_message("Only AVF members can adjust credits.", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True)
+        rows = await self._read_import(interaction, file)
+        if rows is None:
+            return
+        adjustments, errors = parse_adjustments(rows)
+        if errors:
+            await interaction.followup.send(error_report(errors), ephemeral=True)
+            return
+        
+        # Keyed by interaction and row, so a retried import never applies twice
+        postings = [Posting.transfer(f"adjust:{interaction.id}:{n}", member_account(discord_id),
+                                     ADJUSTMENTS_ACCOUNT, amount, "credits_adjusted")
+                    for n, (discord_id, amount) in enumerate(adjustments, start=1)]
+        with state.store.transaction() as tx:
+            state.ledger.settle(postings)
+            for discord_id, amount in adjustments:
+                tx.log_event("credits_adjusted", member=discord_id, amount=amount, by=admin_id)
+        
+        members = {discord_id for discord_id, _ in adjustments}
+        net = sum(amount for _, amount in adjustments)
+        await interaction.followup.send(
+            f"Adjusted time credits for {len(members)} member(s) from {len(adjustments)} row(s), net {net:+}.",
+            ephemeral=True)
+
+    async def _read_import(self, interaction: discord.Interaction, file: discord.Attachment) -> Optional[List[Row]]:
+        """Rows of an attached import file, or None after telling the (deferred) caller why not"""
+        if file.size > MAX_IMPORT_BYTES:
+            await interaction.followup.send(f"{file.filename} is over {MAX_IMPORT_BYTES // 1024} KiB.", ephemeral=True)
+            return None
+        try:
+            rows = read_rows(file.filename, await file.read())
+        except ValueError as e:
+            await interaction.followup.send(f"Could not read {file.filename}: {e}", ephemeral=True)
+            return None
+        if not rows or len(rows) > MAX_IMPORT_ROWS:
+            await interaction.followup.send(
+                f"{file.filename} has {len(rows)} rows; imports take 1 to {MAX_IMPORT_ROWS}.", ephemeral=True)
+            return None
+        return rows
+
 # ==================== BOT TOKEN AND STARTUP ====================
 
 # To run this bot:
 # 1. Create a Discord application at https://discord.com/developers/applications
 # 2. Create a bot user and get the token
-# 3. Set the channel IDs above to your actual Discord channels
+# 3. Set the channel IDs below to your home guild's channels; other guilds use /configure
 # 4. Install discord.py: pip install discord.py
 # 5. Run with: python bot.py
+#    State is kept in greg.db (SQLite, WAL mode) next to where you launch it
+#    To spread a large deployment over several processes, give each one a slice
+#    of the shards against the same greg.db, e.g. with 4 shards over 2 processes:
+#        python bot.py --shard-count 4 --shards 0,1
+#        python bot.py --shard-count 4 --shards 2,3
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Greg bounty bot")
+    parser.add_argument("--shard-count", type=int, help="total shards across all processes")
+    parser.add_argument("--shards", help="comma-separated shard IDs this process runs (default: all)")
+    args = parser.parse_args()
+    shard_ids = [int(i) for i in args.shards.split(",")] if args.shards else None
+    
     # IMPORTANT: Replace with your actual bot token
     TOKEN = "YOUR_BOT_TOKEN_HERE"
     
-    bot = BountyBot()
+    bot = BountyBot(store=SQLiteStorage("greg.db"), shard_ids=shard_ids, shard_count=args.shard_count)
+    if shard_ids:
+        bot.METRICS_PORT += min(shard_ids)  # One metrics endpoint per process
     
-    # Set your channel IDs here
+    # Set your home guild and its channel IDs here
+    bot.HOME_GUILD = 123456789  # Replace with actual guild ID
     bot.BOUNTY_BOARD_CHANNEL = 123456789  # Replace with actual channel ID
     bot.VERIFICATION_CHANNEL = 123456789   # Replace with actual channel ID  
     bot.LOG_CHANNEL = 123456789           # Replace with actual channel ID
+    # bot.DEV_GUILD = 123456789  # Uncomment while developing: commands sync to this guild instantly
     
     bot.run(TOKEN)
\ No newline at end of file
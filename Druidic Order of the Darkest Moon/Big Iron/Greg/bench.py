@@ -0,0 +1,206 @@
+"""Offline benchmark suite for BountyBot's hot paths
+
+Drives post_bounty, on_raw_reaction_add (claims), list_bounties (with
+paging), search_bounties, autocomplete, my_bounties, adjust_credits and
+a restart reconciliation of claims missed while offline against the
+fake gateway in
+fake_discord.py, then reports throughput, p50/p99 handler latency and
+memory per scenario. Handler latency is measured from call to return, so
+it covers the bot's own work plus any Discord round trip it waits on
+inline; queued outbound actions are drained separately.
+
+Run with:
+    python bench.py                          # 100k bounties, 10k members
+    python bench.py --bounties 5000 --members 1000 --latency-file recorded.json
+"""
+import argparse
+import asyncio
+import random
+import resource
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from Greg import BountyBot
+from fake_discord import Gateway
+from models import BountyStatus, Role
+
+MATERIALS = ["oak", "spruce", "birch", "cobblestone", "granite", "diorite", "andesite", "iron",
+             "copper", "gold", "quartz", "glass", "brick", "sandstone", "deepslate", "basalt"]
+
+# ==================== MEASUREMENT ====================
+
+class Scenario:
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: List[float] = []
+        self.wall = 0.0
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else 0.0
+
+    def row(self) -> str:
+        calls = len(self.samples)
+        rate = calls / self.wall if self.wall else 0.0
+        return (f"{self.name:<22}{calls:>10,}{self.wall:>10.2f}s{rate:>12,.0f}/s"
+                f"{self.percentile(0.5) * 1e3:>10.3f}ms{self.percentile(0.99) * 1e3:>10.3f}ms")
+
+async def run(scenario: Scenario, calls: List[Callable], concurrency: int):
+    """Run coroutine factories with bounded concurrency, timing each one"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(call):
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            scenario.samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(c) for c in calls))
+    scenario.wall = time.perf_counter() - start
+    return scenario
+
+def memory_mb() -> float:
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0] / 2**20
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+# ==================== SCENARIOS ====================
+
+async def bench(args):
+    rng = random.Random(args.seed)
+    gateway = Gateway.from_recording(args.latency_file, seed=args.seed) if args.latency_file else Gateway(seed=args.seed)
+
+    bot = BountyBot()
+    # Measure the bot, not Discord's rate limits
+    bot.outbound.limits = {kind: (10**9, 1.0) for kind in bot.outbound.limits}
+    gateway.attach(bot)
+    board, verification, log = gateway.channel(), gateway.channel(), gateway.channel()
+    bot.BOUNTY_BOARD_CHANNEL, bot.VERIFICATION_CHANNEL, bot.LOG_CHANNEL = board.id, verification.id, log.id
+    bot.HOME_GUILD = gateway.guild_id  # Every fake event comes from it, so everything lands in partition 0
+    state = bot.state_for(gateway.guild_id)
+
+    avf = list(range(1, args.avf + 1))
+    members = list(range(args.avf + 1, args.avf + args.members + 1))
+    for user_id in avf:
+        state.get_or_create_member(user_id).role = Role.AVF
+    results: List[Scenario] = []
+    memory: Dict[str, float] = {"start": memory_mb()}
+
+    def cmd(name):
+        return getattr(BountyBot, name).callback
+
+    # post_bounty
+    results.append(await run(Scenario("post_bounty"), [
+        (lambda i=i: cmd("post_bounty")(bot, gateway.interaction(rng.choice(avf)),
+                                        f"Deliver {i} {rng.choice(MATERIALS)} blocks",
+                                        f"Bring them to the {rng.choice(MATERIALS)} storage at spawn", "regular"))
+        for i in range(args.bounties)
+    ], args.concurrency))
+    start = time.perf_counter()
+    await bot.outbound.join()
+    drain = time.perf_counter() - start
+    memory["after posting"] = memory_mb()
+
+    # Claims via raw reactions, several contenders per bounty
+    posted = list(state.bounties.values())
+    reactions = [
+        gateway.reaction(board.messages[b.message_id], rng.choice(members), bot.MINE_EMOJI)
+        for b in rng.sample(posted, min(len(posted), args.members))
+        for _ in range(args.contenders)
+    ]
+    results.append(await run(Scenario("on_raw_reaction_add"), [
+        (lambda p=p: bot.on_raw_reaction_add(p)) for p in reactions
+    ], args.concurrency))
+
+    # list_bounties: first page plus a few clicks through older pages
+    async def browse():
+        interaction = gateway.interaction(rng.choice(members))
+        await cmd("list_bounties")(bot, interaction, rng.choice([None, "posted", "claimed"]))
+        view = interaction.response.messages[-1].get("view")
+        for _ in range(args.pages if view else 0):
+            await view.older.callback(gateway.interaction(interaction.user.id))
+    results.append(await run(Scenario("list_bounties"), [browse] * args.queries, args.concurrency))
+
+    results.append(await run(Scenario("search_bounties"), [
+        (lambda: cmd("search_bounties")(bot, gateway.interaction(rng.choice(members)),
+                                        " ".join(rng.sample(MATERIALS, 2)), rng.choice([None, "posted"])))
+        for _ in range(args.queries)
+    ], args.concurrency))
+
+    async def autocomplete():
+        interaction = gateway.interaction(rng.choice(members))
+        await bot._complete_search_terms(interaction, rng.choice(MATERIALS)[:2])
+        await bot._complete_bounty_id(interaction, str(rng.randint(1, 99)))
+    results.append(await run(Scenario("autocomplete"), [autocomplete] * args.queries, args.concurrency))
+
+    results.append(await run(Scenario("my_bounties"), [
+        (lambda: cmd("my_bounties")(bot, gateway.interaction(rng.choice(members))))
+        for _ in range(args.queries)
+    ], args.concurrency))
+
+    results.append(await run(Scenario("adjust_credits"), [
+        (lambda: cmd("adjust_credits")(bot, gateway.interaction(rng.choice(avf)),
+                                       gateway.user(rng.choice(members)), rng.randint(-5, 5)))
+        for _ in range(args.queries)
+    ], args.concurrency))
+
+    # A big stream: every clipper piles onto the same few moments of a handful of VODs
+    moments = [(f"vod{v}", rng.randint(60, 4 * 3600)) for v in range(5) for _ in range(20)]
+    def clip():
+        vod, moment = rng.choice(moments)
+        return cmd("clip")(bot, gateway.interaction(rng.choice(members)), vod, str(moment + rng.randint(-45, 45)))
+    results.append(await run(Scenario("clip"), [clip for _ in range(args.clips)], args.concurrency))
+    segments = sum(len(timeline.segments) for timeline in state.clips.timelines.values())
+
+    # Reactions added while the bot was down: recorded on the messages, never dispatched
+    still_posted = state.bounties.by_status(BountyStatus.POSTED)
+    for b in rng.sample(still_posted, min(len(still_posted), args.offline_claims)):
+        for _ in range(args.contenders):
+            gateway.reaction(board.messages[b.message_id], rng.choice(members), bot.MINE_EMOJI)
+    replayed: List[int] = []
+
+    async def reconcile():
+        replayed.append(await bot.reconcile(state))
+    results.append(await run(Scenario("reconcile"), [reconcile], 1))
+    memory["end"] = memory_mb()
+    bot.outbound.flush_digest()
+    await bot.outbound.join()
+
+    claimed = state.bounties.count(BountyStatus.CLAIMED)
+    print(f"\n{args.bounties:,} bounties, {args.members:,} members ({args.avf} AVF), "
+          f"concurrency {args.concurrency}")
+    print(f"{'scenario':<22}{'calls':>10}{'wall':>11}{'throughput':>14}{'p50':>12}{'p99':>12}")
+    for scenario in results:
+        print(scenario.row())
+    print(f"\noutbound drain after posting: {drain:.2f}s; claimed bounties: {claimed:,} "
+          f"({replayed[0]:,} offline reactions replayed); member records kept: {len(state.members):,}; "
+          f"{args.clips:,} clips merged into {segments:,} segments")
+    print("REST calls: " + ", ".join(f"{op}={n:,}" for op, n in sorted(gateway.calls.items())))
+    label = "traced heap" if tracemalloc.is_tracing() else "max RSS"
+    print(f"memory ({label}): " + ", ".join(f"{k} {v:,.1f} MiB" for k, v in memory.items()))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bounties", type=int, default=100_000)
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--avf", type=int, default=50)
+    parser.add_argument("--contenders", type=int, default=3, help="reactions per claimed bounty")
+    parser.add_argument("--offline-claims", type=int, default=500, help="bounties claimed while the bot is down")
+    parser.add_argument("--clips", type=int, default=5_000, help="/clip submissions")
+    parser.add_argument("--queries", type=int, default=2_000, help="calls per read/admin command")
+    parser.add_argument("--pages", type=int, default=3, help="older-page clicks per list_bounties")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency-file", help="JSON of per-operation latencies (seconds or sample lists)")
+    parser.add_argument("--trace-memory", action="store_true", help="use tracemalloc (slower, exact heap)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.trace_memory:
+        tracemalloc.start()
+    asyncio.run(bench(args))
+
+if __name__ == "__main__":
+    main()
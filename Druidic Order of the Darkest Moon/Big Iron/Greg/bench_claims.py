@@ -0,0 +1,89 @@
+"""Reaction-storm stress benchmark for the claim engine
+
+Fires thousands of concurrent ⛏️ reactions at a board of bounties through
+the real on_raw_reaction_add path and checks that every claimed bounty has
+exactly one claimer and no member holds more than one bounty. The fake
+gateway yields to the event loop on every API call so coroutines interleave
+the way they do under real network latency.
+
+Run with: python bench_claims.py [bounties] [reactions_per_bounty]
+"""
+import asyncio
+import random
+import sys
+import time
+
+import discord
+
+from Greg import BountyBot
+from fake_discord import Gateway
+from models import BountyStatus, BountyType, Bounty
+
+async def storm(n_bounties: int, reactions_per_bounty: int, seed: int = 0):
+    rng = random.Random(seed)
+    bot = BountyBot()
+    gateway = Gateway(seed=seed)
+    gateway.attach(bot)
+    board = gateway.channel()
+    bot.BOUNTY_BOARD_CHANNEL = bot.LOG_CHANNEL = board.id
+    bot.HOME_GUILD = gateway.guild_id
+    state = bot.state_for(gateway.guild_id)
+
+    messages = []
+    for i in range(1, n_bounties + 1):
+        message = await board.send(embed=discord.Embed(title=f"Bounty {i}")
+                                   .add_field(name="Bounty ID", value="-")
+                                   .add_field(name="Type", value="-")
+                                   .add_field(name="Status", value="-"))
+        bounty = Bounty(f"bounty_{i}", 0, BountyType.REGULAR, BountyStatus.POSTED, f"Bounty {i}", "",
+                        message_id=message.id)
+        state.bounties.add(bounty)
+        messages.append(message)
+    state.bounty_counter = n_bounties
+
+    # A shared pool of users smaller than the number of reactions, so the same
+    # user hammers several bounties at once and can_claim_bounty is contested too
+    users = list(range(1, max(2, n_bounties * reactions_per_bounty // 4)))
+    payloads = [
+        gateway.reaction(message, rng.choice(users), bot.MINE_EMOJI)
+        for message in messages
+        for _ in range(reactions_per_bounty)
+    ]
+    rng.shuffle(payloads)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.on_raw_reaction_add(p) for p in payloads))
+    elapsed = time.perf_counter() - start
+    queued = bot.outbound.depth()
+
+    reactors = {}
+    for p in payloads:
+        reactors.setdefault(p.message_id, set()).add(p.user_id)
+
+    holders = {}
+    unclaimed = 0
+    for bounty in state.bounties.values():
+        if bounty.status != BountyStatus.CLAIMED:
+            # Legitimate only if everyone who reacted already won something else
+            assert bounty.assigned_to is None
+            assert all(state.members[u].assigned_bounties for u in reactors[bounty.message_id]), (
+                f"{bounty.id} left unclaimed with eligible reactors"
+            )
+            unclaimed += 1
+            continue
+        assert bounty.assigned_to not in holders, (
+            f"member {bounty.assigned_to} won both {holders[bounty.assigned_to]} and {bounty.id}"
+        )
+        holders[bounty.assigned_to] = bounty.id
+        assert state.members[bounty.assigned_to].assigned_bounties == {bounty.id}
+    assert sum(len(m.assigned_bounties) for m in state.members.values()) == len(holders)
+
+    print(f"{len(payloads)} reactions over {n_bounties} bounties in {elapsed:.3f}s "
+          f"({len(payloads) / elapsed:,.0f} reactions/s) - exactly one winner per claimed bounty, "
+          f"{unclaimed} left unclaimed because every reactor already held one; "
+          f"{queued} Discord actions left queued for the rate-limited workers")
+
+if __name__ == "__main__":
+    n_bounties = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    reactions = int(sys.argv[2]) if len(sys.argv) > 2 else 25
+    asyncio.run(storm(n_bounties, reactions))
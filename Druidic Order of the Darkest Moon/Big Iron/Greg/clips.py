@@ -0,0 +1,193 @@
+import csv
+import io
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import Bounty
+from ledger import Posting, REWARDS_ACCOUNT, member_account
+
+# ==================== CLIP TIMESTAMPS ====================
+
+CLIP_WINDOW = 30  # A lone timestamp clips this many seconds either side of it
+MAX_CLIP_LENGTH = 15 * 60  # Longer ranges are a highlight reel, not a clip
+CLIP_REWARD = 2  # Credits each of a segment's clippers earns when its edit is verified
+MAX_SEGMENTS_PER_VOD = 500  # Open and emitted; a clip that would start one more is turned away
+
+Clip = Tuple[str, int, int, int]  # (vod, start, end, clipper_id)
+
+def parse_timestamp(text: str) -> int:
+    """Seconds into the VOD from "HH:MM:SS", "MM:SS" or plain seconds"""
+    parts = text.strip().split(":")
+    if not 1 <= len(parts) <= 3 or not all(part.isdigit() for part in parts):
+        raise ValueError(f"{text!r} is not a timestamp like 1:02:03, 62:03 or 3723")
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+def format_timestamp(seconds: int) -> str:
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+
+def clip_range(timestamp: str, end: Optional[str] = None) -> Tuple[int, int]:
+    """The (start, end) a submission covers; a lone timestamp gets CLIP_WINDOW either side"""
+    start = parse_timestamp(timestamp)
+    if not end:
+        return max(0, start - CLIP_WINDOW), start + CLIP_WINDOW
+    stop = parse_timestamp(end)
+    if stop <= start:
+        raise ValueError(f"clip ends ({end}) before it starts ({timestamp})")
+    if stop - start > MAX_CLIP_LENGTH:
+        raise ValueError(f"clip is longer than {MAX_CLIP_LENGTH // 60} minutes")
+    return start, stop
+
+def parse_clip_file(text: str) -> Tuple[List[Clip], List[str]]:
+    """Rows of "vod,start[,end],clipper_id" from an import file, and one error per bad row
+
+    A header row (starting with "vod") and blank lines are skipped.
+    """
+    clips, errors = [], []
+    for line, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        row = [cell.strip() for cell in row]
+        if not any(row) or (line == 1 and row[0].lower() == "vod"):
+            continue
+        try:
+            if len(row) == 3:
+                vod, start, clipper = row
+                end = ""
+            elif len(row) == 4:
+                vod, start, end, clipper = row
+            else:
+                raise ValueError("expected vod,start,end,clipper_id")
+            if not vod:
+                raise ValueError("missing vod")
+            if not clipper.isdigit():
+                raise ValueError(f"clipper_id {clipper!r} is not a Discord user ID")
+            clips.append((vod[:100],) + clip_range(start, end) + (int(clipper),))
+        except ValueError as e:
+            errors.append(f"line {line}: {e}")
+    return clips, errors
+
+# ==================== MERGED SEGMENTS ====================
+
+@dataclass(slots=True)
+class Segment:
+    """A stretch of one VOD covered by overlapping clips, and everyone who clipped it"""
+    vod: str
+    start: int
+    end: int
+    clippers: Dict[int, None] = field(default_factory=dict)  # Ordered set, first clipper first
+    updated: float = 0.0  # When a clip last grew or joined it
+    bounty_id: Optional[str] = None  # Set once it became an editing bounty; its range is then fixed
+
+class Timeline:
+    """One VOD's segments: sorted by start and pairwise disjoint
+
+    Disjoint sorted ranges have sorted ends too, so the segments a clip
+    overlaps are one contiguous run found by bisecting the starts - the
+    same answer an interval tree gives, in a flat list. A clip merges
+    every open segment it overlaps (or touches) into one; overlapping a
+    segment that already became a bounty credits the clipper there instead.
+    """
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.segments: List[Segment] = []
+
+    def overlapping(self, start: int, end: int) -> Tuple[int, int]:
+        """Slice bounds of the segments that overlap or touch [start, end]"""
+        hi = bisect_right(self.starts, end)
+        lo = hi
+        while lo > 0 and self.segments[lo - 1].end >= start:
+            lo -= 1
+        return lo, hi
+
+    def place(self, segment: Segment):
+        """Insert a segment known not to overlap any other"""
+        i = bisect_right(self.starts, segment.start)
+        self.starts.insert(i, segment.start)
+        self.segments.insert(i, segment)
+
+    def add(self, vod: str, start: int, end: int, clipper: int, now: float,
+            limit: Optional[int] = None) -> Segment:
+        """Merge a clip in; raises ValueError if it would start a segment past `limit`"""
+        lo, hi = self.overlapping(start, end)
+        hits = self.segments[lo:hi]
+        if not hits and limit is not None and len(self.segments) >= limit:
+            raise ValueError(f"{vod} already has {limit} clip segments")
+        emitted = [s for s in hits if s.bounty_id is not None]
+        if emitted:
+            target = max(emitted, key=lambda s: min(end, s.end) - max(start, s.start))
+            target.clippers.setdefault(clipper)
+            return target
+
+        merged = Segment(vod, min([start] + [s.start for s in hits]), max([end] + [s.end for s in hits]))
+        for segment in hits:
+            merged.clippers.update(segment.clippers)
+        merged.clippers.setdefault(clipper)
+        merged.updated = now
+        self.starts[lo:hi] = [merged.start]
+        self.segments[lo:hi] = [merged]
+        return merged
+
+    def open(self) -> Iterable[Segment]:
+        return (s for s in self.segments if s.bounty_id is None)
+
+# ==================== INGESTION ====================
+
+class ClipIngest:
+    """A partition's clip submissions merged into segments, per VOD
+
+    Segments stay open while clips keep arriving; once one has been quiet
+    for the settle window it becomes a single editing bounty, however many
+    clips went into it. Rebuilt on load by placing the emitted segments and
+    replaying the stored clips over them.
+    """
+
+    def __init__(self, segments: Iterable[Tuple[str, int, int, str]] = (),
+                 clips: Iterable[Tuple[str, int, int, int, float]] = ()):
+        self.timelines: Dict[str, Timeline] = {}
+        self.by_bounty: Dict[str, Segment] = {}
+        for vod, start, end, bounty_id in segments:
+            segment = Segment(vod, start, end, bounty_id=bounty_id)
+            self.timeline(vod).place(segment)
+            self.by_bounty[bounty_id] = segment
+        for vod, start, end, clipper, ts in clips:
+            self.timeline(vod).add(vod, start, end, clipper, ts)  # Stored clips were let in once already
+
+    def timeline(self, vod: str) -> Timeline:
+        timeline = self.timelines.get(vod)
+        if timeline is None:
+            timeline = self.timelines[vod] = Timeline()
+        return timeline
+
+    def submit(self, vod: str, start: int, end: int, clipper: int, now: float) -> Segment:
+        """Merge one clip in; returns the segment it landed in
+        
+        Raises ValueError if the VOD already holds MAX_SEGMENTS_PER_VOD
+        segments and the clip overlaps none of them.
+        """
+        return self.timeline(vod).add(vod, start, end, clipper, now, limit=MAX_SEGMENTS_PER_VOD)
+
+    def next_due(self, vod: str, settle: float) -> Optional[float]:
+        """When the VOD's quietest open segment settles, or None if nothing is open"""
+        timeline = self.timelines.get(vod)
+        updated = [s.updated for s in timeline.open()] if timeline else []
+        return min(updated) + settle if updated else None
+
+    def settled(self, vod: str, now: float, settle: float) -> List[Segment]:
+        timeline = self.timelines.get(vod)
+        return [s for s in timeline.open() if s.updated + settle <= now] if timeline else []
+
+    def emitted(self, segment: Segment, bounty_id: str):
+        segment.bounty_id = bounty_id
+        self.by_bounty[bounty_id] = segment
+
+    def payouts(self, bounty: Bounty) -> List[Posting]:
+        """Engine payout hook: an approved editing bounty pays its segment's clippers too"""
+        segment = self.by_bounty.get(bounty.id)
+        if segment is None or not segment.clippers or not CLIP_REWARD:
+            return []
+        return [Posting.payout(f"clips:{bounty.id}", REWARDS_ACCOUNT, CLIP_REWARD * len(segment.clippers),
+                               {member_account(clipper): 1 for clipper in segment.clippers}, "clips_used")]
@@ -0,0 +1,215 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, List, Sequence
+
+from models import MAX_REWARD, BountyStatus, Member, Bounty
+from registry import BountyRegistry
+from storage import Storage
+from ledger import Ledger, Posting, REWARDS_ACCOUNT, member_account
+
+# ==================== TRANSITION RESULTS ====================
+
+@dataclass
+class Outcome:
+    """Result of a state transition attempt"""
+    ok: bool
+    reason: str = ""
+
+OK = Outcome(True)
+NOT_CLAIMABLE = Outcome(False, "bounty is not available")
+HAS_DEBT = Outcome(False, "you have outstanding time credits")
+HAS_ASSIGNMENT = Outcome(False, "you already have an assigned bounty")
+NOT_AVF = Outcome(False, "only AVF members can verify")
+NOT_ASSIGNEE = Outcome(False, "you are not assigned to this bounty")
+WRONG_STATUS = Outcome(False, "bounty is not in a state that allows this")
+
+KEEP = object()  # Sentinel: leave this bounty field unchanged
+
+# ==================== BOUNTY ENGINE ====================
+
+class BountyEngine:
+    """Commits claim/verify state transitions atomically
+
+    Every method is synchronous: the eligibility check, the in-memory
+    mutation and the storage transaction all happen without yielding to
+    the event loop, so two coroutines reacting to the same bounty can never
+    interleave between check and commit. Each transition is a
+    compare-and-set on the bounty's current status; whoever commits first
+    wins and the rest get a failed Outcome. Callers perform Discord side
+    effects (embed edits, DMs, logs) only after an OK outcome.
+    """
+
+    def __init__(self, bounties: BountyRegistry, store: Storage,
+                 get_member: Callable[[int], Member], ledger: Ledger):
+        self.bounties = bounties
+        self.store = store
+        self.get_member = get_member
+        self.ledger = ledger
+        # Extra postings for an approved completion, e.g. the clippers behind an editing bounty
+        self.payouts: List[Callable[[Bounty], List[Posting]]] = []
+
+    def _commit(self, bounty: Bounty, expected: BountyStatus, new_status: BountyStatus,
+                event: str, members: Iterable[Member] = (), assign: Any = KEEP,
+                verifier_id: Any = KEEP, reward: Any = KEEP, postings: Sequence[Posting] = (),
+                new_stage: bool = False, **details) -> Outcome:
+        """Compare-and-set the bounty status and persist, undoing on storage failure
+
+        `assign`/`verifier_id`/`reward` are applied together with the status
+        change unless left as KEEP, and `postings` settle in the ledger in
+        the same transaction. Status listeners (timers) run inside it too.
+        `new_stage` detaches the verification message of the stage being
+        left, so verdicts on it no longer count.
+        """
+        if bounty.status != expected:
+            return WRONG_STATUS
+
+        saved = (bounty.assigned_to, bounty.verifier_id, bounty.reward,
+                 bounty.verification_message_id, bounty.verification_stage)
+        settlement = None
+        try:
+            with self.store.transaction() as tx:
+                if assign is not KEEP:
+                    self.bounties.assign(bounty, assign)
+                if verifier_id is not KEEP:
+                    bounty.verifier_id = verifier_id
+                if reward is not KEEP:
+                    bounty.reward = reward
+                if new_stage:
+                    bounty.verification_message_id = bounty.verification_stage = None
+                self.bounties.set_status(bounty, new_status)
+                tx.put_bounty(bounty)
+                for member in members:
+                    tx.put_member(member)
+                tx.log_event(event, bounty=bounty.id, **details)
+                if postings:
+                    settlement = self.ledger.settle(postings)
+        except Exception:
+            if settlement:
+                self.ledger.revert(settlement)
+            self.bounties.set_status(bounty, expected)
+            self.bounties.assign(bounty, saved[0])
+            bounty.verifier_id, bounty.reward, bounty.verification_message_id, bounty.verification_stage = saved[1:]
+            raise
+        return OK
+
+    def claim(self, bounty: Bounty, member: Member) -> Outcome:
+        """POSTED -> CLAIMED, assigning the bounty to `member`"""
+        if not bounty.can_be_claimed():
+            return NOT_CLAIMABLE
+        if member.time_credits_owed > 0:
+            return HAS_DEBT
+        if not member.can_claim_bounty():
+            return HAS_ASSIGNMENT
+
+        # Checks above may have read a transient view; the change goes to the kept record
+        member = self.get_member(member.discord_id)
+        member.assign(bounty.id)
+        try:
+            return self._commit(bounty, BountyStatus.POSTED, BountyStatus.CLAIMED, "bounty_claimed",
+                                members=[member], assign=member.discord_id, member=member.discord_id)
+        except Exception:
+            member.unassign(bounty.id)
+            raise
+
+    def request_completion(self, bounty: Bounty, member: Member) -> Outcome:
+        """CLAIMED -> AWAITING_POST_VERIFICATION, only by the assignee"""
+        if bounty.assigned_to != member.discord_id:
+            return NOT_ASSIGNEE
+        # The pre-verification message stops counting before its completion successor is even sent
+        return self._commit(bounty, BountyStatus.CLAIMED, BountyStatus.AWAITING_POST_VERIFICATION,
+                            "completion_requested", new_stage=True, member=member.discord_id)
+
+    def review(self, bounty: Bounty, verifier: Member, approved: bool) -> Outcome:
+        """AWAITING_VERIFICATION -> POSTED/REJECTED (pre-verification of community bounties)"""
+        if not verifier.is_avf():
+            return NOT_AVF
+        return self._commit(
+            bounty, BountyStatus.AWAITING_VERIFICATION,
+            BountyStatus.POSTED if approved else BountyStatus.REJECTED,
+            "bounty_approved" if approved else "bounty_rejected",
+            verifier_id=verifier.discord_id, verifier=verifier.discord_id,
+        )
+
+    def review_completion(self, bounty: Bounty, verifier: Member, approved: bool) -> Outcome:
+        """AWAITING_POST_VERIFICATION -> VERIFIED/REJECTED, freeing the claimer either way"""
+        if not verifier.is_avf():
+            return NOT_AVF
+        return self._settle_completion(
+            bounty, approved, "bounty_completed" if approved else "completion_rejected",
+            verifier_id=verifier.discord_id, verifier=verifier.discord_id,
+        )
+
+    def _settle_completion(self, bounty: Bounty, approved: bool, event: str, **details) -> Outcome:
+        if bounty.status != BountyStatus.AWAITING_POST_VERIFICATION:
+            return WRONG_STATUS
+
+        assignee = self.get_member(bounty.assigned_to) if bounty.assigned_to is not None else None
+        postings = []
+        if approved and assignee and bounty.reward:
+            # Keyed by bounty so a completion can never be paid twice
+            postings.append(Posting.transfer(f"reward:{bounty.id}", REWARDS_ACCOUNT,
+                                             member_account(assignee.discord_id), bounty.reward, "bounty_reward"))
+        if approved:
+            for payout in self.payouts:
+                postings.extend(payout(bounty))
+        if assignee:
+            assignee.unassign(bounty.id)
+        try:
+            return self._commit(
+                bounty, BountyStatus.AWAITING_POST_VERIFICATION,
+                BountyStatus.VERIFIED if approved else BountyStatus.REJECTED, event,
+                members=[assignee] if assignee else [], postings=postings, **details,
+            )
+        except Exception:
+            if assignee:
+                assignee.assign(bounty.id)
+            raise
+
+    # ---- timed transitions ----
+
+    def auto_approve(self, bounty: Bounty, tip_ratio: float = 0.8) -> Outcome:
+        """Approve a verification nobody picked up, recording the verifier tip it forfeits"""
+        tip = int(bounty.reward * tip_ratio)
+        if bounty.status == BountyStatus.AWAITING_VERIFICATION:
+            return self._commit(bounty, BountyStatus.AWAITING_VERIFICATION, BountyStatus.POSTED,
+                                "bounty_auto_approved", verifier_id=None, tip=tip)
+        # verifier_id=None marks the completion as auto-approved, not by whoever pre-verified
+        return self._settle_completion(bounty, True, "bounty_auto_completed", verifier_id=None, tip=tip)
+
+    def release_claim(self, bounty: Bounty, raise_ratio: float = 0.1) -> Outcome:
+        """CLAIMED -> POSTED after the claimer ran out of time, with a bigger reward"""
+        if bounty.status != BountyStatus.CLAIMED:
+            return WRONG_STATUS
+
+        claimer = self.get_member(bounty.assigned_to) if bounty.assigned_to is not None else None
+        if claimer:
+            claimer.unassign(bounty.id)
+        try:
+            return self._commit(
+                bounty, BountyStatus.CLAIMED, BountyStatus.POSTED, "claim_expired",
+                members=[claimer] if claimer else [], assign=None,
+                reward=raised(bounty.reward, raise_ratio), member=bounty.assigned_to,
+            )
+        except Exception:
+            if claimer:
+                claimer.assign(bounty.id)
+            raise
+
+    def escalate(self, bounty: Bounty, raise_ratio: float = 0.1) -> Outcome:
+        """Raise the reward of a bounty still sitting unclaimed on the board"""
+        if bounty.status != BountyStatus.POSTED:
+            return WRONG_STATUS
+        old = bounty.reward
+        bounty.reward = raised(old, raise_ratio)
+        try:
+            with self.store.transaction() as tx:
+                tx.put_bounty(bounty)
+                tx.log_event("reward_escalated", bounty=bounty.id, old=old, new=bounty.reward)
+        except Exception:
+            bounty.reward = old
+            raise
+        return OK
+
+def raised(reward: int, ratio: float) -> int:
+    """Reward increased by `ratio`, rounded up so small rewards still grow, up to MAX_REWARD"""
+    return max(reward, min(MAX_REWARD, reward + math.ceil(reward * ratio)))
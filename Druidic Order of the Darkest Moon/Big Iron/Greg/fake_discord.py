@@ -0,0 +1,259 @@
+"""Offline stand-in for the slice of discord.py that BountyBot touches
+
+Provides fake Users, Channels, Messages, Interactions and raw reaction
+payloads that behave enough like the real thing for the bot's handlers to
+run end to end without a gateway connection. Every simulated REST call
+sleeps for a configurable latency, either fixed per operation or drawn from
+recorded samples, so benchmarks see realistic interleaving. Embeds are real
+discord.Embed objects since those are plain data.
+"""
+import asyncio
+import itertools
+import json
+import random
+from typing import Dict, List, Optional, Union
+
+import discord
+
+Latency = Union[float, List[float]]
+
+class Gateway:
+    """Owns fake channels/users and the latency profile they share"""
+
+    def __init__(self, latency: Optional[Dict[str, Latency]] = None, seed: int = 0, guild_id: int = 1 << 22):
+        self.latency: Dict[str, Latency] = latency or {}
+        self.guild_id = guild_id  # Events that don't name a guild come from this one; the bot ignores DMs
+        self.rng = random.Random(seed)
+        self.ids = itertools.count(1_000_000)
+        self.channels: Dict[int, "FakeChannel"] = {}
+        self.users: Dict[int, "FakeUser"] = {}
+        self.calls: Dict[str, int] = {}
+
+    @classmethod
+    def from_recording(cls, path: str, **kwargs) -> "Gateway":
+        """Load {"send": [0.08, 0.11, ...], "edit": 0.05, ...} latencies from a JSON file"""
+        with open(path) as f:
+            return cls(latency=json.load(f), **kwargs)
+
+    async def rest(self, op: str):
+        """Simulate one REST round trip for `op`"""
+        self.calls[op] = self.calls.get(op, 0) + 1
+        delay = self.latency.get(op, 0.0)
+        if isinstance(delay, list):
+            delay = self.rng.choice(delay) if delay else 0.0
+        await asyncio.sleep(delay)
+
+    def channel(self, channel_id: Optional[int] = None) -> "FakeChannel":
+        channel_id = channel_id or next(self.ids)
+        if channel_id not in self.channels:
+            self.channels[channel_id] = FakeChannel(self, channel_id)
+        return self.channels[channel_id]
+
+    def user(self, user_id: int, bot: bool = False) -> "FakeUser":
+        if user_id not in self.users:
+            self.users[user_id] = FakeUser(self, user_id, bot)
+        return self.users[user_id]
+
+    def attach(self, bot):
+        """Point a BountyBot at this gateway instead of a real connection"""
+        bot.get_channel = self.channels.get
+        bot.get_user = self.users.get
+        bot.outbound.get_channel = self.channels.get
+
+    def reaction(self, message: "FakeMessage", user_id: int, emoji: str,
+                 guild_id: Optional[int] = None) -> "FakeRawReaction":
+        """Add `user_id`'s reaction to the message and return the event the bot would receive
+        
+        Not dispatching the event simulates a reaction added while the bot was offline.
+        """
+        users = message.reactors.setdefault(emoji, [])
+        if user_id not in users:
+            users.append(user_id)
+        return FakeRawReaction(message.id, message.channel.id, user_id, emoji, guild_id or self.guild_id)
+
+    def unreact(self, message: "FakeMessage", user_id: int, emoji: str,
+                guild_id: Optional[int] = None) -> "FakeRawReaction":
+        """Remove `user_id`'s reaction from the message and return the removal event"""
+        users = message.reactors.get(emoji, [])
+        if user_id in users:
+            users.remove(user_id)
+        return FakeRawReaction(message.id, message.channel.id, user_id, emoji, guild_id or self.guild_id)
+
+    def interaction(self, user_id: int, channel: Optional["FakeChannel"] = None,
+                    guild_id: Optional[int] = None) -> "FakeInteraction":
+        return FakeInteraction(self, self.user(user_id), channel, guild_id or self.guild_id)
+
+class FakeUser:
+    def __init__(self, gateway: Gateway, user_id: int, bot: bool = False):
+        self.gateway = gateway
+        self.id = user_id
+        self.bot = bot
+        self.dms: List[str] = []
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def send(self, content: str = None, **kwargs):
+        await self.gateway.rest("dm")
+        self.dms.append(content)
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", message_id: int, content: Optional[str] = None,
+                 embeds: Optional[List[discord.Embed]] = None, view=None):
+        self.channel = channel
+        self.id = message_id
+        self.content = content
+        self.embeds = embeds or []
+        self.view = view
+        self.reactors: Dict[str, List[int]] = {}  # emoji -> user IDs; 0 is the bot itself
+
+    @property
+    def reactions(self) -> List["FakeReaction"]:
+        return [FakeReaction(self, emoji, users) for emoji, users in self.reactors.items() if users]
+
+    async def edit(self, content: Optional[str] = None, embed: Optional[discord.Embed] = None, view=None, **kwargs):
+        await self.channel.gateway.rest("edit")
+        if content is not None:
+            self.content = content
+        if embed is not None:
+            self.embeds = [embed]
+        if view is not None:
+            self.view = view
+
+    async def add_reaction(self, emoji):
+        await self.channel.gateway.rest("add_reaction")
+        users = self.reactors.setdefault(str(emoji), [])
+        if 0 not in users:
+            users.append(0)
+
+    async def remove_reaction(self, emoji, user):
+        await self.channel.gateway.rest("remove_reaction")
+        users = self.reactors.get(str(emoji), [])
+        if user.id in users:
+            users.remove(user.id)
+
+class FakeReaction:
+    """Stand-in for discord.Reaction as found on a fetched message"""
+
+    def __init__(self, message: FakeMessage, emoji: str, users: List[int]):
+        self.message = message
+        self.emoji = emoji
+        self.count = len(users)
+        self.me = 0 in users
+        self._users = sorted(users)
+
+    async def users(self):
+        gateway = self.message.channel.gateway
+        for start in range(0, len(self._users), 100):
+            await gateway.rest("reaction_users")
+            for user_id in self._users[start:start + 100]:
+                yield gateway.user(user_id, bot=user_id == 0)
+
+class FakeChannel:
+    def __init__(self, gateway: Gateway, channel_id: int):
+        self.gateway = gateway
+        self.id = channel_id
+        self.messages: Dict[int, FakeMessage] = {}
+
+    async def send(self, content: Optional[str] = None, embed: Optional[discord.Embed] = None, view=None, **kwargs):
+        await self.gateway.rest("send")
+        message = FakeMessage(self, next(self.gateway.ids), content, [embed] if embed else None, view)
+        self.messages[message.id] = message
+        return message
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        """No REST call, like discord.py's PartialMessage"""
+        return self.messages.get(message_id) or FakeMessage(self, message_id)
+
+    async def history(self, limit: Optional[int] = 100, after=None, oldest_first: Optional[bool] = None):
+        """Pages of 100 messages, one REST call each"""
+        ids = sorted(self.messages, reverse=not (oldest_first or (oldest_first is None and after)))
+        if after is not None:
+            ids = [message_id for message_id in ids if message_id > after.id]
+        if limit is not None:
+            ids = ids[:limit]
+        for start in range(0, len(ids), 100):
+            await self.gateway.rest("history")
+            for message_id in ids[start:start + 100]:
+                yield self.messages[message_id]
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.gateway.rest("fetch_message")
+        try:
+            return self.messages[message_id]
+        except KeyError:
+            raise discord.NotFound(_FakeResponse(404), "Unknown Message") from None
+
+class _FakeResponse:
+    """Just enough of aiohttp.ClientResponse for discord.HTTPException"""
+
+    def __init__(self, status: int):
+        self.status = status
+        self.reason = "Fake"
+
+class FakeRawReaction:
+    """Stand-in for discord.RawReactionActionEvent"""
+
+    def __init__(self, message_id: int, channel_id: int, user_id: int, emoji: str,
+                 guild_id: Optional[int] = None):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.member = None
+        self.emoji = discord.PartialEmoji(name=emoji)
+
+class FakeResponse:
+    """Stand-in for discord.InteractionResponse"""
+
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.messages: List[dict] = []
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def send_message(self, content: Optional[str] = None, **kwargs):
+        await self.interaction.gateway.rest("interaction_response")
+        if self._done:
+            raise discord.InteractionResponded(self.interaction)
+        self._done = True
+        self.messages.append(dict(kwargs, content=content))
+
+    async def edit_message(self, **kwargs):
+        await self.interaction.gateway.rest("interaction_response")
+        self._done = True
+        self.messages.append(kwargs)
+
+    async def defer(self, **kwargs):
+        await self.interaction.gateway.rest("interaction_response")
+        self._done = True
+
+class FakeFollowup:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.messages: List[dict] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs):
+        await self.interaction.gateway.rest("followup")
+        self.messages.append(dict(kwargs, content=content))
+
+class FakeInteraction:
+    """Stand-in for discord.Interaction as seen by slash-command callbacks"""
+
+    def __init__(self, gateway: Gateway, user: FakeUser, channel: Optional[FakeChannel] = None,
+                 guild_id: Optional[int] = None):
+        self.gateway = gateway
+        self.id = next(gateway.ids)
+        self.user = user
+        self.channel = channel
+        self.guild_id = guild_id
+        self.permissions = discord.Permissions.none()
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+    async def edit_original_response(self, **kwargs):
+        await self.gateway.rest("interaction_response")
+        self.response.messages.append(kwargs)
@@ -0,0 +1,59 @@
+from typing import Dict, List, Optional
+
+from models import Member
+from registry import BountyRegistry, MemberRegistry, bounty_key
+from engine import BountyEngine
+from clips import ClipIngest
+from quorum import VerificationVotes
+from ledger import Ledger
+from storage import Storage
+
+# ==================== GUILD PARTITIONS ====================
+
+CHANNEL_KINDS = ("board", "verification", "log")
+
+class GuildState:
+    """One guild's slice of the bot: members, bounties, counter, channels, clips, votes, ledger and engine
+
+    Handlers resolve the partition from the event's guild and touch nothing
+    else, so guilds never share indexes or counters and each one can live
+    in whichever shard process Discord routes it to. Bounty IDs are only
+    unique within a partition.
+    """
+
+    def __init__(self, guild_id: int, store: Storage):
+        self.guild_id = guild_id
+        self.store = store
+        members, bounties, self.bounty_counter = store.load()
+        self.members = MemberRegistry(members.values())
+        self.bounties = BountyRegistry(sorted(bounties.values(), key=lambda b: bounty_key(b.id)))
+        self.ledger = Ledger(store, self.get_or_create_member)
+        self.engine = BountyEngine(self.bounties, store, self.get_or_create_member, self.ledger)
+        self.clips = ClipIngest(store.load_segments(), store.load_clips())
+        self.engine.payouts.append(self.clips.payouts)
+        self.votes = VerificationVotes()
+        self.bounties.status_listeners.append(self.votes.on_status)
+        # kind -> channel id, set with /configure
+        self.channels: Dict[str, int] = store.get_meta("channels", {})
+
+    def attach(self, store: Storage):
+        """Write through `store` from now on, after loading from a read-only `Storage.reader()`"""
+        self.store = self.ledger.store = self.engine.store = store
+
+    def get_or_create_member(self, discord_id: int) -> Member:
+        """Get member or create new one with default role"""
+        return self.members.get_or_create(discord_id)
+
+    def next_bounty_ids(self, count: int) -> List[str]:
+        """Reserve `count` consecutive IDs with one counter bump"""
+        first = self.bounty_counter + 1
+        self.bounty_counter += count
+        return [f"bounty_{n}" for n in range(first, self.bounty_counter + 1)]
+
+    def set_channel(self, kind: str, channel_id: Optional[int]):
+        """Point `kind` at a channel (None clears it); call inside a store transaction"""
+        if channel_id is None:
+            self.channels.pop(kind, None)
+        else:
+            self.channels[kind] = channel_id
+        self.store.set_meta("channels", self.channels)
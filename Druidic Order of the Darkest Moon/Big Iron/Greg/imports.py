@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+from models import MAX_REWARD, BountyStatus, BountyType, Bounty
+
+# ==================== IMPORT FILES ====================
+
+MAX_IMPORT_BYTES = 1024 * 1024
+MAX_IMPORT_ROWS = 500
+MAX_SHOWN_VALUE = 40  # Characters of a bad cell echoed back in its error
+MAX_REPORT_LENGTH = 1900  # An error report fits in one Discord message (2000)
+
+Row = Dict[str, str]
+
+def read_rows(filename: str, data: bytes) -> List[Row]:
+    """Rows of an uploaded file: a JSON list of objects, or CSV with a header row
+
+    Keys are lower-cased and values stripped strings, so both formats
+    validate the same way. Raises ValueError if the file can't be read.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise ValueError("file is not UTF-8 text")
+    if filename.lower().endswith(".json"):
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError("a JSON import must be a list of objects")
+        return [{str(k).strip().lower(): "" if v is None else str(v).strip() for k, v in row.items()} for row in rows]
+    return [{k.strip().lower(): (v or "").strip() for k, v in row.items() if k is not None}
+            for row in csv.DictReader(io.StringIO(text))]
+
+def _shown(value: str) -> str:
+    """A cell value quoted for an error message, cut short so one cell can't fill the reply"""
+    return repr(value if len(value) <= MAX_SHOWN_VALUE else value[:MAX_SHOWN_VALUE] + "...")
+
+def _int(row: Row, name: str, default: Optional[int] = None, minimum: Optional[int] = None,
+         maximum: Optional[int] = None) -> Optional[int]:
+    value = row.get(name, "")
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"{name} {_shown(value)} is not a whole number")
+    if minimum is not None and number < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    if maximum is not None and number > maximum:
+        raise ValueError(f"{name} must be at most {maximum}")
+    return number
+
+# ==================== BOUNTIES ====================
+
+def parse_bounties(rows: List[Row], creator_id: int) -> Tuple[List[Bounty], List[str]]:
+    """Draft bounties from rows of title, description, type, reward, timeframe_hours
+
+    `type` defaults to regular and `reward` to 0; `timeframe_hours` may be
+    left out. Returns the drafts and one error per bad row; use the drafts
+    only if there are no errors.
+    """
+    drafts, errors = [], []
+    for n, row in enumerate(rows, start=1):
+        try:
+            title, description = row.get("title", ""), row.get("description", "")
+            if not title or not description:
+                raise ValueError("title and description are required")
+            if len(title) > 200:
+                raise ValueError("title is longer than 200 characters")
+            try:
+                bounty_type = BountyType(row.get("type", "").lower() or BountyType.REGULAR.value)
+            except ValueError:
+                raise ValueError(f"unknown type {_shown(row['type'])}")
+            drafts.append(Bounty(
+                id="",
+                creator_id=creator_id,
+                bounty_type=bounty_type,
+                status=BountyStatus.DRAFT,
+                title=title,
+                description=description,
+                reward=_int(row, "reward", 0, minimum=0, maximum=MAX_REWARD),
+                timeframe_hours=_int(row, "timeframe_hours", minimum=1)
+            ))
+        except ValueError as e:
+            errors.append(f"row {n}: {e}")
+    return drafts, errors
+
+# ==================== CREDIT ADJUSTMENTS ====================
+
+USER_ID = re.compile(r"^(?:<@!?)?(\d+)>?$")
+
+def parse_adjustments(rows: List[Row]) -> Tuple[List[Tuple[int, int]], List[str]]:
+    """(discord_id, amount) from rows of user, amount; `user` is an ID or a mention
+
+    Amounts follow /adjust_credits: positive means the member owes more.
+    """
+    adjustments, errors = [], []
+    for n, row in enumerate(rows, start=1):
+        try:
+            match = USER_ID.match(row.get("user", ""))
+            if not match:
+                raise ValueError(f"user {_shown(row.get('user', ''))} is not a Discord user ID or mention")
+            amount = _int(row, "amount", 0)
+            if not amount:
+                raise ValueError("amount is missing or zero")
+            adjustments.append((int(match.group(1)), amount))
+        except ValueError as e:
+            errors.append(f"row {n}: {e}")
+    return adjustments, errors
+
+def error_report(errors: List[str], limit: int = 10) -> str:
+    """The first few row errors, for an ephemeral reply
+
+    Each error is cut short so the whole report stays under
+    MAX_REPORT_LENGTH however long the rows were.
+    """
+    width = (MAX_REPORT_LENGTH - 100) // limit  # 100 covers the heading and the "more" line
+    lines = [error if len(error) <= width else error[:width - 3] + "..." for error in errors[:limit]]
+    more = f"\n...and {len(errors) - limit} more" if len(errors) > limit else ""
+    return "Nothing imported; fix these rows first:\n" + "\n".join(lines) + more
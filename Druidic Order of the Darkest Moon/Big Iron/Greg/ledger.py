@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from models import Member
+from storage import Storage
+
+log = logging.getLogger(__name__)
+
+# ==================== ACCOUNTS ====================
+
+MEMBER_PREFIX = "member:"
+REWARDS_ACCOUNT = "rewards"  # Issues bounty rewards; its balance goes negative as credits are paid out
+ADJUSTMENTS_ACCOUNT = "adjustments"  # Counterparty of manual /adjust_credits changes
+BIG_IRON_ACCOUNT = "big_iron"  # Income from Big Iron payments
+BIG_IRON_SPLIT = {"infrastructure": 70, "reserves": 30}  # GregTheory: 70% infrastructure, 30% reserves
+
+def member_account(discord_id: int) -> str:
+    return f"{MEMBER_PREFIX}{discord_id}"
+
+def split(amount: int, weights: Dict[str, int]) -> List[Tuple[str, int]]:
+    """Divide `amount` by integer weights; leftover units go to the largest remainders so parts sum exactly"""
+    total = sum(weights.values())
+    shares = {account: amount * weight // total for account, weight in weights.items()}
+    leftover = amount - sum(shares.values())
+    for account in sorted(weights, key=lambda a: (-(amount * weights[a] % total), a))[:leftover]:
+        shares[account] += 1
+    return list(shares.items())
+
+# ==================== POSTINGS ====================
+
+@dataclass(frozen=True)
+class Posting:
+    """One balanced ledger transaction: its legs sum to zero
+
+    `key` makes it idempotent - a posting whose key is already in the
+    ledger is skipped, so retries and replays never pay twice.
+    """
+    key: str
+    legs: Tuple[Tuple[str, int], ...]
+    reason: str
+
+    def __post_init__(self):
+        if sum(amount for _, amount in self.legs) != 0:
+            raise ValueError(f"Posting {self.key} is unbalanced: {self.legs}")
+
+    @classmethod
+    def transfer(cls, key: str, source: str, dest: str, amount: int, reason: str) -> "Posting":
+        return cls(key, ((source, -amount), (dest, amount)), reason)
+
+    @classmethod
+    def payout(cls, key: str, source: str, amount: int, weights: Dict[str, int], reason: str) -> "Posting":
+        """Pay `amount` from `source` to several accounts in proportion to `weights`"""
+        return cls(key, ((source, -amount),) + tuple(split(amount, weights)), reason)
+
+@dataclass
+class Settlement:
+    posted: List[Posting] = field(default_factory=list)
+    skipped: List[Posting] = field(default_factory=list)  # Key already in the ledger
+    flagged: List[Posting] = field(default_factory=list)  # Gave up after retries
+
+# ==================== LEDGER ====================
+
+class Ledger:
+    """Append-only credit ledger with cached running balances
+
+    Entries are never changed once written; balances are kept current as
+    postings land, so reading one is O(1). A member's balance is the
+    negation of `Member.time_credits_owed`, which stays the cache the
+    can_post/can_claim checks read. System account balances are cached in
+    the store next to the entries, in the same transaction.
+    """
+
+    def __init__(self, store: Storage, get_member: Callable[[int], Member]):
+        self.store = store
+        self.get_member = get_member
+        self.balances: Dict[str, int] = store.load_balances()
+        self.flagged: List[str] = store.get_meta("flagged_postings", [])
+
+    def balance(self, account: str) -> int:
+        if account.startswith(MEMBER_PREFIX):
+            return -self.get_member(int(account[len(MEMBER_PREFIX):])).time_credits_owed
+        return self.balances.get(account, 0)
+
+    def _apply(self, posting: Posting, sign: int = 1) -> List[Member]:
+        """Move the cached balances; returns the members touched"""
+        members = []
+        for account, amount in posting.legs:
+            if account.startswith(MEMBER_PREFIX):
+                member = self.get_member(int(account[len(MEMBER_PREFIX):]))
+                member.time_credits_owed -= sign * amount
+                members.append(member)
+            else:
+                self.balances[account] = self.balances.get(account, 0) + sign * amount
+        return members
+
+    def settle(self, postings: Sequence[Posting]) -> Settlement:
+        """Post a batch in one transaction, skipping postings whose key was already posted
+
+        Joins the caller's transaction if there is one. On failure nothing
+        is written and the cached balances are put back.
+        """
+        result = Settlement()
+        seen = self.store.posted_keys(p.key for p in postings)
+        for posting in postings:
+            if posting.key in seen:
+                result.skipped.append(posting)
+            else:
+                result.posted.append(posting)
+                seen.add(posting.key)
+        if not result.posted:
+            return result
+
+        members: Dict[int, Member] = {}
+        accounts = set()
+        now = time.time()
+        entries = []
+        applied = Settlement()
+        try:
+            with self.store.transaction() as tx:
+                for posting in result.posted:
+                    for member in self._apply(posting):
+                        members[member.discord_id] = member
+                    applied.posted.append(posting)
+                    for account, amount in posting.legs:
+                        entries.append((posting.key, account, amount, posting.reason, now))
+                        if not account.startswith(MEMBER_PREFIX):
+                            accounts.add(account)
+                tx.append_entries(entries)
+                tx.put_balances({account: self.balances[account] for account in accounts})
+                for member in members.values():
+                    tx.put_member(member)
+        except Exception:
+            self.revert(applied)
+            raise
+        return result
+
+    def revert(self, settlement: Settlement):
+        """Undo the cached-balance side of a settlement whose transaction rolled back"""
+        for posting in settlement.posted:
+            self._apply(posting, -1)
+
+    async def settle_with_retry(self, postings: Sequence[Posting], attempts: int = 3,
+                                backoff: float = 1.0) -> Settlement:
+        """GregTheory: if payment fails, retry 3x then flag for human intervention
+
+        Retrying is safe because postings are idempotent: anything that did
+        commit on an earlier attempt is skipped.
+        """
+        for attempt in range(attempts):
+            try:
+                return self.settle(postings)
+            except Exception:
+                log.exception("Settlement of %d postings failed (attempt %d/%d)", len(postings), attempt + 1, attempts)
+                if attempt + 1 < attempts:
+                    await asyncio.sleep(backoff * 2 ** attempt)
+        self.flag(postings)
+        return Settlement(flagged=list(postings))
+
+    def flag(self, postings: Iterable[Posting]):
+        """Remember postings that need a human; persisted if the store will take it"""
+        self.flagged.extend(p.key for p in postings)
+        try:
+            with self.store.transaction() as tx:
+                tx.set_meta("flagged_postings", self.flagged)
+        except Exception:
+            log.exception("Could not persist flagged postings")
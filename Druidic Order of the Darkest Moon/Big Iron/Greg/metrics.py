@@ -0,0 +1,286 @@
+import asyncio
+import cProfile
+import functools
+import heapq
+import io
+import logging
+import pstats
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+log = logging.getLogger(__name__)
+
+LabelSet = Tuple[Tuple[str, str], ...]
+
+# Seconds; tuned for handlers that should finish in well under the 3s interaction deadline
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+def _labels(labels: Dict[str, str]) -> LabelSet:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: LabelSet, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+# ==================== INSTRUMENTS ====================
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: Dict[LabelSet, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_format_labels(k)} {v}" for k, v in self.values.items()]
+        return lines
+
+class Gauge:
+    """Read at scrape time from a callback, so it costs nothing on the hot path"""
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name, self.help, self.read = name, help, read
+
+    def expose(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {self.read()}"]
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is one bisect and two increments"""
+
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name, self.help, self.buckets = name, help, buckets
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[LabelSet, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = _labels(labels)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def quantile(self, q: float, **labels) -> float:
+        """Upper bucket bound containing the q-th observation (what /stats shows)"""
+        series = self.series.get(_labels(labels))
+        if not series or not series[2]:
+            return 0.0
+        rank, seen = q * series[2], 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[0]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in self.series.items():
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                le_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_format_labels(key, le_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+# ==================== SLOW CALL PROFILER ====================
+
+class SlowCalls:
+    """Keeps the N slowest handler invocations, optionally with a cProfile of each
+
+    With `profile_every=N` one invocation in N runs under cProfile; the
+    stats are kept only if that call lands in the slowest N. The profiler
+    sees every task that runs while the handler is awaiting, so treat the
+    output as a sample of what the loop was doing, not an exact attribution.
+    """
+
+    def __init__(self, keep: int = 10, profile_every: int = 0):
+        self.keep = keep
+        self.profile_every = profile_every
+        self.slowest: List[Tuple[float, float, str, Optional[str]]] = []  # min-heap
+        self.profiling = False  # Only one cProfile can be active per thread
+        self._calls = 0
+
+    def should_profile(self) -> bool:
+        if not self.profile_every or self.profiling:
+            return False
+        self._calls += 1
+        return self._calls % self.profile_every == 0
+
+    def record(self, name: str, seconds: float, profile: Optional[cProfile.Profile] = None):
+        if len(self.slowest) >= self.keep and seconds <= self.slowest[0][0]:
+            return
+        stats = None
+        if profile is not None:
+            out = io.StringIO()
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(15)
+            stats = out.getvalue()
+        entry = (seconds, time.time(), name, stats)
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heapreplace(self.slowest, entry)
+
+    def report(self) -> List[Tuple[float, float, str, Optional[str]]]:
+        return sorted(self.slowest, reverse=True)
+
+# ==================== RATE LIMITS ====================
+
+SNOWFLAKE = re.compile(r"/\d{15,}")
+API_VERSION = re.compile(r"^/api/v\d+")
+
+class RateLimitLog(logging.Handler):
+    """Counts every 429 response discord.py's HTTP client logs, including those it waits out
+
+    discord.py sleeps through most 429s and retries without raising, so the
+    only place each one shows up is its "responded with 429" warning. IDs in
+    the URL are folded so the route label stays low-cardinality.
+    """
+
+    def __init__(self, counter: "Counter"):
+        super().__init__(logging.WARNING)
+        self.counter = counter
+
+    def emit(self, record: logging.LogRecord):
+        if "responded with 429" in str(record.msg) and isinstance(record.args, tuple) and len(record.args) >= 2:
+            method, url = record.args[:2]
+            path = API_VERSION.sub("", SNOWFLAKE.sub("/{id}", urlsplit(str(url)).path))
+            self.counter.inc(route=f"{method} {path}")
+
+# ==================== METRICS REGISTRY ====================
+
+class Metrics:
+    """Every instrument the bot exposes, rendered in Prometheus text format"""
+
+    def __init__(self, profile_every: int = 0):
+        self.instruments: List = []
+        self.command_seconds = self.histogram("greg_command_seconds", "Slash command handler latency")
+        self.reaction_seconds = self.histogram("greg_reaction_seconds", "Reaction handler latency")
+        self.loop_lag = self.histogram("greg_event_loop_lag_seconds", "How late the event loop woke a sleeper")
+        self.discord_seconds = self.histogram("greg_discord_api_seconds", "Outbound Discord REST call latency")
+        self.discord_429s = self.counter("greg_discord_429_total", "Discord REST responses that were 429s")
+        self.rate_limit_log = RateLimitLog(self.discord_429s)
+        self.transitions = self.counter("greg_bounty_transitions_total", "Bounty status changes")
+        self.slow_calls = SlowCalls(profile_every=profile_every)
+        self._lag_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def histogram(self, name: str, help: str) -> Histogram:
+        h = Histogram(name, help)
+        self.instruments.append(h)
+        return h
+
+    def counter(self, name: str, help: str) -> Counter:
+        c = Counter(name, help)
+        self.instruments.append(c)
+        return c
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        g = Gauge(name, help, read)
+        self.instruments.append(g)
+        return g
+
+    @contextmanager
+    def time(self, histogram: Histogram, name: str, **labels):
+        """Observe the wrapped block's duration and offer it to the slow-call list"""
+        profile = cProfile.Profile() if self.slow_calls.should_profile() else None
+        if profile:
+            self.slow_calls.profiling = True
+            profile.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile:
+                profile.disable()
+                self.slow_calls.profiling = False
+            histogram.observe(elapsed, **labels)
+            self.slow_calls.record(name, elapsed, profile)
+
+    def render(self) -> str:
+        lines = []
+        for instrument in self.instruments:
+            lines += instrument.expose()
+        return "\n".join(lines) + "\n"
+
+    def render_slow_calls(self) -> str:
+        parts = []
+        for seconds, at, name, stats in self.slow_calls.report():
+            stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(at))
+            parts.append(f"{name} {seconds * 1e3:.2f}ms at {stamp}\n{stats or ''}")
+        return "\n".join(parts) or "no calls recorded\n"
+
+    # ---- event loop lag ----
+
+    def start_lag_monitor(self, interval: float = 0.5):
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.get_running_loop().create_task(self._watch_lag(interval))
+
+    async def _watch_lag(self, interval: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.loop_lag.observe(max(0.0, loop.time() - start - interval))
+
+    # ---- rate limits ----
+
+    def watch_rate_limits(self, logger: str = "discord.http"):
+        logging.getLogger(logger).addHandler(self.rate_limit_log)
+
+    # ---- HTTP endpoint ----
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 9464):
+        """Serve GET /metrics (Prometheus scrape target) and /slow (profiles) on a local port"""
+        self._server = await asyncio.start_server(self._handle_http, host, port)
+        log.info("Metrics on http://%s:%d/metrics", host, port)
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)).strip():
+                pass  # Skip headers
+            path = request.split()[1] if len(request.split()) > 1 else b"/"
+            if path == b"/metrics":
+                body, status = self.render().encode(), "200 OK"
+            elif path == b"/slow":
+                body, status = self.render_slow_calls().encode(), "200 OK"
+            else:
+                body, status = b"not found\n", "404 Not Found"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def stop(self):
+        logging.getLogger("discord.http").removeHandler(self.rate_limit_log)
+        if self._lag_task:
+            self._lag_task.cancel()
+        if self._server:
+            self._server.close()
+
+def timed_command(func):
+    """Record a slash command's latency in the bot's command histogram"""
+    @functools.wraps(func)
+    async def wrapper(self, interaction, *args, **kwargs):
+        with self.metrics.time(self.metrics.command_seconds, func.__name__, command=func.__name__):
+            return await func(self, interaction, *args, **kwargs)
+    return wrapper
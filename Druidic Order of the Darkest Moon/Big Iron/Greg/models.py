@@ -0,0 +1,98 @@
+from enum import Enum
+from dataclasses import dataclass
+from typing import FrozenSet, Optional, Set, Union
+
+# ==================== DATA MODELS ====================
+
+class Role(Enum):
+    MEMBER = "member"
+    AVF = "avf"  # Verified members who can do verification work
+
+class BountyStatus(Enum):
+    DRAFT = "draft"
+    AWAITING_VERIFICATION = "awaiting_verification"  # Community bounties waiting for pre-verification
+    POSTED = "posted"  # Live on the board, can be claimed
+    CLAIMED = "claimed"  # Someone is working on it
+    AWAITING_POST_VERIFICATION = "awaiting_post_verification"  # Regular bounties waiting for completion verification
+    VERIFIED = "verified"  # Completed and verified
+    REJECTED = "rejected"  # Failed verification
+
+class BountyType(Enum):
+    REGULAR = "regular"  # AVF posts, goes straight to board
+    COMMUNITY = "community"  # Members post, needs pre-verification
+    RESOURCE = "resource"  # Special handling for Big Iron deliveries
+    EDITING = "editing"  # Cut a merged stretch of clipped VOD; created by the clip pipeline
+
+MAX_REWARD = 1000  # Credits; neither a poster nor escalation can take a bounty's reward past this
+
+NO_BOUNTIES: FrozenSet[str] = frozenset()  # Shared by every member without assignments
+
+@dataclass(slots=True)
+class Member:
+    discord_id: int
+    role: Role
+    time_credits_owed: int = 0
+    # Change through assign/unassign: members only get a set of their own once they hold a bounty,
+    # and hold the shared NO_BOUNTIES otherwise - so it is only mutated while non-empty
+    assigned_bounties: Union[Set[str], FrozenSet[str]] = NO_BOUNTIES
+    
+    def assign(self, bounty_id: str):
+        if isinstance(self.assigned_bounties, set):
+            self.assigned_bounties.add(bounty_id)
+        else:
+            self.assigned_bounties = {bounty_id}
+    
+    def unassign(self, bounty_id: str):
+        assigned = self.assigned_bounties
+        if isinstance(assigned, set) and bounty_id in assigned:
+            assigned.discard(bounty_id)
+            if not assigned:
+                self.assigned_bounties = NO_BOUNTIES
+    
+    def is_default(self) -> bool:
+        """Nothing about this member differs from someone who was never seen"""
+        return self.role == Role.MEMBER and self.time_credits_owed == 0 and not self.assigned_bounties
+    
+    def can_post_bounty(self) -> bool:
+        """Members can post if they don't owe time credits"""
+        return self.time_credits_owed <= 0
+    
+    def can_claim_bounty(self) -> bool:
+        """Members can claim if no debt and no current assignments"""
+        return self.time_credits_owed <= 0 and len(self.assigned_bounties) == 0
+    
+    def is_avf(self) -> bool:
+        """Check if member has AVF privileges"""
+        return self.role == Role.AVF
+
+@dataclass
+class Bounty:
+    id: str
+    creator_id: int
+    bounty_type: BountyType
+    status: BountyStatus
+    title: str
+    description: str
+    assigned_to: Optional[int] = None
+    verifier_id: Optional[int] = None  # Who's doing the verification
+    message_id: Optional[int] = None  # Discord message ID for reactions
+    verification_message_id: Optional[int] = None  # Pre- or completion-verification message
+    reward: int = 0  # Time credits paid on completion; grows while the bounty sits unclaimed
+    timeframe_hours: Optional[int] = None  # How long a claimer has before the claim is released
+    verification_stage: Optional[str] = None  # Stage ("pre"/"completion") verification_message_id was posted for
+    
+    def can_be_claimed(self) -> bool:
+        """Check if bounty is available for claiming"""
+        return self.status == BountyStatus.POSTED
+    
+    def review_stage(self) -> str:
+        """Whether the bounty's verification is its pre-verification or its completion check"""
+        if self.status in (BountyStatus.AWAITING_POST_VERIFICATION, BountyStatus.VERIFIED):
+            return "completion"
+        if self.status == BountyStatus.REJECTED and self.assigned_to is not None:
+            return "completion"
+        return "pre"
+    
+    def on_verification_message(self, message_id: int) -> bool:
+        """Whether `message_id` is the verification message of the stage the bounty is in now"""
+        return message_id == self.verification_message_id and self.verification_stage == self.review_stage()
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, List, Optional, Tuple
+
+import discord
+
+log = logging.getLogger(__name__)
+
+# ==================== RATE LIMITING ====================
+
+class TokenBucket:
+    """Allows `rate` actions per `per` seconds, with bursts up to `rate`"""
+
+    def __init__(self, rate: int, per: float):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    async def acquire(self):
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+            self._refill()
+        self.tokens -= 1
+
+# Per-route limits, roughly matching Discord's published per-channel buckets
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "messages": (5, 5.0),    # send/edit in one channel
+    "reactions": (4, 1.0),   # add/remove reaction in one channel
+    "dm": (5, 5.0),          # DMs, shared by all users
+}
+
+class Route:
+    """FIFO of pending actions drained by one worker under one rate limit"""
+
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.pending: Deque[Callable[[], Awaitable[Any]]] = deque()
+        self.worker: Optional[asyncio.Task] = None
+
+# ==================== OUTBOUND QUEUE ====================
+
+class OutboundQueue:
+    """Background scheduler for every Discord REST call a handler makes
+
+    Handlers enqueue and return immediately; per-route workers drain the
+    queues at Discord's rate limits. Repeated edits to the same message are
+    coalesced so only the latest state is sent, and log-channel lines are
+    batched into periodic digest messages.
+    """
+
+    MAX_MESSAGE = 2000
+
+    def __init__(self, get_channel: Callable[[int], Any], digest_interval: float = 10.0,
+                 limits: Optional[Dict[str, Tuple[int, float]]] = None):
+        self.get_channel = get_channel
+        self.digest_interval = digest_interval
+        self.limits = limits or ROUTE_LIMITS
+        self.routes: Dict[Hashable, Route] = {}
+        # Outlive their routes, so a burst right after a queue drains still waits for tokens
+        self.buckets: Dict[Hashable, TokenBucket] = {}
+        # message id -> latest edit kwargs, while an edit for it is queued
+        self.pending_edits: Dict[int, Dict[str, Any]] = {}
+        # log channel id -> lines waiting for its next digest
+        self.digest: Dict[int, List[str]] = {}
+        self.digest_task: Optional[asyncio.Task] = None
+        # Optional hook called as on_call(route_kind, seconds, rate_limited) after each REST call
+        self.on_call: Optional[Callable[[str, float, bool], None]] = None
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    # ---- workers ----
+
+    def _enqueue(self, kind: str, key: Hashable, action: Callable[[], Awaitable[Any]]):
+        route_key = (kind, key)
+        route = self.routes.get(route_key)
+        if route is None:
+            bucket = self.buckets.get(route_key)
+            if bucket is None:
+                bucket = self.buckets[route_key] = TokenBucket(*self.limits[kind])
+            route = self.routes[route_key] = Route(bucket)
+        route.pending.append(action)
+        self._idle.clear()
+        if route.worker is None or route.worker.done():
+            route.worker = asyncio.get_running_loop().create_task(self._drain(route_key, route))
+
+    async def _drain(self, route_key: Hashable, route: Route):
+        while route.pending:
+            await route.bucket.acquire()
+            action = route.pending.popleft()
+            await self._run(route_key[0], action)
+        del self.routes[route_key]
+        if not self.routes:
+            self._idle.set()
+
+    async def _run(self, kind: str, action: Callable[[], Awaitable[Any]], attempts: int = 3):
+        for attempt in range(attempts):
+            start = time.perf_counter()
+            try:
+                await action()
+                self._observe(kind, start, False)
+                return
+            except discord.HTTPException as e:
+                self._observe(kind, start, e.status == 429)
+                # discord.py already waits out most 429s; this covers the ones it gives up on
+                if e.status == 429 and attempt + 1 < attempts:
+                    await asyncio.sleep(getattr(e, "retry_after", 1.0) or 1.0)
+                    continue
+                log.warning("Outbound action failed: %s", e)
+                return
+            except Exception:
+                log.exception("Outbound action crashed")
+                return
+
+    def _observe(self, kind: str, start: float, rate_limited: bool):
+        if self.on_call:
+            self.on_call(kind, time.perf_counter() - start, rate_limited)
+
+    async def join(self):
+        """Wait until every queued action has been sent"""
+        await self._idle.wait()
+
+    def depth(self) -> int:
+        """Actions waiting across all routes"""
+        return sum(len(route.pending) for route in self.routes.values())
+
+    def digest_depth(self) -> int:
+        """Log lines waiting across all log channels"""
+        return sum(len(lines) for lines in self.digest.values())
+
+    # ---- actions ----
+
+    def send(self, channel, reactions: Tuple[str, ...] = (),
+             on_sent: Optional[Callable[[discord.Message], Any]] = None, **kwargs):
+        """Send a message, then add `reactions`; `on_sent(message)` runs once it exists"""
+        async def action():
+            message = await channel.send(**kwargs)
+            if on_sent:
+                on_sent(message)
+            for emoji in reactions:
+                self.add_reaction(message, emoji)
+        self._enqueue("messages", channel.id, action)
+
+    def edit(self, message, **kwargs):
+        """Edit a message; edits queued before this one sends are replaced, not repeated"""
+        already_queued = message.id in self.pending_edits
+        self.pending_edits[message.id] = kwargs
+        if already_queued:
+            return
+
+        async def action():
+            latest = self.pending_edits.pop(message.id)
+            await message.edit(**latest)
+        self._enqueue("messages", message.channel.id, action)
+
+    def add_reaction(self, message, emoji):
+        self._enqueue("reactions", message.channel.id, lambda: message.add_reaction(emoji))
+
+    def remove_reaction(self, message, emoji, user_id: int):
+        self._enqueue("reactions", message.channel.id,
+                      lambda: message.remove_reaction(emoji, discord.Object(id=user_id)))
+
+    def dm(self, user, content: str):
+        self._enqueue("dm", None, lambda: user.send(content))
+
+    # ---- log digest ----
+
+    def log(self, channel_id: Optional[int], line: str):
+        """Queue a line for the next digest to `channel_id` (dropped if no log channel is set)"""
+        if not channel_id:
+            return
+        self.digest.setdefault(channel_id, []).append(line)
+        if self.digest_task is None or self.digest_task.done():
+            self.digest_task = asyncio.get_running_loop().create_task(self._flush_digest_later())
+
+    async def _flush_digest_later(self):
+        await asyncio.sleep(self.digest_interval)
+        self.flush_digest()
+
+    def flush_digest(self):
+        """Send everything buffered for the log channels now, split at Discord's length limit"""
+        digest, self.digest = self.digest, {}
+        for channel_id, lines in digest.items():
+            channel = self.get_channel(channel_id)
+            if channel is not None:
+                self._send_lines(channel, lines)
+
+    def _send_lines(self, channel, lines: List[str]):
+        chunk = ""
+        for line in lines:
+            if chunk and len(chunk) + len(line) + 1 > self.MAX_MESSAGE:
+                self.send(channel, content=chunk)
+                chunk = ""
+            chunk = f"{chunk}\n{line}" if chunk else line[:self.MAX_MESSAGE]
+        self.send(channel, content=chunk)
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Set, Tuple
+
+from models import BountyStatus, Bounty
+
+# ==================== QUORUM ====================
+
+@dataclass(frozen=True)
+class Quorum:
+    """`needed` of `panel` AVF verdicts settle a verification, e.g. Quorum(2, 3) for 2-of-3
+
+    Approval needs `needed` approvals; rejection comes as soon as approval
+    can no longer reach `needed` within the panel.
+    """
+    needed: int = 1
+    panel: int = 1
+
+    def __post_init__(self):
+        if not 1 <= self.needed <= self.panel:
+            raise ValueError(f"Quorum needs 1 <= needed <= panel, got {self.needed} of {self.panel}")
+
+    def verdict(self, tally: "Tally") -> Optional[bool]:
+        """True/False once the tally settles it, None while it's still open"""
+        if tally.approvals >= self.needed:
+            return True
+        if tally.rejections > self.panel - self.needed:
+            return False
+        return None
+
+SINGLE = Quorum()  # The first AVF verdict decides
+
+# ==================== TALLIES ====================
+
+class Tally:
+    """Votes on one verification message; each voter counts once"""
+    __slots__ = ("votes", "approvals", "rejections")
+
+    def __init__(self):
+        self.votes: Dict[int, bool] = {}  # voter -> approved
+        self.approvals = 0
+        self.rejections = 0
+
+    def add(self, voter: int, approve: bool) -> bool:
+        """Count a vote; False if this voter already has one (the first stands)"""
+        if voter in self.votes:
+            return False
+        self.votes[voter] = approve
+        if approve:
+            self.approvals += 1
+        else:
+            self.rejections += 1
+        return True
+
+    def remove(self, voter: int, approve: bool) -> bool:
+        """Take back a vote whose reaction was removed; False if it wasn't the counted one"""
+        if self.votes.get(voter) != approve:
+            return False
+        del self.votes[voter]
+        if approve:
+            self.approvals -= 1
+        else:
+            self.rejections -= 1
+        return True
+
+AWAITING = (BountyStatus.AWAITING_VERIFICATION, BountyStatus.AWAITING_POST_VERIFICATION)
+
+class VerificationVotes:
+    """Running tallies per verification message, for one partition
+
+    Every vote and removal is O(1): counts move as reactions come and go,
+    and nothing re-reads a message's reactions. Tallies are kept in memory
+    only; on every reconnect, reconciliation drops the votes whose reaction
+    is gone and replays the verdict reactions still on open verification
+    messages, which rebuilds them from what Discord shows.
+    """
+
+    def __init__(self):
+        self.tallies: Dict[int, Tally] = {}
+
+    def __len__(self) -> int:
+        return len(self.tallies)
+
+    def tally(self, message_id: int) -> Tally:
+        tally = self.tallies.get(message_id)
+        if tally is None:
+            tally = self.tallies[message_id] = Tally()
+        return tally
+
+    def withdraw(self, message_id: int, voter: int, approve: bool) -> bool:
+        tally = self.tallies.get(message_id)
+        return tally is not None and tally.remove(voter, approve)
+
+    def keep_only(self, message_id: int, reactions: Set[Tuple[int, bool]]) -> int:
+        """Drop votes whose (voter, approve) reaction is no longer on the message; returns how many"""
+        tally = self.tallies.get(message_id)
+        if tally is None:
+            return 0
+        gone = [(voter, approve) for voter, approve in tally.votes.items() if (voter, approve) not in reactions]
+        for voter, approve in gone:
+            tally.remove(voter, approve)
+        return len(gone)
+
+    def on_status(self, bounty: Bounty, old_status: BountyStatus):
+        """Status listener: a verification that moved on, however it was settled, needs no tally"""
+        if old_status in AWAITING and bounty.verification_message_id is not None:
+            self.tallies.pop(bounty.verification_message_id, None)
@@ -0,0 +1,276 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import AbstractSet, Callable, Dict, Iterable, Iterator, List, Optional
+
+from models import NO_BOUNTIES, Role, BountyStatus, BountyType, Member, Bounty
+from search import PrefixIndex, SearchIndex
+
+# ==================== SORTED KEY INDEX ====================
+
+def bounty_key(bounty_id: str) -> int:
+    """Numeric sort key of a bounty ID (bounty_42 -> 42)"""
+    return int(bounty_id.rsplit("_", 1)[-1])
+
+class SortedKeys:
+    """Ascending list of bounty keys, paged by cursor with bisect
+
+    A page costs O(log n + page size) no matter how big the index is.
+    """
+
+    def __init__(self):
+        self.keys: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: int):
+        insort(self.keys, key)
+
+    def remove(self, key: int):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            del self.keys[i]
+
+    def before(self, cursor: Optional[int], limit: int) -> List[int]:
+        """Up to `limit` keys below `cursor` (newest first); no cursor = from the top"""
+        end = len(self.keys) if cursor is None else bisect_left(self.keys, cursor)
+        return self.keys[max(0, end - limit):end][::-1]
+
+    def after(self, cursor: int, limit: int) -> List[int]:
+        """Up to `limit` keys above `cursor` (newest first)"""
+        start = bisect_right(self.keys, cursor)
+        return self.keys[start:start + limit][::-1]
+
+    def has_before(self, cursor: int) -> bool:
+        return bisect_left(self.keys, cursor) > 0
+
+    def has_after(self, cursor: int) -> bool:
+        return bisect_right(self.keys, cursor) < len(self.keys)
+
+# ==================== BOUNTY REGISTRY ====================
+
+class BountyRegistry:
+    """All bounties plus secondary indexes, kept current on every change
+
+    Behaves like the old Dict[str, Bounty] for lookups, but status and
+    assignee changes must go through `set_status`/`assign` so the
+    per-status, per-type, per-creator and per-assignee indexes stay in sync.
+    Titles and descriptions are full-text indexed as bounties are added;
+    status/type filters read the live bounty, so status changes need no
+    reindexing.
+    """
+
+    def __init__(self, bounties: Iterable[Bounty] = ()):
+        self._bounties: Dict[str, Bounty] = {}
+        self._by_key: Dict[int, Bounty] = {}
+        self._all = SortedKeys()
+        self._by_status: Dict[BountyStatus, SortedKeys] = {s: SortedKeys() for s in BountyStatus}
+        self._by_type: Dict[BountyType, SortedKeys] = {t: SortedKeys() for t in BountyType}
+        self._by_creator: Dict[int, SortedKeys] = {}
+        self._by_assignee: Dict[int, SortedKeys] = {}
+        # message_id -> bounty_id for every board and verification message
+        self._by_message: Dict[int, str] = {}
+        self._text = SearchIndex()
+        self._ids = PrefixIndex()
+        # Called as listener(bounty, old_status) after every status change
+        self.status_listeners: List[Callable[[Bounty, BountyStatus], None]] = []
+        for bounty in bounties:
+            self.add(bounty)
+
+    # ---- mapping interface ----
+
+    def __getitem__(self, bounty_id: str) -> Bounty:
+        return self._bounties[bounty_id]
+
+    def __contains__(self, bounty_id: object) -> bool:
+        return bounty_id in self._bounties
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._bounties)
+
+    def __len__(self) -> int:
+        return len(self._bounties)
+
+    def get(self, bounty_id: str, default: Optional[Bounty] = None) -> Optional[Bounty]:
+        return self._bounties.get(bounty_id, default)
+
+    def values(self):
+        return self._bounties.values()
+
+    def items(self):
+        return self._bounties.items()
+
+    # ---- mutations ----
+
+    def add(self, bounty: Bounty):
+        """Register a new bounty and index it"""
+        key = bounty_key(bounty.id)
+        self._bounties[bounty.id] = bounty
+        self._by_key[key] = bounty
+        self._all.add(key)
+        self._by_status[bounty.status].add(key)
+        self._by_type[bounty.bounty_type].add(key)
+        self._by_creator.setdefault(bounty.creator_id, SortedKeys()).add(key)
+        self._text.add(key, bounty.title, bounty.description)
+        self._ids.add(bounty.id)
+        if bounty.assigned_to is not None:
+            self._by_assignee.setdefault(bounty.assigned_to, SortedKeys()).add(key)
+        for message_id in (bounty.message_id, bounty.verification_message_id):
+            if message_id is not None:
+                self._by_message[message_id] = bounty.id
+
+    def set_status(self, bounty: Bounty, status: BountyStatus):
+        """Change a bounty's status and move it between status indexes"""
+        if bounty.status == status:
+            return
+        key = bounty_key(bounty.id)
+        old = bounty.status
+        self._by_status[old].remove(key)
+        self._by_status[status].add(key)
+        bounty.status = status
+        for listener in self.status_listeners:
+            listener(bounty, old)
+
+    def assign(self, bounty: Bounty, member_id: Optional[int]):
+        """Set (or clear with None) a bounty's assignee"""
+        if bounty.assigned_to == member_id:
+            return
+        key = bounty_key(bounty.id)
+        if bounty.assigned_to is not None:
+            index = self._by_assignee.get(bounty.assigned_to)
+            if index is not None:
+                index.remove(key)
+                if not index:
+                    del self._by_assignee[bounty.assigned_to]
+        if member_id is not None:
+            self._by_assignee.setdefault(member_id, SortedKeys()).add(key)
+        bounty.assigned_to = member_id
+
+    def index_message(self, bounty: Bounty, message_id: int):
+        """Record which bounty a board or verification message belongs to"""
+        self._by_message[message_id] = bounty.id
+
+    # ---- queries ----
+
+    def find_by_message(self, message_id: int) -> Optional[Bounty]:
+        """O(1) lookup of the bounty tracked on a message"""
+        bounty_id = self._by_message.get(message_id)
+        return self._bounties.get(bounty_id) if bounty_id is not None else None
+
+    def _index(self, status: Optional[BountyStatus]) -> SortedKeys:
+        return self._all if status is None else self._by_status[status]
+
+    def count(self, status: Optional[BountyStatus] = None) -> int:
+        return len(self._index(status))
+
+    def page(self, status: Optional[BountyStatus] = None, before: Optional[int] = None,
+             after: Optional[int] = None, limit: int = 10) -> List[Bounty]:
+        """One page of bounties, newest first
+
+        Pass the key of the last bounty shown as `before` for the next
+        (older) page, or the key of the first one as `after` for the
+        previous (newer) page.
+        """
+        index = self._index(status)
+        keys = index.after(after, limit) if after is not None else index.before(before, limit)
+        return [self._by_key[k] for k in keys]
+
+    def has_older(self, key: int, status: Optional[BountyStatus] = None) -> bool:
+        return self._index(status).has_before(key)
+
+    def has_newer(self, key: int, status: Optional[BountyStatus] = None) -> bool:
+        return self._index(status).has_after(key)
+
+    def _lookup(self, index: Optional[SortedKeys]) -> List[Bounty]:
+        return [self._by_key[k] for k in index.keys] if index else []
+
+    def by_status(self, status: BountyStatus) -> List[Bounty]:
+        return self._lookup(self._by_status[status])
+
+    def by_type(self, bounty_type: BountyType) -> List[Bounty]:
+        return self._lookup(self._by_type[bounty_type])
+
+    def by_creator(self, creator_id: int) -> List[Bounty]:
+        return self._lookup(self._by_creator.get(creator_id))
+
+    def by_assignee(self, member_id: int) -> List[Bounty]:
+        return self._lookup(self._by_assignee.get(member_id))
+
+    def search(self, query: str, status: Optional[BountyStatus] = None,
+               bounty_type: Optional[BountyType] = None, limit: int = 10) -> List[Bounty]:
+        """Best-matching bounties for a free-text query, optionally filtered"""
+        def accept(key: int) -> bool:
+            bounty = self._by_key[key]
+            return (status is None or bounty.status == status) and \
+                   (bounty_type is None or bounty.bounty_type == bounty_type)
+        filtered = status is not None or bounty_type is not None
+        return [self._by_key[k] for _, k in self._text.search(query, limit, accept if filtered else None)]
+
+    def suggest_terms(self, prefix: str, limit: int = 25) -> List[str]:
+        return self._text.suggest(prefix, limit)
+
+    def complete_id(self, prefix: str, limit: int = 25) -> List[str]:
+        """Bounty IDs starting with `prefix`; a bare number completes as bounty_<number>"""
+        prefix = prefix.strip().lower()
+        if prefix.isdigit():
+            prefix = f"bounty_{prefix}"
+        return self._ids.complete(prefix, limit)
+
+# ==================== MEMBER REGISTRY ====================
+
+class MemberRegistry:
+    """Members of one partition, keeping records only for those with non-default state
+
+    Anyone who reacts or runs a command would otherwise get a permanent
+    Member. Here read-only lookups are answered from the defaults without
+    allocating; `view()` hands out a throwaway record where a whole Member
+    is needed (the rules and handlers), and `get_or_create()` keeps one
+    only when something is about to change it. Members stored
+    with default state are not loaded back.
+    """
+
+    def __init__(self, members: Iterable[Member] = ()):
+        self._members: Dict[int, Member] = {m.discord_id: m for m in members if not m.is_default()}
+
+    # ---- mapping interface ----
+
+    def __getitem__(self, discord_id: int) -> Member:
+        return self._members[discord_id]
+
+    def __contains__(self, discord_id: object) -> bool:
+        return discord_id in self._members
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._members)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def get(self, discord_id: int, default: Optional[Member] = None) -> Optional[Member]:
+        return self._members.get(discord_id, default)
+
+    def values(self):
+        return self._members.values()
+
+    # ---- records ----
+
+    def get_or_create(self, discord_id: int) -> Member:
+        """The kept record, created with the default role if needed; use it for anything that writes"""
+        member = self._members.get(discord_id)
+        if member is None:
+            # TODO: You might want to check Discord roles here to auto-assign AVF
+            member = self._members[discord_id] = Member(discord_id, Role.MEMBER)
+        return member
+
+    def view(self, discord_id: int) -> Member:
+        """The kept record, or a default one that is not kept - for reading only"""
+        return self._members.get(discord_id) or Member(discord_id, Role.MEMBER)
+
+    # ---- non-allocating checks ----
+
+    def is_avf(self, discord_id: int) -> bool:
+        member = self._members.get(discord_id)
+        return member is not None and member.is_avf()
+
+    def assigned(self, discord_id: int) -> AbstractSet[str]:
+        member = self._members.get(discord_id)
+        return member.assigned_bounties if member is not None else NO_BOUNTIES
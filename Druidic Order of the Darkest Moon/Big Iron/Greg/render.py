@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import discord
+
+from models import BountyStatus, BountyType, Bounty
+
+# (title, description, color, ((name, value, inline), ...), footer) - hashable, cheap to compare
+Snapshot = Tuple[str, str, int, Tuple[Tuple[str, str, bool], ...], Optional[str]]
+
+GREEN, ORANGE, AMBER, PURPLE, RED = 0x00ff00, 0xff6600, 0xffaa00, 0x9966cc, 0xff0000
+
+# ==================== TEMPLATES ====================
+
+@dataclass(frozen=True)
+class Template:
+    """Everything about a message that depends only on (kind, type, status)
+
+    Strings are str.format patterns over the bounty's values; see
+    BountyRenderer._values for the names available.
+    """
+    title: str
+    color: int
+    fields: Tuple[Tuple[str, str, bool], ...]
+    description: str = "{description}"
+    footer: Optional[str] = None
+
+ID_TYPE = (("Bounty ID", "{id}", True), ("Type", "{type}", True))
+
+def board_templates(claim: str, verify: str) -> Dict[BountyStatus, Template]:
+    """The claimable board post, as it looks in each status"""
+    def board(color: int, status: str, footer: Optional[str] = None, prefix: str = "🎯") -> Template:
+        return Template(f"{prefix} {{title}}", color, ID_TYPE + (("Status", status, True), ("Reward", "{reward} credits", True)),
+                        footer=footer)
+    return {
+        BountyStatus.POSTED: board(GREEN, "Available to claim", f"React with {claim} to claim this bounty"),
+        BountyStatus.CLAIMED: board(ORANGE, "Claimed by {assignee}", f"React with {verify} when complete"),
+        BountyStatus.AWAITING_POST_VERIFICATION: board(PURPLE, "Completion by {assignee} awaiting verification"),
+        BountyStatus.VERIFIED: board(GREEN, "Completed by {assignee}", prefix="✅"),
+        BountyStatus.REJECTED: board(RED, "Completion by {assignee} rejected", prefix="❌"),
+    }
+
+def verification_templates(approve: str, reject: str) -> Dict[Tuple[str, BountyStatus], Template]:
+    """Verification posts, keyed by (stage, status); stage is "pre" or "completion" """
+    # Both stages show the reward: approving is what lets it be paid
+    reward = ("Reward", "{reward} credits", True)
+    submitted = ID_TYPE + (reward, ("Submitted by", "{creator}", True))
+    completion = (("Bounty ID", "{id}", True), reward, ("Original Description", "{short_description}", False))
+    claimed = "{assignee} claims to have completed this bounty."
+    approved = submitted + (("Verified by", "{verifier}", True),)
+    return {
+        ("pre", BountyStatus.AWAITING_VERIFICATION): Template(
+            "📋 Verification Request: {title}", AMBER, submitted,
+            footer=f"AVF: React {approve} to approve, {reject} to reject"),
+        # Approved community bounties keep showing as approved while they move along the board
+        ("pre", BountyStatus.POSTED): Template("✅ APPROVED: {title}", GREEN, approved),
+        ("pre", BountyStatus.CLAIMED): Template("✅ APPROVED: {title}", GREEN, approved),
+        ("pre", BountyStatus.REJECTED): Template(
+            "❌ REJECTED: {title}", RED, submitted + (("Rejected by", "{verifier}", True),)),
+        ("completion", BountyStatus.AWAITING_POST_VERIFICATION): Template(
+            "🔍 Completion Verification: {title}", PURPLE, completion, description=claimed,
+            footer=f"AVF: React {approve} to verify completion, {reject} to reject"),
+        ("completion", BountyStatus.VERIFIED): Template(
+            "✅ COMPLETED: {title}", GREEN, completion + (("Verified by", "{verifier}", True),), description=claimed),
+        ("completion", BountyStatus.REJECTED): Template(
+            "❌ REJECTED: {title}", RED, completion + (("Rejected by", "{verifier}", True),), description=claimed),
+    }
+
+# Type-specific notes appended to the board footer while a bounty is claimable
+TYPE_NOTES = {
+    BountyType.RESOURCE: "Deliver blocks to an AVF",
+    BountyType.EDITING: "Clippers are credited when the edit is verified",
+}
+
+# ==================== RENDERER ====================
+
+class BountyRenderer:
+    """Builds bounty embeds from the Bounty alone and skips edits that change nothing
+
+    Templates are resolved once per (kind, type, status) up front, so a
+    render is a dict lookup plus string formatting. The renderer remembers
+    the stage and a hash of what it last rendered into each message;
+    `update()` only returns a render that is worth a REST edit.
+    """
+
+    def __init__(self, claim: str, verify: str, approve: str, reject: str):
+        self.templates: Dict[Tuple[str, BountyType, BountyStatus], Template] = {}
+        for bounty_type in BountyType:
+            for status, template in board_templates(claim, verify).items():
+                note = TYPE_NOTES.get(bounty_type)
+                if note and template.footer and status == BountyStatus.POSTED:
+                    template = Template(template.title, template.color, template.fields, template.description,
+                                        f"{template.footer} - {note}")
+                self.templates[("board", bounty_type, status)] = template
+            for (stage, status), template in verification_templates(approve, reject).items():
+                self.templates[(stage, bounty_type, status)] = template
+        # message id -> (stage, hash of the snapshot last rendered into it)
+        self.rendered: Dict[int, Tuple[str, int]] = {}
+
+    @staticmethod
+    def _values(bounty: Bounty) -> Dict[str, str]:
+        return {
+            "id": bounty.id,
+            "title": bounty.title,
+            "description": bounty.description,
+            "short_description": bounty.description[:500],
+            "type": bounty.bounty_type.value,
+            "reward": str(bounty.reward),
+            "creator": f"<@{bounty.creator_id}>",
+            "assignee": f"<@{bounty.assigned_to}>" if bounty.assigned_to is not None else "nobody",
+            "verifier": f"<@{bounty.verifier_id}>" if bounty.verifier_id is not None else "auto-approved",
+        }
+
+    def stage(self, kind: str, bounty: Bounty) -> str:
+        return "board" if kind == "board" else bounty.review_stage()
+
+    def snapshot(self, kind: str, bounty: Bounty) -> Optional[Snapshot]:
+        """What a "board" or "verification" message should show now; None if it has no state to show"""
+        template = self.templates.get((self.stage(kind, bounty), bounty.bounty_type, bounty.status))
+        if template is None:
+            return None
+        values = self._values(bounty)
+        return (
+            template.title.format(**values)[:256],
+            template.description.format(**values),
+            template.color,
+            tuple((name, value.format(**values), inline) for name, value, inline in template.fields),
+            template.footer,
+        )
+
+    @staticmethod
+    def embed(snapshot: Snapshot) -> discord.Embed:
+        title, description, color, fields, footer = snapshot
+        embed = discord.Embed(title=title, description=description, color=color)
+        for name, value, inline in fields:
+            embed.add_field(name=name, value=value, inline=inline)
+        if footer:
+            embed.set_footer(text=footer)
+        return embed
+
+    def remember(self, message_id: int, kind: str, bounty: Bounty, snapshot: Snapshot):
+        """Record what a freshly sent message shows"""
+        self.rendered[message_id] = (self.stage(kind, bounty), hash(snapshot))
+
+    def update(self, message_id: int, kind: str, bounty: Bounty) -> Optional[Snapshot]:
+        """The message's new content, or None if an edit would change nothing
+
+        A message never switches stage: once a bounty moves on to its
+        completion check, the old pre-verification message is left as is.
+        """
+        stage = self.stage(kind, bounty)
+        shown = self.rendered.get(message_id)
+        if shown is not None and shown[0] != stage:
+            return None
+        if shown is None and bounty.status == BountyStatus.AWAITING_POST_VERIFICATION:
+            return None  # Any message on file predates the completion check, which is posted fresh
+        snapshot = self.snapshot(kind, bounty)
+        if snapshot is None or shown == (stage, hash(snapshot)):
+            return None
+        self.rendered[message_id] = (stage, hash(snapshot))
+        return snapshot
@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from models import Role, BountyStatus, BountyType, Member, Bounty
+
+# A guard sees the bounty, the acting member and the event's source (reaction or interaction)
+Guard = Callable[[Bounty, Member, Any], bool]
+Action = Callable[..., Awaitable[None]]
+RuleKey = Tuple[str, BountyType, BountyStatus, Role]
+
+# ==================== RULES ====================
+
+@dataclass(frozen=True)
+class Rule:
+    """IF `event` happens to a bounty of one of `types` in one of `statuses`,
+    by someone with one of `roles`, AND `when` holds, THEN run `action`
+
+    An empty selector matches every value. Rules are tried in declaration
+    order and the first one that matches wins.
+    """
+    name: str
+    event: str
+    action: str
+    types: Tuple[BountyType, ...] = ()
+    statuses: Tuple[BountyStatus, ...] = ()
+    roles: Tuple[Role, ...] = ()
+    when: Optional[Guard] = None
+
+def owes_credits(bounty: Bounty, member: Member, source: Any) -> bool:
+    return not member.can_post_bounty()
+
+def is_assignee(bounty: Bounty, member: Member, source: Any) -> bool:
+    return bounty.assigned_to == member.discord_id
+
+def on_board_message(bounty: Bounty, member: Member, source: Any) -> bool:
+    """Claims and completion requests are made on the board post, not on a verification post"""
+    return source.message.id == bounty.message_id
+
+def assignee_on_board_message(bounty: Bounty, member: Member, source: Any) -> bool:
+    return is_assignee(bounty, member, source) and on_board_message(bounty, member, source)
+
+def on_verification_message(bounty: Bounty, member: Member, source: Any) -> bool:
+    """Only the verification message of the bounty's current stage counts, not stale board/pre-verification posts"""
+    return bounty.on_verification_message(source.message.id)
+
+POST, CLAIM, REQUEST_COMPLETION, VERDICT = "post", "claim", "request_completion", "verdict"
+AVF, MEMBER = (Role.AVF,), (Role.MEMBER,)
+
+# BountyLogic.md as data. Submissions are matched while the bounty is still a DRAFT
+RULES: Tuple[Rule, ...] = (
+    # Post Bounty / Post Community Bounty
+    Rule("debt_blocks_posting", POST, "deny_debt", statuses=(BountyStatus.DRAFT,), when=owes_credits),
+    Rule("avf_posts_to_board", POST, "post_to_board", types=(BountyType.REGULAR,),
+         statuses=(BountyStatus.DRAFT,), roles=AVF),
+    Rule("regular_is_avf_only", POST, "deny_regular", types=(BountyType.REGULAR,),
+         statuses=(BountyStatus.DRAFT,), roles=MEMBER),
+    Rule("submission_needs_verification", POST, "post_for_verification",
+         types=(BountyType.COMMUNITY, BountyType.RESOURCE), statuses=(BountyStatus.DRAFT,)),
+    # Claiming a bounty (debt and existing assignments are checked by the engine)
+    Rule("claim", CLAIM, "claim", statuses=(BountyStatus.POSTED,), when=on_board_message),
+    Rule("claim_unavailable", CLAIM, "withdraw_reaction", when=on_board_message),
+    # Verifying Bounty
+    Rule("request_completion", REQUEST_COMPLETION, "request_completion", statuses=(BountyStatus.CLAIMED,),
+         when=assignee_on_board_message),
+    Rule("completion_not_requestable", REQUEST_COMPLETION, "withdraw_reaction", when=on_board_message),
+    Rule("verdicts_are_avf_only", VERDICT, "withdraw_reaction", roles=MEMBER),
+    Rule("pre_verification", VERDICT, "review", statuses=(BountyStatus.AWAITING_VERIFICATION,), roles=AVF,
+         when=on_verification_message),
+    Rule("completion_verification", VERDICT, "review_completion",
+         statuses=(BountyStatus.AWAITING_POST_VERIFICATION,), roles=AVF, when=on_verification_message),
+)
+
+# ==================== DISPATCH ====================
+
+class RuleSet:
+    """Rules compiled into a table keyed by (event, bounty type, status, role)
+
+    Each key holds only the rules whose selectors cover it, with their
+    actions resolved, so an event costs one dict lookup plus the guards of
+    the few rules that can apply - however many rules and flows exist.
+    """
+
+    def __init__(self, rules: Iterable[Rule], actions: Dict[str, Action]):
+        self.rules: List[Rule] = list(rules)
+        self.table: Dict[RuleKey, Tuple[Tuple[Rule, Action], ...]] = {}
+        for rule in self.rules:
+            if rule.action not in actions:
+                raise ValueError(f"Rule {rule.name} names unknown action {rule.action!r}")
+            entry = ((rule, actions[rule.action]),)
+            for key in product((rule.event,), rule.types or tuple(BountyType),
+                               rule.statuses or tuple(BountyStatus), rule.roles or tuple(Role)):
+                self.table[key] = self.table.get(key, ()) + entry
+
+    def match(self, event: str, bounty: Bounty, member: Member, source: Any) -> Optional[Tuple[Rule, Action]]:
+        """The first rule (and its action) that applies to this event, or None"""
+        for rule, action in self.table.get((event, bounty.bounty_type, bounty.status, member.role), ()):
+            if rule.when is None or rule.when(bounty, member, source):
+                return rule, action
+        return None
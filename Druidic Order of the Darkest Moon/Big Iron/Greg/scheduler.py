@@ -0,0 +1,117 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+TimerKey = Tuple[Hashable, str]  # (subject, kind); the bot uses (partition, bounty_id) subjects
+
+# ==================== TIMER SCHEDULER ====================
+
+class TimerScheduler:
+    """One heap and one task for every bounty deadline
+
+    Scheduling, rescheduling and cancelling are O(log n) / O(1): a
+    reschedule pushes a new heap entry and the superseded one is skipped
+    when it surfaces (lazy deletion), so no per-bounty sleep tasks and no
+    scans of the board. Deadlines are wall-clock timestamps so they survive
+    restarts; persistence goes through the `persist`/`forget` hooks.
+    A subject is whatever identifies the timer's owner, e.g. a bounty ID.
+    """
+
+    def __init__(self, on_fire: Callable[[Hashable, str], Awaitable[None]],
+                 persist: Callable[[Hashable, str, float], None] = lambda b, k, d: None,
+                 forget: Callable[[Hashable, str], None] = lambda b, k: None,
+                 clock: Callable[[], float] = time.time):
+        self.on_fire = on_fire
+        self.persist = persist
+        self.forget = forget
+        self.clock = clock
+        self._heap: List[Tuple[float, int, TimerKey]] = []
+        self._live: Dict[TimerKey, Tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key: TimerKey) -> bool:
+        return key in self._live
+
+    def due(self, subject: Hashable, kind: str) -> Optional[float]:
+        entry = self._live.get((subject, kind))
+        return entry[0] if entry else None
+
+    def load(self, timers: Iterable[Tuple[Hashable, str, float]]):
+        """Restore persisted deadlines (subject, kind, due) without re-persisting them"""
+        for subject, kind, due in timers:
+            self._push((subject, kind), due)
+        self._wake.set()
+
+    def _push(self, key: TimerKey, due: float):
+        seq = next(self._seq)
+        self._live[key] = (due, seq)
+        heapq.heappush(self._heap, (due, seq, key))
+
+    def schedule(self, subject: Hashable, kind: str, delay: float):
+        """Fire `kind` for `subject` after `delay` seconds, replacing any pending one"""
+        due = self.clock() + delay
+        self._push((subject, kind), due)
+        self.persist(subject, kind, due)
+        if self._heap[0][1] == self._live[(subject, kind)][1]:
+            self._wake.set()  # New earliest deadline - let the runner re-arm
+        self._maybe_compact()
+
+    def cancel(self, subject: Hashable, kind: str):
+        if self._live.pop((subject, kind), None) is not None:
+            self.forget(subject, kind)
+            self._maybe_compact()
+
+    def _maybe_compact(self):
+        # Cancelled/superseded entries linger in the heap until popped; rebuild once they dominate
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._live):
+            self._heap = [(due, seq, key) for key, (due, seq) in self._live.items()]
+            heapq.heapify(self._heap)
+
+    def pop_due(self, now: float) -> List[TimerKey]:
+        """Remove and return every live timer whose deadline has passed"""
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            due, seq, key = heapq.heappop(self._heap)
+            if self._live.get(key) == (due, seq):
+                del self._live[key]
+                fired.append(key)
+        return fired
+
+    # ---- runner ----
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - self.clock())
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+                continue  # Something earlier was scheduled
+            except asyncio.TimeoutError:
+                pass
+
+            for subject, kind in self.pop_due(self.clock()):
+                self.forget(subject, kind)
+                try:
+                    await self.on_fire(subject, kind)
+                except Exception:
+                    log.exception("Timer %s for %s failed", kind, subject)
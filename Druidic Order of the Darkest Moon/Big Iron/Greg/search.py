@@ -0,0 +1,149 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# ==================== TOKENIZING ====================
+
+WORD = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset("a an and are at be by for from in is it of on or the to with".split())
+TITLE_WEIGHT = 3  # A title hit counts like this many description hits
+
+def tokenize(text: str) -> List[str]:
+    return [word for word in WORD.findall(text.lower()) if word not in STOPWORDS]
+
+# ==================== PREFIX INDEX ====================
+
+class PrefixIndex:
+    """Sorted strings; everything starting with a prefix is one contiguous bisect range
+
+    Lookups are O(log n + results), which keeps autocomplete well inside
+    Discord's deadline however many strings are indexed.
+    """
+
+    def __init__(self):
+        self.items: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, item: str):
+        i = bisect_left(self.items, item)
+        if i == len(self.items) or self.items[i] != item:
+            self.items.insert(i, item)
+
+    def remove(self, item: str):
+        i = bisect_left(self.items, item)
+        if i < len(self.items) and self.items[i] == item:
+            del self.items[i]
+
+    def complete(self, prefix: str, limit: int = 25) -> List[str]:
+        """Up to `limit` items starting with `prefix`, in sorted order"""
+        i = bisect_left(self.items, prefix)
+        found = []
+        while i < len(self.items) and len(found) < limit and self.items[i].startswith(prefix):
+            found.append(self.items[i])
+            i += 1
+        return found
+
+# ==================== INVERTED INDEX ====================
+
+class SearchIndex:
+    """Inverted index over bounty titles and descriptions, ranked with BM25
+
+    Documents are keyed by the numeric bounty key. Adding or removing one
+    touches only its own terms' posting lists, so the index stays current
+    as bounties are created without ever being rebuilt.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        # term -> {doc key: weighted term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self.terms = PrefixIndex()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def _frequencies(self, title: str, description: str) -> Dict[str, int]:
+        freqs: Dict[str, int] = {}
+        for word in tokenize(title):
+            freqs[word] = freqs.get(word, 0) + TITLE_WEIGHT
+        for word in tokenize(description):
+            freqs[word] = freqs.get(word, 0) + 1
+        return freqs
+
+    def add(self, key: int, title: str, description: str):
+        if key in self.doc_lengths:
+            self.remove(key, title, description)
+        freqs = self._frequencies(title, description)
+        for term, tf in freqs.items():
+            docs = self.postings.get(term)
+            if docs is None:
+                docs = self.postings[term] = {}
+                self.terms.add(term)
+            docs[key] = tf
+        length = sum(freqs.values())
+        self.doc_lengths[key] = length
+        self.total_length += length
+
+    def remove(self, key: int, title: str, description: str):
+        """Drop a document; pass the text it was indexed with"""
+        length = self.doc_lengths.pop(key, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in self._frequencies(title, description):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self.postings[term]
+                    self.terms.remove(term)
+
+    def search(self, query: str, limit: int = 10,
+               accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[float, int]]:
+        """Top `limit` (score, key) pairs for `query`, best first
+
+        The last query word also matches as a prefix, so results keep up
+        while someone is still typing. `accept(key)` filters documents
+        (e.g. by status or type) before they are ranked.
+        """
+        words = tokenize(query)
+        if not words or not self.total_length:
+            return []  # Nothing indexed, or only stopwords - no term can match
+        terms = {word: 1.0 for word in words[:-1]}
+        # The last word matches exactly, or as a prefix of longer terms at half weight
+        for term in self.terms.complete(words[-1], limit=50):
+            terms[term] = max(terms.get(term, 0.0), 1.0 if term == words[-1] else 0.5)
+
+        n = len(self.doc_lengths)
+        lengths = self.doc_lengths
+        # BM25 length normalisation, split into a constant and a per-length factor
+        base = self.K1 * (1 - self.B)
+        per_length = self.K1 * self.B * n / self.total_length
+        scores: Dict[int, float] = {}
+        rejected = set()
+        for term, weight in terms.items():
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            scale = weight * math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5)) * (self.K1 + 1)
+            get = scores.get
+            for key, tf in docs.items():
+                if accept is not None and key not in scores:
+                    if key in rejected or not accept(key):
+                        rejected.add(key)
+                        continue
+                scores[key] = get(key, 0.0) + scale * tf / (tf + base + per_length * lengths[key])
+        return heapq.nlargest(limit, ((score, key) for key, score in scores.items()))
+
+    def suggest(self, prefix: str, limit: int = 25) -> List[str]:
+        """Indexed terms starting with `prefix`, most widely used first"""
+        candidates = self.terms.complete(prefix.lower(), limit=limit * 8)
+        return heapq.nlargest(limit, candidates, key=lambda term: len(self.postings[term]))
@@ -0,0 +1,547 @@
+import copy
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterable, List, Set, Tuple
+from urllib.request import pathname2url
+
+from models import NO_BOUNTIES, Role, BountyStatus, BountyType, Member, Bounty
+
+# ==================== STORAGE INTERFACE ====================
+
+class Storage(ABC):
+    """Backing store for members, bounties and the event log
+
+    Handlers batch their changes inside `transaction()` so a claim or a
+    verification lands as one atomic unit (state rows + event entry).
+    """
+
+    @abstractmethod
+    def load(self) -> Tuple[Dict[int, Member], Dict[str, Bounty], int]:
+        """Return (members, bounties, bounty_counter) as of the last commit"""
+
+    @abstractmethod
+    def transaction(self) -> ContextManager["Storage"]:
+        """Group writes; nested transactions join the outermost one"""
+
+    @abstractmethod
+    def put_member(self, member: Member):
+        ...
+
+    @abstractmethod
+    def put_bounty(self, bounty: Bounty):
+        ...
+
+    @abstractmethod
+    def set_meta(self, key: str, value: Any):
+        ...
+
+    @abstractmethod
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        ...
+
+    @abstractmethod
+    def log_event(self, kind: str, **details):
+        ...
+
+    @abstractmethod
+    def put_timer(self, bounty_id: str, kind: str, due: float):
+        ...
+
+    @abstractmethod
+    def delete_timer(self, bounty_id: str, kind: str):
+        ...
+
+    @abstractmethod
+    def load_timers(self) -> List[Tuple[str, str, float]]:
+        """Every pending (bounty_id, kind, due) deadline"""
+
+    @abstractmethod
+    def append_entries(self, entries: List[Tuple[str, str, int, str, float]]):
+        """Append (posting_key, account, amount, reason, ts) ledger rows; never updated or deleted"""
+
+    @abstractmethod
+    def posted_keys(self, keys: Iterable[str]) -> Set[str]:
+        """The subset of `keys` that already have ledger entries"""
+
+    @abstractmethod
+    def put_balances(self, balances: Dict[str, int]):
+        """Write cached running balances of system (non-member) accounts"""
+
+    @abstractmethod
+    def load_balances(self) -> Dict[str, int]:
+        ...
+
+    @abstractmethod
+    def add_clips(self, clips: List[Tuple[str, int, int, int, float]]):
+        """Append (vod, start, end, clipper_id, ts) clip submissions"""
+
+    @abstractmethod
+    def load_clips(self) -> List[Tuple[str, int, int, int, float]]:
+        """Every clip submission, oldest first"""
+
+    @abstractmethod
+    def put_segment(self, vod: str, start: int, end: int, bounty_id: str):
+        """Record the range of a merged clip segment that became an editing bounty"""
+
+    @abstractmethod
+    def load_segments(self) -> List[Tuple[str, int, int, str]]:
+        ...
+
+    @abstractmethod
+    def bounties_by_status(self, status: BountyStatus) -> List[Bounty]:
+        ...
+
+    @abstractmethod
+    def bounties_by_creator(self, creator_id: int) -> List[Bounty]:
+        ...
+
+    @abstractmethod
+    def bounties_by_assignee(self, member_id: int) -> List[Bounty]:
+        ...
+
+    @abstractmethod
+    def partition(self, guild_id: int) -> "Storage":
+        """A view of this store scoped to one guild; every method then reads/writes only that guild
+
+        Views share the parent's connection and transaction, so a transaction
+        opened on one partition is joined by writes through any other.
+        """
+
+    @abstractmethod
+    def guild_ids(self) -> List[int]:
+        """Partitions that have anything stored"""
+
+    def reader(self) -> "Storage":
+        """A read-only handle on the same data that a worker thread can load from"""
+        return self
+
+    def close(self):
+        pass
+
+class MemoryStorage(Storage):
+    """Non-durable store - state dies with the process (tests, benchmarks, dev)"""
+
+    def __init__(self):
+        self.members: Dict[int, Member] = {}
+        self.bounties: Dict[str, Bounty] = {}
+        self.meta: Dict[str, Any] = {}
+        self.events: List[Tuple[float, str, Dict]] = []
+        self.timers: Dict[Tuple[str, str], float] = {}
+        self.ledger: List[Tuple[str, str, int, str, float]] = []
+        self.postings: Set[str] = set()
+        self.balances: Dict[str, int] = {}
+        self.clips: List[Tuple[str, int, int, int, float]] = []
+        self.segments: Dict[str, Tuple[str, int, int, str]] = {}
+        self.partitions: Dict[int, "MemoryStorage"] = {0: self}
+
+    def partition(self, guild_id: int) -> "MemoryStorage":
+        if guild_id not in self.partitions:
+            self.partitions[guild_id] = MemoryStorage()
+        return self.partitions[guild_id]
+
+    def guild_ids(self) -> List[int]:
+        return list(self.partitions)
+
+    def load(self):
+        return dict(self.members), dict(self.bounties), self.meta.get("bounty_counter", 0)
+
+    @contextmanager
+    def transaction(self):
+        yield self
+
+    def put_member(self, member: Member):
+        self.members[member.discord_id] = member
+
+    def put_bounty(self, bounty: Bounty):
+        self.bounties[bounty.id] = bounty
+
+    def set_meta(self, key: str, value: Any):
+        self.meta[key] = value
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        return self.meta.get(key, default)
+
+    def log_event(self, kind: str, **details):
+        self.events.append((time.time(), kind, details))
+
+    def put_timer(self, bounty_id: str, kind: str, due: float):
+        self.timers[(bounty_id, kind)] = due
+
+    def delete_timer(self, bounty_id: str, kind: str):
+        self.timers.pop((bounty_id, kind), None)
+
+    def load_timers(self):
+        return [(bounty_id, kind, due) for (bounty_id, kind), due in self.timers.items()]
+
+    def append_entries(self, entries: List[Tuple[str, str, int, str, float]]):
+        self.ledger.extend(entries)
+        self.postings.update(entry[0] for entry in entries)
+
+    def posted_keys(self, keys: Iterable[str]) -> Set[str]:
+        return self.postings.intersection(keys)
+
+    def put_balances(self, balances: Dict[str, int]):
+        self.balances.update(balances)
+
+    def load_balances(self) -> Dict[str, int]:
+        return dict(self.balances)
+
+    def add_clips(self, clips: List[Tuple[str, int, int, int, float]]):
+        self.clips.extend(clips)
+
+    def load_clips(self) -> List[Tuple[str, int, int, int, float]]:
+        return list(self.clips)
+
+    def put_segment(self, vod: str, start: int, end: int, bounty_id: str):
+        self.segments[bounty_id] = (vod, start, end, bounty_id)
+
+    def load_segments(self) -> List[Tuple[str, int, int, str]]:
+        return list(self.segments.values())
+
+    def bounties_by_status(self, status: BountyStatus) -> List[Bounty]:
+        return [b for b in self.bounties.values() if b.status == status]
+
+    def bounties_by_creator(self, creator_id: int) -> List[Bounty]:
+        return [b for b in self.bounties.values() if b.creator_id == creator_id]
+
+    def bounties_by_assignee(self, member_id: int) -> List[Bounty]:
+        return [b for b in self.bounties.values() if b.assigned_to == member_id]
+
+# ==================== SQLITE ====================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS members (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    discord_id INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    time_credits_owed INTEGER NOT NULL DEFAULT 0,
+    assigned_bounties TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (guild_id, discord_id)
+);
+CREATE TABLE IF NOT EXISTS bounties (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    id TEXT NOT NULL,
+    creator_id INTEGER NOT NULL,
+    bounty_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    assigned_to INTEGER,
+    verifier_id INTEGER,
+    message_id INTEGER,
+    verification_message_id INTEGER,
+    reward INTEGER NOT NULL DEFAULT 0,
+    timeframe_hours INTEGER,
+    verification_stage TEXT,
+    PRIMARY KEY (guild_id, id)
+);
+CREATE INDEX IF NOT EXISTS bounties_status ON bounties(guild_id, status);
+CREATE INDEX IF NOT EXISTS bounties_creator ON bounties(guild_id, creator_id);
+CREATE INDEX IF NOT EXISTS bounties_assignee ON bounties(guild_id, assigned_to) WHERE assigned_to IS NOT NULL;
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    ts REAL NOT NULL,
+    kind TEXT NOT NULL,
+    details TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS timers (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    bounty_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (guild_id, bounty_id, kind)
+);
+CREATE TABLE IF NOT EXISTS ledger (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    posting TEXT NOT NULL,
+    account TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ledger_posting ON ledger(guild_id, posting);
+CREATE INDEX IF NOT EXISTS ledger_account ON ledger(guild_id, account);
+CREATE TABLE IF NOT EXISTS balances (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    account TEXT NOT NULL,
+    balance INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, account)
+);
+CREATE TABLE IF NOT EXISTS clips (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    vod TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    clipper_id INTEGER NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS clips_guild ON clips(guild_id, seq);
+CREATE TABLE IF NOT EXISTS clip_segments (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    bounty_id TEXT NOT NULL,
+    vod TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, bounty_id)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    guild_id INTEGER NOT NULL DEFAULT 0,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, key)
+);
+"""
+
+BOUNTY_COLUMNS = (
+    "id", "creator_id", "bounty_type", "status", "title", "description",
+    "assigned_to", "verifier_id", "message_id", "verification_message_id",
+    "reward", "timeframe_hours", "verification_stage",
+)
+
+def bounty_to_row(bounty: Bounty) -> tuple:
+    return (
+        bounty.id, bounty.creator_id, bounty.bounty_type.value, bounty.status.value,
+        bounty.title, bounty.description, bounty.assigned_to, bounty.verifier_id,
+        bounty.message_id, bounty.verification_message_id,
+        bounty.reward, bounty.timeframe_hours, bounty.verification_stage,
+    )
+
+def row_to_bounty(row: tuple) -> Bounty:
+    values = dict(zip(BOUNTY_COLUMNS, row))
+    values["bounty_type"] = BountyType(values["bounty_type"])
+    values["status"] = BountyStatus(values["status"])
+    return Bounty(**values)
+
+class SQLiteStorage(Storage):
+    """Durable store on a single SQLite file in WAL mode
+
+    The members/bounties tables always hold the current state, written in
+    the same transaction as the matching event-log entry, so startup is a
+    straight table read with no history replay. The event log is
+    append-only history; `compact()` trims it once it is no longer needed.
+
+    Several shard processes can open the same file: WAL lets readers run
+    alongside the one writer, and BEGIN IMMEDIATE waits up to
+    `busy_timeout` for another process's transaction instead of failing.
+    Each process only writes the partitions of the guilds it serves.
+    """
+
+    def __init__(self, path: str = "greg.db", busy_timeout: float = 5.0):
+        self.path = path
+        self.guild_id = 0
+        self.root = self  # Owns the connection and the transaction depth
+        # Autocommit mode - transactions are opened explicitly with BEGIN
+        self.conn = sqlite3.connect(path, isolation_level=None, timeout=busy_timeout)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Safe in WAL, skips an fsync per commit
+        self._depth = 0
+        with self.transaction():
+            self._create_schema()
+
+    def _create_schema(self):
+        # Statement by statement: executescript() would commit the open transaction
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                self.conn.execute(statement)
+
+    def partition(self, guild_id: int) -> "SQLiteStorage":
+        view = copy.copy(self)
+        view.guild_id = guild_id
+        return view
+
+    def guild_ids(self) -> List[int]:
+        return [row[0] for row in self.conn.execute(
+            "SELECT guild_id FROM bounties UNION SELECT guild_id FROM members UNION SELECT guild_id FROM meta "
+            "UNION SELECT guild_id FROM clips"
+        )]
+
+    def reader(self) -> "SQLiteStorage":
+        # Its own connection (sqlite3 connections stay on their thread); WAL lets it read alongside writes
+        if self.path == ":memory:":
+            return self
+        view = copy.copy(self)
+        uri = f"file:{pathname2url(os.path.abspath(self.path))}?mode=ro"
+        view.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        view.root = view
+        view._depth = 0
+        return view
+
+    def load(self):
+        members = {}
+        for discord_id, role, owed, assigned in self.conn.execute(
+            "SELECT discord_id, role, time_credits_owed, assigned_bounties FROM members WHERE guild_id = ?",
+            (self.guild_id,)
+        ):
+            assigned = json.loads(assigned)
+            members[discord_id] = Member(discord_id, Role(role), owed, set(assigned) if assigned else NO_BOUNTIES)
+
+        bounties = {}
+        for row in self.conn.execute(
+            f"SELECT {', '.join(BOUNTY_COLUMNS)} FROM bounties WHERE guild_id = ?", (self.guild_id,)
+        ):
+            bounty = row_to_bounty(row)
+            bounties[bounty.id] = bounty
+
+        return members, bounties, self.get_meta("bounty_counter", 0)
+
+    @contextmanager
+    def transaction(self):
+        root = self.root
+        if root._depth == 0:
+            self.conn.execute("BEGIN IMMEDIATE")
+        root._depth += 1
+        try:
+            yield self
+        except BaseException:
+            root._depth -= 1
+            if root._depth == 0:
+                self.conn.execute("ROLLBACK")
+            raise
+        else:
+            root._depth -= 1
+            if root._depth == 0:
+                self.conn.execute("COMMIT")
+
+    def put_member(self, member: Member):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO members (guild_id, discord_id, role, time_credits_owed, assigned_bounties) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.guild_id, member.discord_id, member.role.value, member.time_credits_owed,
+             json.dumps(sorted(member.assigned_bounties))),
+        )
+
+    def put_bounty(self, bounty: Bounty):
+        placeholders = ", ".join("?" for _ in BOUNTY_COLUMNS)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO bounties (guild_id, {', '.join(BOUNTY_COLUMNS)}) VALUES (?, {placeholders})",
+            (self.guild_id,) + bounty_to_row(bounty),
+        )
+
+    def set_meta(self, key: str, value: Any):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (guild_id, key, value) VALUES (?, ?, ?)",
+            (self.guild_id, key, json.dumps(value)),
+        )
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE guild_id = ? AND key = ?", (self.guild_id, key)
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def log_event(self, kind: str, **details):
+        self.conn.execute(
+            "INSERT INTO events (guild_id, ts, kind, details) VALUES (?, ?, ?, ?)",
+            (self.guild_id, time.time(), kind, json.dumps(details)),
+        )
+
+    def put_timer(self, bounty_id: str, kind: str, due: float):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO timers (guild_id, bounty_id, kind, due) VALUES (?, ?, ?, ?)",
+            (self.guild_id, bounty_id, kind, due),
+        )
+
+    def delete_timer(self, bounty_id: str, kind: str):
+        self.conn.execute(
+            "DELETE FROM timers WHERE guild_id = ? AND bounty_id = ? AND kind = ?", (self.guild_id, bounty_id, kind)
+        )
+
+    def load_timers(self):
+        return self.conn.execute(
+            "SELECT bounty_id, kind, due FROM timers WHERE guild_id = ?", (self.guild_id,)
+        ).fetchall()
+
+    def append_entries(self, entries: List[Tuple[str, str, int, str, float]]):
+        self.conn.executemany(
+            "INSERT INTO ledger (guild_id, posting, account, amount, reason, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            [(self.guild_id,) + entry for entry in entries],
+        )
+
+    def posted_keys(self, keys: Iterable[str]) -> Set[str]:
+        keys, found = list(keys), set()
+        for i in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = keys[i:i + 500]
+            found.update(row[0] for row in self.conn.execute(
+                f"SELECT DISTINCT posting FROM ledger WHERE guild_id = ? AND posting IN ({', '.join('?' * len(chunk))})",
+                (self.guild_id, *chunk),
+            ))
+        return found
+
+    def put_balances(self, balances: Dict[str, int]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO balances (guild_id, account, balance) VALUES (?, ?, ?)",
+            [(self.guild_id, account, balance) for account, balance in balances.items()],
+        )
+
+    def load_balances(self) -> Dict[str, int]:
+        return dict(self.conn.execute(
+            "SELECT account, balance FROM balances WHERE guild_id = ?", (self.guild_id,)
+        ))
+
+    def add_clips(self, clips: List[Tuple[str, int, int, int, float]]):
+        self.conn.executemany(
+            "INSERT INTO clips (guild_id, vod, start, end, clipper_id, ts) VALUES (?, ?, ?, ?, ?, ?)",
+            [(self.guild_id,) + clip for clip in clips],
+        )
+
+    def load_clips(self) -> List[Tuple[str, int, int, int, float]]:
+        return self.conn.execute(
+            "SELECT vod, start, end, clipper_id, ts FROM clips WHERE guild_id = ? ORDER BY seq", (self.guild_id,)
+        ).fetchall()
+
+    def put_segment(self, vod: str, start: int, end: int, bounty_id: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO clip_segments (guild_id, bounty_id, vod, start, end) VALUES (?, ?, ?, ?, ?)",
+            (self.guild_id, bounty_id, vod, start, end),
+        )
+
+    def load_segments(self) -> List[Tuple[str, int, int, str]]:
+        return self.conn.execute(
+            "SELECT vod, start, end, bounty_id FROM clip_segments WHERE guild_id = ?", (self.guild_id,)
+        ).fetchall()
+
+    def events_since(self, seq: int = 0) -> List[Tuple[int, float, str, Dict]]:
+        """This partition's event log entries after `seq`, oldest first"""
+        return [
+            (row_seq, ts, kind, json.loads(details))
+            for row_seq, ts, kind, details in self.conn.execute(
+                "SELECT seq, ts, kind, details FROM events WHERE guild_id = ? AND seq > ? ORDER BY seq",
+                (self.guild_id, seq),
+            )
+        ]
+
+    def compact(self, keep_events: int = 10000):
+        """Trim the event log (all guilds) to the newest `keep_events` entries and checkpoint the WAL"""
+        with self.transaction():
+            self.conn.execute(
+                "DELETE FROM events WHERE seq <= (SELECT MAX(seq) FROM events) - ?", (keep_events,)
+            )
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _query_bounties(self, where: str, arg: Any) -> List[Bounty]:
+        return [
+            row_to_bounty(row)
+            for row in self.conn.execute(
+                f"SELECT {', '.join(BOUNTY_COLUMNS)} FROM bounties WHERE guild_id = ? AND {where} = ?",
+                (self.guild_id, arg),
+            )
+        ]
+
+    def bounties_by_status(self, status: BountyStatus) -> List[Bounty]:
+        return self._query_bounties("status", status.value)
+
+    def bounties_by_creator(self, creator_id: int) -> List[Bounty]:
+        return self._query_bounties("creator_id", creator_id)
+
+    def bounties_by_assignee(self, member_id: int) -> List[Bounty]:
+        return self._query_bounties("assigned_to", member_id)
+
+    def close(self):
+        self.conn.close()
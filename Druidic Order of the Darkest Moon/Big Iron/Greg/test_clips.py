@@ -0,0 +1,87 @@
+import pytest
+
+import clips
+from clips import ClipIngest, CLIP_WINDOW, clip_range, parse_clip_file, parse_timestamp
+
+def ranges(ingest, vod="vod"):
+    return [(s.start, s.end, list(s.clippers)) for s in ingest.timelines[vod].segments]
+
+def test_overlapping_clips_merge():
+    ingest = ClipIngest()
+    ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.submit("vod", 150, 260, 2, now=1)
+    assert ranges(ingest) == [(100, 260, [1, 2])]
+
+def test_adjacent_clips_merge():
+    ingest = ClipIngest()
+    ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.submit("vod", 200, 300, 2, now=1)
+    ingest.submit("vod", 40, 100, 3, now=2)
+    assert ranges(ingest) == [(40, 300, [1, 2, 3])]  # Earlier clippers first
+
+def test_duplicate_clip_counts_its_clipper_once():
+    ingest = ClipIngest()
+    for now in range(3):
+        ingest.submit("vod", 100, 200, 1, now=now)
+    assert ranges(ingest) == [(100, 200, [1])]
+
+def test_disjoint_clips_stay_apart_in_order():
+    ingest = ClipIngest()
+    ingest.submit("vod", 500, 600, 1, now=0)
+    ingest.submit("vod", 100, 200, 2, now=0)
+    ingest.submit("other", 100, 200, 3, now=0)
+    assert ranges(ingest) == [(100, 200, [2]), (500, 600, [1])]
+    assert ranges(ingest, "other") == [(100, 200, [3])]
+
+def test_clip_bridging_segments_merges_them_all():
+    ingest = ClipIngest()
+    ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.submit("vod", 300, 400, 2, now=0)
+    ingest.submit("vod", 700, 800, 3, now=0)
+    segment = ingest.submit("vod", 150, 350, 4, now=5)
+    assert ranges(ingest) == [(100, 400, [1, 2, 4]), (700, 800, [3])]
+    assert segment.updated == 5
+
+def test_clip_on_emitted_segment_credits_it_without_growing_it():
+    ingest = ClipIngest()
+    segment = ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.emitted(segment, "bounty_1")
+    landed = ingest.submit("vod", 150, 400, 2, now=1)
+    assert landed is segment and (segment.start, segment.end) == (100, 200)
+    assert list(segment.clippers) == [1, 2]
+    assert ranges(ingest) == [(100, 200, [1, 2])]
+
+def test_settling_and_reload():
+    ingest = ClipIngest()
+    ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.submit("vod", 500, 600, 2, now=50)
+    assert ingest.next_due("vod", settle=60) == 60
+    assert [s.start for s in ingest.settled("vod", now=60, settle=60)] == [100]
+    emitted = ingest.settled("vod", now=60, settle=60)[0]
+    ingest.emitted(emitted, "bounty_1")
+
+    # Emitted ranges are placed first, then the stored clips replay over them
+    reloaded = ClipIngest([("vod", 100, 200, "bounty_1")],
+                          [("vod", 100, 200, 1, 0.0), ("vod", 500, 600, 2, 50.0), ("vod", 120, 130, 3, 70.0)])
+    assert ranges(reloaded) == [(100, 200, [1, 3]), (500, 600, [2])]
+    assert reloaded.by_bounty["bounty_1"].start == 100
+    assert reloaded.next_due("vod", settle=60) == 110
+
+def test_segment_cap_turns_away_new_segments_only(monkeypatch):
+    monkeypatch.setattr(clips, "MAX_SEGMENTS_PER_VOD", 2)
+    ingest = ClipIngest()
+    ingest.submit("vod", 100, 200, 1, now=0)
+    ingest.submit("vod", 300, 400, 2, now=0)
+    with pytest.raises(ValueError):
+        ingest.submit("vod", 900, 1000, 3, now=0)
+    ingest.submit("vod", 150, 350, 3, now=0)  # Merging still works, and frees a slot
+    ingest.submit("vod", 900, 1000, 4, now=0)
+    assert ranges(ingest) == [(100, 400, [1, 2, 3]), (900, 1000, [4])]
+
+def test_timestamps():
+    assert parse_timestamp("1:02:03") == 3723 and parse_timestamp("62:03") == 3723
+    assert clip_range("0:10") == (0, 10 + CLIP_WINDOW)
+    with pytest.raises(ValueError):
+        clip_range("1:00", "0:30")
+    parsed, errors = parse_clip_file("vod,start,end,clipper_id\nv,1:00,,5\nv,1:00,2:00,x\n")
+    assert parsed == [("v", 60 - CLIP_WINDOW, 60 + CLIP_WINDOW, 5)] and len(errors) == 1
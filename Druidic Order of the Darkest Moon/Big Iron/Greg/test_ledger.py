@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from ledger import Ledger, Posting, REWARDS_ACCOUNT, member_account, split
+from models import Member, Role
+from storage import MemoryStorage
+
+def make_ledger():
+    members = {}
+    def get_member(discord_id):
+        if discord_id not in members:
+            members[discord_id] = Member(discord_id, Role.MEMBER)
+        return members[discord_id]
+    store = MemoryStorage()
+    return Ledger(store, get_member), store, members
+
+def reward(key="bounty_1:reward", amount=10, discord_id=7):
+    return Posting.transfer(key, REWARDS_ACCOUNT, member_account(discord_id), amount, "bounty_reward")
+
+def test_reposting_a_key_is_skipped():
+    ledger, store, members = make_ledger()
+    first = ledger.settle([reward()])
+    again = ledger.settle([reward()])
+    assert [p.key for p in first.posted] == ["bounty_1:reward"]
+    assert again.posted == [] and [p.key for p in again.skipped] == ["bounty_1:reward"]
+    assert members[7].time_credits_owed == -10
+    assert ledger.balance(REWARDS_ACCOUNT) == -10
+    assert store.load_balances() == {REWARDS_ACCOUNT: -10}
+
+def test_duplicate_key_within_a_batch_posts_once():
+    ledger, _, members = make_ledger()
+    result = ledger.settle([reward(), reward(amount=99)])
+    assert len(result.posted) == 1 and len(result.skipped) == 1
+    assert ledger.balance(member_account(7)) == 10
+
+def test_failed_settlement_puts_balances_back():
+    ledger, store, members = make_ledger()
+    def fail(entries):
+        raise RuntimeError("disk")
+    store.append_entries = fail
+    with pytest.raises(RuntimeError):
+        ledger.settle([reward()])
+    assert ledger.balance(REWARDS_ACCOUNT) == 0
+    assert members[7].time_credits_owed == 0
+    del store.append_entries
+    assert len(ledger.settle([reward()]).posted) == 1  # Nothing was recorded, so a retry posts it
+
+def test_retry_skips_what_already_committed():
+    ledger, _, members = make_ledger()
+    ledger.settle([reward()])
+    result = asyncio.run(ledger.settle_with_retry([reward(), reward("bounty_2:reward", 5)], backoff=0))
+    assert [p.key for p in result.skipped] == ["bounty_1:reward"]
+    assert [p.key for p in result.posted] == ["bounty_2:reward"]
+    assert members[7].time_credits_owed == -15
+
+def test_unbalanced_posting_is_rejected():
+    with pytest.raises(ValueError):
+        Posting("bad", ((REWARDS_ACCOUNT, -5), (member_account(1), 4)), "bounty_reward")
+
+def test_payout_split_sums_exactly():
+    assert sum(amount for _, amount in split(10, {"a": 1, "b": 1, "c": 1})) == 10
+    posting = Posting.payout("clips:bounty_1", REWARDS_ACCOUNT, 7, {"a": 70, "b": 30}, "clips_used")
+    assert dict(posting.legs) == {REWARDS_ACCOUNT: -7, "a": 5, "b": 2}
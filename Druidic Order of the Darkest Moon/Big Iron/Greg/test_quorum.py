@@ -0,0 +1,66 @@
+import pytest
+
+from models import Bounty, BountyStatus, BountyType
+from quorum import Quorum, SINGLE, Tally, VerificationVotes
+
+def tally(*votes):
+    t = Tally()
+    for voter, approve in votes:
+        t.add(voter, approve)
+    return t
+
+def test_single_verdict_decides():
+    assert SINGLE.verdict(tally((1, True))) is True
+    assert SINGLE.verdict(tally((1, False))) is False
+    assert SINGLE.verdict(Tally()) is None
+
+def test_two_of_three_tie_stays_open():
+    quorum = Quorum(needed=2, panel=3)
+    assert quorum.verdict(tally((1, True), (2, False))) is None
+    assert quorum.verdict(tally((1, True), (2, False), (3, True))) is True
+    assert quorum.verdict(tally((1, True), (2, False), (3, False))) is False
+
+def test_two_of_three_rejects_once_approval_is_out_of_reach():
+    assert Quorum(needed=2, panel=3).verdict(tally((1, False), (2, False))) is False
+
+def test_each_voter_counts_once():
+    t = tally((1, True))
+    assert not t.add(1, True) and not t.add(1, False)
+    assert (t.approvals, t.rejections) == (1, 0)
+
+def test_removing_a_reaction_takes_back_the_vote():
+    quorum = Quorum(needed=2, panel=3)
+    t = tally((1, True), (2, True))
+    assert quorum.verdict(t) is True
+    assert t.remove(2, True)
+    assert quorum.verdict(t) is None and t.approvals == 1
+    assert not t.remove(1, False)  # Not the reaction that was counted
+    assert not t.remove(9, True)
+    assert t.add(2, False) and (t.approvals, t.rejections) == (1, 1)
+
+def test_votes_are_dropped_when_the_verification_moves_on():
+    votes = VerificationVotes()
+    bounty = Bounty("bounty_1", 5, BountyType.RESOURCE, BountyStatus.AWAITING_VERIFICATION, "iron", "blocks",
+                    verification_message_id=42)
+    votes.tally(42).add(1, True)
+    assert votes.withdraw(42, 1, True) and not votes.withdraw(43, 1, True)
+    votes.tally(42).add(2, True)
+    bounty.status = BountyStatus.POSTED
+    votes.on_status(bounty, BountyStatus.AWAITING_VERIFICATION)
+    assert len(votes) == 0
+
+def test_invalid_quorum():
+    with pytest.raises(ValueError):
+        Quorum(needed=3, panel=2)
+    with pytest.raises(ValueError):
+        Quorum(needed=0, panel=1)
+
+def test_votes_whose_reaction_is_gone_are_dropped():
+    votes = VerificationVotes()
+    votes.tally(42).add(1, True)
+    votes.tally(42).add(2, False)
+    votes.tally(42).add(3, True)
+    # 1 took their 👍 back while the bot was away; 2 is still there; 3 swapped to 👎, which never counted
+    assert votes.keep_only(42, {(2, False), (3, False)}) == 2
+    assert votes.tally(42).votes == {2: False}
+    assert votes.keep_only(99, set()) == 0
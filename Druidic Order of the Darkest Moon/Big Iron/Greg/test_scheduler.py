@@ -0,0 +1,87 @@
+import asyncio
+
+from scheduler import TimerScheduler
+from storage import MemoryStorage
+
+async def never(subject, kind):
+    raise AssertionError("the runner is not started in these tests")
+
+def make_scheduler(store=None):
+    store = store or MemoryStorage()
+    return TimerScheduler(never, store.put_timer, store.delete_timer, clock=lambda: 1000.0), store
+
+def test_reschedule_supersedes_the_earlier_deadline():
+    scheduler, store = make_scheduler()
+    scheduler.schedule("bounty_1", "expire", 10)
+    scheduler.schedule("bounty_1", "expire", 50)
+    assert len(scheduler) == 1 and len(scheduler._heap) == 2  # The old entry lingers until it surfaces
+    assert scheduler.due("bounty_1", "expire") == 1050
+    assert store.load_timers() == [("bounty_1", "expire", 1050)]
+    assert scheduler.pop_due(1020) == []
+    assert scheduler._heap and scheduler.pop_due(1050) == [("bounty_1", "expire")]
+    assert len(scheduler) == 0 and scheduler._heap == []
+
+def test_cancelled_timer_never_fires():
+    scheduler, store = make_scheduler()
+    scheduler.schedule("bounty_1", "expire", 10)
+    scheduler.schedule("bounty_2", "expire", 10)
+    scheduler.cancel("bounty_1", "expire")
+    scheduler.cancel("bounty_1", "expire")  # Already gone - nothing to forget
+    assert ("bounty_1", "expire") not in scheduler and scheduler.due("bounty_1", "expire") is None
+    assert store.load_timers() == [("bounty_2", "expire", 1010)]
+    assert scheduler.pop_due(2000) == [("bounty_2", "expire")]
+
+def test_kinds_of_one_subject_are_separate():
+    scheduler, _ = make_scheduler()
+    scheduler.schedule("bounty_1", "expire", 30)
+    scheduler.schedule("bounty_1", "escalate", 10)
+    assert scheduler.pop_due(1010) == [("bounty_1", "escalate")]
+    assert ("bounty_1", "expire") in scheduler
+
+def test_stale_entries_are_compacted_once_they_dominate():
+    scheduler, _ = make_scheduler()
+    for delay in range(100):
+        scheduler.schedule("bounty_1", "expire", delay)
+    # Rebuilt down to the one live entry when the 65th was pushed, then 35 more stale ones piled up
+    assert len(scheduler) == 1 and len(scheduler._heap) == 36
+    scheduler.schedule("bounty_2", "expire", 500)
+    for n in range(70):
+        scheduler.schedule(f"other_{n}", "expire", n)
+        scheduler.cancel(f"other_{n}", "expire")  # Cancelling compacts too
+        assert len(scheduler._heap) <= 64
+    assert scheduler.pop_due(2000) == [("bounty_1", "expire"), ("bounty_2", "expire")]
+
+def test_load_restores_persisted_deadlines():
+    scheduler, store = make_scheduler()
+    scheduler.schedule("bounty_1", "expire", 10)
+    scheduler.schedule("bounty_2", "escalate", 99)
+    scheduler.cancel("bounty_2", "escalate")
+    scheduler.schedule("bounty_3", "escalate", 5)
+
+    restarted, _ = make_scheduler(store)
+    def persist(subject, kind, due):
+        raise AssertionError("restored deadlines are already stored")
+    restarted.persist = persist
+    restarted.load(store.load_timers())
+    assert len(restarted) == 2 and restarted.due("bounty_1", "expire") == 1010
+    assert restarted.pop_due(1010) == [("bounty_3", "escalate"), ("bounty_1", "expire")]
+
+def test_runner_fires_and_forgets_due_timers():
+    async def run():
+        store = MemoryStorage()
+        fired = []
+        async def on_fire(subject, kind):
+            fired.append((subject, kind))
+            if subject == "bounty_1":
+                raise RuntimeError("handler failed")  # Logged; later timers still fire
+        scheduler = TimerScheduler(on_fire, store.put_timer, store.delete_timer)
+        scheduler.schedule("bounty_1", "expire", 0.01)
+        scheduler.schedule("bounty_2", "expire", 0.02)
+        scheduler.schedule("bounty_3", "expire", 60)
+        scheduler.start()
+        await asyncio.sleep(0.1)
+        scheduler.stop()
+        return fired, store.load_timers()
+    fired, pending = asyncio.run(run())
+    assert fired == [("bounty_1", "expire"), ("bounty_2", "expire")]
+    assert [timer[:2] for timer in pending] == [("bounty_3", "expire")]
@@ -0,0 +1,79 @@
+import pytest
+
+from models import Bounty, BountyStatus, BountyType, Member, Role
+from storage import SQLiteStorage
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStorage(str(tmp_path / "greg.db"))
+    yield store
+    store.close()
+
+def bounty(bounty_id="bounty_1", creator_id=5, status=BountyStatus.POSTED, **fields):
+    return Bounty(bounty_id, creator_id, BountyType.RESOURCE, status, "iron", "64 blocks", **fields)
+
+def test_failure_in_a_nested_transaction_rolls_back_the_outermost(store):
+    with store.transaction():
+        store.put_member(Member(1, Role.MEMBER))
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.put_member(Member(2, Role.MEMBER))
+            with store.transaction():  # Joins the outer transaction rather than committing on its own
+                store.put_bounty(bounty())
+                store.set_meta("bounty_counter", 1)
+            raise RuntimeError("handler failed")
+    members, bounties, counter = store.load()
+    assert list(members) == [1] and bounties == {} and counter == 0
+
+    # The depth unwound, so the next transaction begins and commits normally
+    with store.transaction():
+        with store.transaction():
+            store.put_bounty(bounty())
+    assert list(store.load()[1]) == ["bounty_1"]
+
+def test_rows_round_trip(store, tmp_path):
+    member = Member(7, Role.AVF, 12)
+    member.assign("bounty_1")
+    stored = bounty(status=BountyStatus.AWAITING_VERIFICATION, assigned_to=7, message_id=10,
+                    verification_message_id=11, reward=50, timeframe_hours=24, verification_stage="completion")
+    with store.transaction():
+        store.put_member(member)
+        store.put_bounty(stored)
+        store.set_meta("bounty_counter", 1)
+    store.close()
+
+    reopened = SQLiteStorage(str(tmp_path / "greg.db"))
+    members, bounties, counter = reopened.load()
+    assert members == {7: member} and bounties == {"bounty_1": stored} and counter == 1
+    assert reopened.bounties_by_assignee(7) == [stored]
+    reopened.close()
+
+def test_partitions_only_see_their_own_guild(store):
+    first, second = store.partition(100), store.partition(200)
+    with first.transaction():
+        first.put_member(Member(1, Role.MEMBER, 5))
+        first.put_bounty(bounty())
+        first.set_meta("bounty_counter", 1)
+        first.put_timer("bounty_1", "expire", 1000.0)
+        first.add_clips([("vod", 0, 30, 1, 1.0)])
+    with second.transaction():
+        second.put_member(Member(1, Role.AVF, 9))  # Same IDs, different guild
+        second.put_bounty(bounty(creator_id=6))
+
+    members, bounties, counter = first.load()
+    assert members[1].role == Role.MEMBER and bounties["bounty_1"].creator_id == 5 and counter == 1
+    members, bounties, counter = second.load()
+    assert members[1].role == Role.AVF and bounties["bounty_1"].creator_id == 6 and counter == 0
+    assert second.load_timers() == [] and second.load_clips() == []
+    assert second.bounties_by_creator(5) == [] and len(first.bounties_by_creator(5)) == 1
+    assert store.load() == ({}, {}, 0)  # The unpartitioned view is guild 0
+    assert sorted(store.guild_ids()) == [100, 200]
+
+def test_partitions_share_one_transaction(store):
+    first, second = store.partition(100), store.partition(200)
+    with pytest.raises(RuntimeError):
+        with first.transaction():
+            first.put_member(Member(1, Role.MEMBER))
+            second.put_member(Member(2, Role.MEMBER))
+            raise RuntimeError("handler failed")
+    assert first.load()[0] == {} and second.load()[0] == {}